@@ -1,16 +1,20 @@
 from fastapi import FastAPI, HTTPException, Depends, Query, status
 from fastapi.params import Path as FastAPIPath
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List, Optional, Dict, Any, Union
+from typing import List, Optional, Dict, Any, Union, Literal
 from pydantic import BaseModel, Field
 import os
 import sys
+import json
+import base64
+import asyncio
 from pathlib import Path
 from datetime import datetime
 import firebase_admin
 from firebase_admin import credentials, firestore
 from dotenv import load_dotenv
 from urllib.parse import unquote
+from contextlib import asynccontextmanager
 
 # Add parent directory to path to import scraper modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -32,10 +36,58 @@ Typical usage:
 dotenv_path = Path(__file__).resolve().parent.parent.parent / ".env"
 load_dotenv(dotenv_path)
 
+# Async data access; one shared Firestore AsyncClient for every request
+from backend.database.job_repository import JobRepository, APPROXIMATE_COUNT_TTL
+from backend.database.job_index import JobIndex
+from backend.database.search_index import SearchIndex
+from backend.database.company_index import CompanyIndex
+
+jobs_repository = JobRepository('jobs')
+
+# Live in-memory copy of the jobs collection, kept current by a snapshot listener
+job_index = JobIndex('jobs')
+
+
+def invalidate_counts(job_id: str, old: Optional[Dict], new: Optional[Dict]):
+    """Drops the cached totals of the categories a changed job left or entered."""
+    jobs_repository.invalidate_counts({job.get('category') for job in (old, new) if job})
+
+
+job_index.subscribe(invalidate_counts)
+
+# Full-text index over the live jobs, updated with every change the listener reports
+search_index = SearchIndex()
+job_index.subscribe(search_index.on_change)
+
+# Trigram index over company names, for case-insensitive company lookups
+company_index = CompanyIndex()
+job_index.subscribe(company_index.on_change)
+
+# How a listing's total is computed: exactly (count cached for a few seconds and
+# dropped on changes), approximately (an older cached count is fine), or not at all
+TotalMode = Literal["exact", "approximate", "none"]
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Starts the live job index with the app and stops it on shutdown.
+    
+    Until the index has loaded (or if the listener cannot be started), reads
+    are served from Firestore directly.
+    """
+    try:
+        job_index.start()
+    except Exception as e:
+        print(f"⚠️ Live job index unavailable, reading from Firestore: {e}")
+    yield
+    job_index.stop()
+
+
 app = FastAPI(
     title="Remote Job Bank API",
     description="API for retrieving and managing remote job listings",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Enable CORS
@@ -47,12 +99,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Import Firebase client
-from backend.database.firebase_client import get_firestore_client, exists_in_collection, save_to_collection
-
-# Get Firestore client
-db = get_firestore_client()
-
 class JobData(BaseModel):
     """Schema for job posting data.
     
@@ -102,16 +148,19 @@ class PaginatedResponse(BaseModel):
     
     Attributes:
         items: List of items (jobs) for the current page.
-        total: Total number of items across all pages.
+        total: Total number of items across all pages, or None if not requested.
         page: Current page number.
         size: Number of items per page.
-        pages: Total number of pages.
+        pages: Total number of pages, or None if the total was not requested.
+        next_cursor: Opaque token for the next page, or None on the last page
+            (only for listings paginated in order of job ID).
     """
     items: List[JobData]
-    total: int
+    total: Optional[int] = None
     page: int
     size: int
-    pages: int
+    pages: Optional[int] = None
+    next_cursor: Optional[str] = None
 
 
 async def admin_required(api_key: str = Query(..., alias="api_key")):
@@ -137,7 +186,96 @@ async def admin_required(api_key: str = Query(..., alias="api_key")):
     return True
 
 
-def paginate_results(items: List[Dict], page: int = 1, size: int = 10) -> Dict[str, Any]:
+def encode_cursor(after: str, page: int) -> str:
+    """Encodes the position after a page as an opaque cursor token.
+    
+    Args:
+        after: The ID of the last job on the page.
+        page: The number of the page the cursor leads to.
+        
+    Returns:
+        A URL-safe token.
+    """
+    payload = json.dumps({"after": after, "page": page}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """Decodes a cursor token created by encode_cursor.
+    
+    Args:
+        cursor: The token.
+        
+    Returns:
+        Tuple of the job ID to continue after and the page number.
+        
+    Raises:
+        HTTPException: If the token is not a valid cursor, with a 400 status code.
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        after, page = payload["after"], int(payload["page"])
+        if not isinstance(after, str) or page < 1:
+            raise ValueError(cursor)
+        return after, page
+    except (ValueError, KeyError, TypeError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        ) from e
+
+
+async def read_page(page: int, size: int, cursor: Optional[str] = None,
+                    category: Optional[str] = None, total: TotalMode = "exact") -> Dict[str, Any]:
+    """Reads one page of jobs (in one category) in order of job ID.
+    
+    The page comes from the live index when it is ready. Otherwise only the page is
+    read from Firestore, with order_by + start_after + limit, and the total with a
+    cached count() aggregation. A cursor continues after the previous page; without
+    one, the page number is turned into an offset.
+    
+    Args:
+        page: The page number, used when no cursor is given.
+        size: The number of items per page.
+        cursor: A next_cursor token from a previous response.
+        category: Only return jobs in this category.
+        total: "exact", "approximate" (a count up to 10 minutes old) or "none" (no count).
+        
+    Returns:
+        Dict with the same keys as paginate_results, plus next_cursor.
+    """
+    after = None
+    if cursor:
+        after, page = decode_cursor(cursor)
+    offset = (page - 1) * size
+    
+    count = None
+    if job_index.ready:
+        items, next_after, count = job_index.page_jobs(size, after, offset, category)
+    elif total == "none":
+        items, next_after = await jobs_repository.page_jobs(size, after, offset, category)
+    else:
+        max_age = APPROXIMATE_COUNT_TTL if total == "approximate" else None
+        (items, next_after), count = await asyncio.gather(
+            jobs_repository.page_jobs(size, after, offset, category),
+            jobs_repository.count_jobs(category, max_age)
+        )
+    
+    if total == "none":
+        count = None
+    
+    return {
+        "items": items,
+        "total": count,
+        "page": page,
+        "size": size,
+        "pages": (count + size - 1) // size if count is not None else None,
+        "next_cursor": encode_cursor(next_after, page + 1) if next_after else None
+    }
+
+
+def paginate_results(items: List[Dict], page: int = 1, size: int = 10,
+                     include_total: bool = True) -> Dict[str, Any]:
     """Paginates a list of items.
     
     Takes a list of items and returns a paginated subset based on the
@@ -147,13 +285,14 @@ def paginate_results(items: List[Dict], page: int = 1, size: int = 10) -> Dict[s
         items: The full list of items to paginate.
         page: The requested page number (starting from 1).
         size: The number of items per page.
+        include_total: Whether to report the total count and number of pages.
         
     Returns:
         Dict containing the paginated items, total count, current page,
-        page size, and total number of pages.
+        page size, and total number of pages (None if not included).
     """
-    total = len(items)
-    pages = (total + size - 1) // size  # Ceiling division
+    total = len(items) if include_total else None
+    pages = (total + size - 1) // size if include_total else None  # Ceiling division
     
     start = (page - 1) * size
     end = start + size
@@ -170,36 +309,90 @@ def paginate_results(items: List[Dict], page: int = 1, size: int = 10) -> Dict[s
 @app.get("/data", response_model=PaginatedResponse)
 async def get_all_jobs(
     page: int = Query(1, ge=1, description="Page number"),
-    size: int = Query(10, ge=1, le=100, description="Items per page")
+    size: int = Query(10, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page; takes precedence over page"),
+    total: TotalMode = Query("exact", description="How to count the jobs: exact, approximate or none")
 ):
     """Retrieve all scraped job data with pagination.
     
     Args:
         page: The page number to retrieve (starting from 1).
         size: The number of items per page (between 1 and 100).
+        cursor: The next_cursor of the previous page. Cheaper than page numbers for deep pages.
+        total: "exact", "approximate" to accept a count up to 10 minutes old, or "none"
+            to skip counting (total and pages are then null).
         
     Returns:
         A PaginatedResponse object containing the requested jobs and pagination metadata.
         
     Raises:
-        HTTPException: If there's an error retrieving data from Firestore.
+        HTTPException: If the cursor is invalid (400) or there's an error retrieving data from Firestore (500).
     """
     try:
-        # Get all documents from the 'jobs' collection
-        jobs_ref = db.collection('jobs')
-        docs = jobs_ref.stream()
+        # Read only the requested page
+        return await read_page(page, size, cursor, total=total)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error retrieving data: {str(e)}"
+        )
+
+
+@app.get("/data/search", response_model=PaginatedResponse)
+async def search_jobs(
+    title: Optional[str] = Query(None, description="Search in job title"),
+    description: Optional[str] = Query(None, description="Search in job description"),
+    skills: Optional[str] = Query(None, description="Search for specific skills"),
+    page: int = Query(1, ge=1, description="Page number"),
+    size: int = Query(10, ge=1, le=100, description="Items per page")
+):
+    """Search for jobs based on various criteria.
+    
+    This endpoint allows searching job listings by title, description, or skills.
+    Multiple filters can be applied simultaneously (logical AND). Every term of
+    a query must occur in its field; `term*` matches any term with that prefix
+    and `"two words"` matches the exact phrase. Results are ranked by BM25 relevance.
+    
+    Args:
+        title: Text to search for in job titles.
+        description: Text to search for in job descriptions.
+        skills: Text to search for in job required skills.
+        page: The page number to retrieve (starting from 1).
+        size: The number of items per page (between 1 and 100).
         
-        # Convert to list of dictionaries
-        jobs = [doc.to_dict() for doc in docs]
+    Returns:
+        A PaginatedResponse object containing the matching jobs, best match first,
+        and pagination metadata.
+        
+    Raises:
+        HTTPException: If there's an error during the search process.
+    """
+    try:
+        # Search the live index; until it has loaded, index the jobs read from Firestore
+        if job_index.ready:
+            index, get_job = search_index, job_index.get_job
+        else:
+            jobs = await jobs_repository.list_jobs()
+            # Indexing every job takes a while; keep the event loop serving other requests meanwhile
+            index = await asyncio.to_thread(SearchIndex, jobs)
+            get_job = {job['job_id']: job for job in jobs}.get
         
-        # Apply pagination
-        paginated = paginate_results(jobs, page, size)
+        job_ids = index.search(title=title, description=description, skills=skills)
+        if job_ids is None:
+            # No search terms, so every job matches
+            return await read_page(page, size)
+        
+        # Apply pagination, then look up only the jobs of the page
+        paginated = paginate_results(job_ids, page, size)
+        paginated["items"] = [job for job in map(get_job, paginated["items"]) if job is not None]
         
         return paginated
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error retrieving data: {str(e)}"
+            detail=f"Error searching jobs: {str(e)}"
         )
 
 
@@ -207,7 +400,9 @@ async def get_all_jobs(
 async def get_filtered_data(
     param: str = FastAPIPath(..., description="Category or company name"),
     page: int = Query(1, ge=1, description="Page number"),
-    size: int = Query(10, ge=1, le=100, description="Items per page")
+    size: int = Query(10, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page (categories only)"),
+    total: TotalMode = Query("exact", description="How to count the jobs: exact, approximate or none")
 ):
     """Retrieve job data filtered by category or company name.
     
@@ -219,12 +414,14 @@ async def get_filtered_data(
         param: The category or company name to filter by.
         page: The page number to retrieve (starting from 1).
         size: The number of items per page (between 1 and 100).
+        cursor: The next_cursor of the previous page of a category.
+        total: "exact", "approximate" or "none", as for /data.
         
     Returns:
         A PaginatedResponse object containing the filtered jobs and pagination metadata.
         
     Raises:
-        HTTPException: If there's an error retrieving or filtering data.
+        HTTPException: If the cursor is invalid (400) or there's an error retrieving or filtering data (500).
     """
     try:
         # Decode URL parameter and normalize it
@@ -232,33 +429,39 @@ async def get_filtered_data(
         
         # Check if param is a valid category
         if decoded_param in ALLOWED_CATEGORIES or decoded_param == "All Other Remote Jobs":
-            # This is a category request
-            jobs_ref = db.collection('jobs').where('category', '==', decoded_param)
-            docs = jobs_ref.stream()
-            jobs = [doc.to_dict() for doc in docs]
+            # This is a category request, paginated in the index or the database
+            paginated = await read_page(page, size, cursor, category=decoded_param, total=total)
             
             # For debugging
-            print(f"Category search for '{decoded_param}' found {len(jobs)} jobs")
+            print(f"Category search for '{decoded_param}' found {paginated['total'] if paginated['total'] is not None else 'uncounted'} jobs")
             
-            return paginate_results(jobs, page, size)
+            return paginated
         else:
             # This is a company request - Firestore doesn't support case-insensitive search
-            # so we'll fetch all documents and filter in memory
-            jobs_ref = db.collection('jobs')
-            docs = jobs_ref.stream()
-            
-            # Convert to list and filter for case-insensitive company match
-            all_jobs = [doc.to_dict() for doc in docs]
-            jobs = [
-                job for job in all_jobs 
-                if decoded_param.lower() in job.get('company', '').lower()
-            ]
+            # so the live company index is used, with a scan of every job as the fallback
+            if job_index.ready:
+                # Intersect the trigram postings, then look up only the jobs of the page
+                job_ids = company_index.lookup(decoded_param)
+                paginated = paginate_results(job_ids, page, size, include_total=total != "none")
+                paginated["items"] = [job for job in map(job_index.get_job, paginated["items"]) if job is not None]
+                matches = len(job_ids)
+            else:
+                # Filter for case-insensitive company match
+                all_jobs = await jobs_repository.list_jobs()
+                jobs = [
+                    job for job in all_jobs 
+                    if decoded_param.lower() in job.get('company', '').lower()
+                ]
+                paginated = paginate_results(jobs, page, size, include_total=total != "none")
+                matches = len(jobs)
             
             # For debugging
-            print(f"Company search for '{decoded_param}' found {len(jobs)} jobs")
+            print(f"Company search for '{decoded_param}' found {matches} jobs")
             
-            return paginate_results(jobs, page, size)
+            return paginated
             
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -286,20 +489,15 @@ async def delete_job(
         HTTPException: If the job doesn't exist (404) or there's an error during deletion (500).
     """
     try:
-        # Get the job document reference
-        job_ref = db.collection('jobs').document(job_id)
-        
-        # Check if the job exists
-        job = job_ref.get()
-        if not job.exists:
+        # Delete the job, if it exists
+        if not await jobs_repository.delete_job(job_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Job with ID {job_id} not found"
             )
         
-        # Delete the job
-        job_ref.delete()
-        
+        # Don't serve the job until the listener reports the deletion
+        job_index.discard(job_id)
         return None
     except HTTPException:
         # Re-raise HTTP exceptions
@@ -311,86 +509,19 @@ async def delete_job(
         )
 
 
-@app.get("/data/search", response_model=PaginatedResponse)
-async def search_jobs(
-    title: Optional[str] = Query(None, description="Search in job title"),
-    description: Optional[str] = Query(None, description="Search in job description"),
-    skills: Optional[str] = Query(None, description="Search for specific skills"),
-    page: int = Query(1, ge=1, description="Page number"),
-    size: int = Query(10, ge=1, le=100, description="Items per page")
-):
-    """Search for jobs based on various criteria.
-    
-    This endpoint allows searching job listings by title, description, or skills.
-    Multiple filters can be applied simultaneously (logical AND).
-    
-    Args:
-        title: Text to search for in job titles.
-        description: Text to search for in job descriptions.
-        skills: Text to search for in job required skills.
-        page: The page number to retrieve (starting from 1).
-        size: The number of items per page (between 1 and 100).
-        
-    Returns:
-        A PaginatedResponse object containing the matching jobs and pagination metadata.
-        
-    Raises:
-        HTTPException: If there's an error during the search process.
-        
-    Note:
-        This implementation fetches all data and filters in memory. For production,
-        consider using a proper search engine for better performance.
-    """
-    try:
-        # Start with the base collection
-        jobs_ref = db.collection('jobs')
-        
-        # Apply filters if provided
-        # Note: Firestore doesn't support complex queries like CONTAINS
-        # This is a workaround that fetches all data and filters in memory
-        docs = jobs_ref.stream()
-        jobs = [doc.to_dict() for doc in docs]
-        
-        # Apply filters in memory
-        filtered_jobs = jobs
-        
-        if title:
-            filtered_jobs = [
-                job for job in filtered_jobs 
-                if title.lower() in job.get('title', '').lower()
-            ]
-            
-        if description:
-            filtered_jobs = [
-                job for job in filtered_jobs 
-                if description.lower() in job.get('job_description', '').lower()
-            ]
-            
-        if skills:
-            filtered_jobs = [
-                job for job in filtered_jobs 
-                if any(skills.lower() in skill.lower() for skill in job.get('skills', []))
-            ]
-            
-        # Apply pagination
-        paginated = paginate_results(filtered_jobs, page, size)
-        
-        return paginated
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error searching jobs: {str(e)}"
-        )
-
-
 @app.get("/health")
 async def health_check():
     """Health check endpoint to verify API is running.
     
     Returns:
-        Dict containing status ("healthy") and current timestamp.
+        Dict containing status ("healthy"), current timestamp, and whether reads
+        are served from the live job index ("live") or from Firestore ("firestore").
     """
-    return {"status": "healthy", "timestamp": datetime.now().isoformat()}
+    return {
+        "status": "healthy",
+        "timestamp": datetime.now().isoformat(),
+        "job_index": "live" if job_index.ready else "firestore"
+    }
 
 
 if __name__ == "__main__":
@@ -0,0 +1,109 @@
+"""Case-insensitive company name lookup with a trigram index.
+
+Firestore can't match part of a company name regardless of case, so the API
+used to scan every job. This index maps every three-character sequence of a
+lowercased company name to the names containing it, and every name to its
+jobs. A lookup intersects the names of the query's trigrams and checks the
+few candidates left, without touching the other jobs. It is updated one job
+at a time as the job index reports changes.
+"""
+
+import threading
+from typing import Any, Dict, List, Optional, Set
+
+
+def normalize(name: str) -> str:
+    """Lowercases a company name or query, so they compare like str.lower() in str.lower()."""
+    return name.lower()
+
+
+def trigrams(text: str) -> Set[str]:
+    """Returns every three-character substring of text."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class CompanyIndex:
+    """A trigram index over the company names of the jobs.
+
+    Updates and lookups hold a lock, so the index can be updated from the
+    listener's thread while the event loop reads it.
+    """
+
+    def __init__(self):
+        """Creates an empty index."""
+        self._lock = threading.Lock()
+        self._trigrams: Dict[str, Set[str]] = {}   # trigram -> names containing it
+        self._names: Dict[str, Set[str]] = {}      # name -> job IDs
+        self._job_names: Dict[str, str] = {}       # job ID -> name
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._job_names)
+
+    def on_change(self, job_id: str, old_job: Optional[Dict[str, Any]], new_job: Optional[Dict[str, Any]]) -> None:
+        """Applies a change reported by JobIndex.subscribe."""
+        if new_job is None:
+            self.remove(job_id)
+        else:
+            self.add(job_id, new_job)
+
+    def add(self, job_id: str, job: Dict[str, Any]) -> None:
+        """Indexes a job's company, replacing its previous one."""
+        name = normalize(job.get('company') or '')
+        with self._lock:
+            if self._job_names.get(job_id) == name:
+                return
+            self._remove(job_id)
+            if not name:
+                return
+            self._job_names[job_id] = name
+            job_ids = self._names.get(name)
+            if job_ids is None:
+                job_ids = self._names[name] = set()
+                for trigram in trigrams(name):
+                    self._trigrams.setdefault(trigram, set()).add(name)
+            job_ids.add(job_id)
+
+    def remove(self, job_id: str) -> None:
+        """Removes a job from the index, if it is indexed."""
+        with self._lock:
+            self._remove(job_id)
+
+    def _remove(self, job_id: str) -> None:
+        """Must be called with the lock held."""
+        name = self._job_names.pop(job_id, None)
+        if name is None:
+            return
+        job_ids = self._names[name]
+        job_ids.discard(job_id)
+        if job_ids:
+            return
+        # The last job of this company is gone
+        del self._names[name]
+        for trigram in trigrams(name):
+            names = self._trigrams[trigram]
+            names.discard(name)
+            if not names:
+                del self._trigrams[trigram]
+
+    def lookup(self, query: str) -> List[str]:
+        """Finds the jobs whose company name contains the query, ignoring case.
+
+        Args:
+            query: Part of a company name.
+
+        Returns:
+            The matching job IDs, sorted like a collection stream.
+        """
+        query = normalize(query)
+        with self._lock:
+            query_trigrams = trigrams(query)
+            if query_trigrams:
+                # Start with the rarest trigram so the candidates shrink quickly
+                postings = sorted((self._trigrams.get(trigram, set()) for trigram in query_trigrams), key=len)
+                candidates = postings[0].intersection(*postings[1:])
+            else:
+                # Too short for a trigram; check every distinct name instead of every job
+                candidates = self._names.keys()
+            job_ids = [job_id for name in candidates if query in name for job_id in self._names[name]]
+        return sorted(job_ids)
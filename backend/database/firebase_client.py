@@ -1,7 +1,8 @@
 import os
 from pathlib import Path
 import firebase_admin
-from firebase_admin import credentials, firestore
+from firebase_admin import credentials, firestore, firestore_async
+from google.api_core.exceptions import Conflict
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -25,14 +26,27 @@ def get_firebase_credentials():
         "client_x509_cert_url": os.getenv("FIREBASE_CLIENT_X509_CERT_URL")
     }
 
-# Initialize Firebase and return firestore client
-def get_firestore_client():
+def initialize_firebase():
     if not firebase_admin._apps:
         firebase_cred = get_firebase_credentials()
         cred = credentials.Certificate(firebase_cred)
         firebase_admin.initialize_app(cred)
+
+# Initialize Firebase and return firestore client
+def get_firestore_client():
+    initialize_firebase()
     return firestore.client()
 
+_async_client = None
+
+def get_async_firestore_client():
+    """Return the shared Firestore AsyncClient, initializing Firebase on first use"""
+    global _async_client
+    if _async_client is None:
+        initialize_firebase()
+        _async_client = firestore_async.client()
+    return _async_client
+
 # Database operations
 def exists_in_collection(collection_name, doc_id):
     """Check if a document already exists in the specified Firestore collection"""
@@ -45,8 +59,49 @@ def exists_in_collection(collection_name, doc_id):
         # In case of error, return False to allow processing attempt
         return False
 
-def save_to_collection(collection_name, data, doc_id=None, dry_run=False):
-    """Save data to Firestore collection, avoiding duplicates"""
+def list_document_ids(collection_name):
+    """List every document ID in a collection with a single keys-only query"""
+    try:
+        db = get_firestore_client()
+        # An empty projection returns document names only, without field data
+        return [doc.id for doc in db.collection(collection_name).select([]).stream()]
+    except Exception as e:
+        print(f"Error listing document IDs: {e}")
+        return None
+
+def list_document_fields(collection_name, fields):
+    """List selected fields of every document in a collection, as {doc_id: {field: value}}"""
+    try:
+        db = get_firestore_client()
+        return {doc.id: doc.to_dict() or {} for doc in db.collection(collection_name).select(fields).stream()}
+    except Exception as e:
+        print(f"Error listing document fields: {e}")
+        return None
+
+def update_in_collection(collection_name, doc_id, fields, raise_errors=False):
+    """Update only the given fields of an existing document.
+
+    Errors are printed and reported as False, or raised with raise_errors=True
+    so the caller can retry them.
+    """
+    try:
+        db = get_firestore_client()
+        db.collection(collection_name).document(doc_id).update(fields)
+        return True
+    except Exception as e:
+        if raise_errors:
+            raise
+        print(f"❌ Firestore update error: {e}")
+        return False
+
+def save_to_collection(collection_name, data, doc_id=None, dry_run=False, raise_errors=False):
+    """Save data to Firestore collection, avoiding duplicates.
+
+    The document is written with create(), which fails atomically if it already
+    exists, so concurrent scrapers never both insert the same ID. Other errors are
+    printed and reported as False, or raised with raise_errors=True so the caller
+    can retry them.
+    """
     try:
         if not doc_id and 'job_id' in data:
             doc_id = data['job_id']
@@ -60,14 +115,15 @@ def save_to_collection(collection_name, data, doc_id=None, dry_run=False):
         db = get_firestore_client()
         doc_ref = db.collection(collection_name).document(doc_id)
         
-        # Check if document exists
-        if not doc_ref.get().exists:
-            doc_ref.set(data)
-            print(f"✅ Saved document: {doc_id}")
-            return True
-        else:
+        try:
+            doc_ref.create(data)
+        except Conflict:
             print(f"⏩ Document already exists: {doc_id}")
             return False
+        print(f"✅ Saved document: {doc_id}")
+        return True
     except Exception as e:
+        if raise_errors:
+            raise
         print(f"❌ Firestore error: {e}")
         return False 
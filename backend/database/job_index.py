@@ -0,0 +1,184 @@
+"""In-memory index of the job collection, kept current by a Firestore listener.
+
+The API serves its reads from this index instead of streaming the whole collection
+on every request. The listener's first snapshot loads every job once; after that
+Firestore only sends the documents that were added, changed or removed, so a read
+is a memory lookup and costs no Firestore reads.
+"""
+
+import bisect
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from google.cloud.firestore_v1.watch import ChangeType
+
+from backend.database.firebase_client import get_firestore_client
+
+
+class JobIndex:
+    """The jobs of a Firestore collection, held in memory in document ID order.
+
+    Snapshot callbacks arrive on the listener's thread; every read and update
+    holds a lock, so the index can be read from the event loop at any time.
+    Other structures derived from the jobs (caches, search indexes) subscribe()
+    to be told about every change.
+
+    Attributes:
+        collection_name: The Firestore collection mirrored by the index.
+    """
+
+    def __init__(self, collection_name: str = 'jobs', client=None):
+        """Creates an empty index.
+
+        Args:
+            collection_name: The Firestore collection. Defaults to 'jobs'.
+            client: A Firestore Client to listen with. Defaults to the shared client.
+        """
+        self.collection_name = collection_name
+        self._client = client
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._ids: List[str] = []
+        self._category_ids: Dict[str, List[str]] = {}
+        self._lock = threading.Lock()
+        self._loaded = threading.Event()
+        self._watch = None
+        self._subscribers: List[Callable] = []
+
+    def subscribe(self, callback: Callable) -> None:
+        """Calls callback(job_id, old_job, new_job) after every change, outside the index lock.
+
+        old_job is None for an added job and new_job is None for a removed one. The
+        first snapshot reports every job as added.
+        """
+        self._subscribers.append(callback)
+
+    def _notify(self, changed: List[Tuple[str, Optional[Dict[str, Any]], Optional[Dict[str, Any]]]]) -> None:
+        for callback in self._subscribers:
+            for job_id, old, new in changed:
+                try:
+                    callback(job_id, old, new)
+                except Exception as e:
+                    print(f"⚠️ Job index subscriber failed for {job_id}: {e}")
+
+    def start(self) -> None:
+        """Subscribes to the collection. The index is ready once the first snapshot has arrived."""
+        client = self._client or get_firestore_client()
+        self._watch = client.collection(self.collection_name).on_snapshot(self._on_snapshot)
+
+    def stop(self) -> None:
+        """Unsubscribes from the collection. Reads fall back to Firestore afterwards."""
+        watch, self._watch = self._watch, None
+        self._loaded.clear()
+        if watch is not None:
+            watch.unsubscribe()
+
+    @property
+    def ready(self) -> bool:
+        """True while the index holds the whole collection and its listener is streaming."""
+        return self._loaded.is_set() and self._watch is not None and self._watch.is_active
+
+    def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        """Blocks until the first snapshot has been loaded.
+
+        Args:
+            timeout: Seconds to wait at most. Defaults to waiting indefinitely.
+
+        Returns:
+            bool: True if the index is ready.
+        """
+        self._loaded.wait(timeout)
+        return self.ready
+
+    def _on_snapshot(self, docs, changes, read_time) -> None:
+        """Applies the changes of one snapshot. The first snapshot adds every document."""
+        changed = []
+        with self._lock:
+            for change in changes:
+                job_id = change.document.id
+                if change.type == ChangeType.REMOVED:
+                    removed = self._remove(job_id)
+                    if removed is not None:
+                        changed.append((job_id, removed, None))
+                else:
+                    job = change.document.to_dict() or {}
+                    changed.append((job_id, self._put(job_id, job), job))
+        self._notify(changed)
+        if not self._loaded.is_set():
+            print(f"📇 Job index loaded: {len(self)} jobs")
+            self._loaded.set()
+
+    def _put(self, job_id: str, job: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Adds or replaces a job and returns the replaced one. Must be called with the lock held."""
+        old = self._jobs.get(job_id)
+        if old is None:
+            bisect.insort(self._ids, job_id)
+        elif old.get('category') != job.get('category'):
+            self._unlist(self._category_ids.get(old.get('category')), job_id)
+            old = None
+        if old is None:
+            bisect.insort(self._category_ids.setdefault(job.get('category'), []), job_id)
+        replaced, self._jobs[job_id] = self._jobs.get(job_id), job
+        return replaced
+
+    def _remove(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Removes a job if it is indexed and returns it. Must be called with the lock held."""
+        job = self._jobs.pop(job_id, None)
+        if job is not None:
+            self._unlist(self._ids, job_id)
+            self._unlist(self._category_ids.get(job.get('category')), job_id)
+        return job
+
+    @staticmethod
+    def _unlist(ids: Optional[List[str]], job_id: str) -> None:
+        if ids:
+            position = bisect.bisect_left(ids, job_id)
+            if position < len(ids) and ids[position] == job_id:
+                del ids[position]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._jobs)
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        """Returns every job, ordered by job ID like a collection stream."""
+        with self._lock:
+            return [self._jobs[job_id] for job_id in self._ids]
+
+    def list_by_category(self, category: str) -> List[Dict[str, Any]]:
+        """Returns the jobs in one category, ordered by job ID."""
+        with self._lock:
+            return [self._jobs[job_id] for job_id in self._category_ids.get(category, [])]
+
+    def page_jobs(self, size: int, after: Optional[str] = None, offset: int = 0,
+                  category: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str], int]:
+        """Returns one page of jobs in job ID order, like JobRepository.page_jobs.
+
+        Args:
+            size: Jobs per page.
+            after: Start after this job ID (the cursor of the previous page).
+            offset: Jobs to skip when no cursor is given.
+            category: Only return jobs in this category.
+
+        Returns:
+            Tuple of the page's jobs, the job ID to continue after (None on the last
+            page) and the number of matching jobs.
+        """
+        with self._lock:
+            ids = self._ids if category is None else self._category_ids.get(category, [])
+            start = bisect.bisect_right(ids, after) if after is not None else offset
+            page_ids = ids[start:start + size]
+            has_more = start + size < len(ids)
+            return ([self._jobs[job_id] for job_id in page_ids],
+                    page_ids[-1] if has_more else None, len(ids))
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Returns one job, or None if it is not indexed."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def discard(self, job_id: str) -> None:
+        """Removes a job ahead of its listener event, e.g. right after the API deleted it."""
+        with self._lock:
+            job = self._remove(job_id)
+        if job is not None:
+            self._notify([(job_id, job, None)])
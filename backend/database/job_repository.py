@@ -0,0 +1,148 @@
+"""Async data access for the job collection.
+
+The API reads and deletes jobs through this module. It uses one shared Firestore
+AsyncClient, so a slow query awaits its results without blocking the event loop
+and other requests keep being served. Totals are counted with aggregation queries,
+which transfer no job data, and are cached per filter for a short time.
+"""
+
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from backend.database.firebase_client import get_async_firestore_client
+
+COUNT_TTL = 30.0               # Seconds a count is reused for exact totals
+APPROXIMATE_COUNT_TTL = 600.0  # Seconds a count is reused for approximate totals
+
+
+class JobRepository:
+    """Async reads and deletes on a Firestore job collection.
+
+    Attributes:
+        collection_name: The Firestore collection holding the jobs.
+        count_ttl: Seconds a cached count is reused unless a caller asks otherwise.
+    """
+
+    def __init__(self, collection_name: str = 'jobs', client=None, count_ttl: float = COUNT_TTL):
+        """Creates a repository.
+
+        Args:
+            collection_name: The Firestore collection. Defaults to 'jobs'.
+            client: An AsyncClient to use. Defaults to the shared client, created on first use.
+            count_ttl: Seconds a cached count is reused. Defaults to 30.
+        """
+        self.collection_name = collection_name
+        self._client = client
+        self.count_ttl = count_ttl
+        self._counts: Dict[Optional[str], Tuple[int, float]] = {}
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = get_async_firestore_client()
+        return self._client
+
+    @property
+    def collection(self):
+        return self.client.collection(self.collection_name)
+
+    async def _stream(self, query) -> List[Dict[str, Any]]:
+        return [doc.to_dict() async for doc in query.stream()]
+
+    async def list_jobs(self) -> List[Dict[str, Any]]:
+        """Returns every job in the collection."""
+        return await self._stream(self.collection)
+
+    async def list_by_category(self, category: str) -> List[Dict[str, Any]]:
+        """Returns the jobs in one category."""
+        return await self._stream(self._filtered(category))
+
+    def _filtered(self, category: Optional[str] = None):
+        query = self.collection
+        if category is not None:
+            query = query.where('category', '==', category)
+        return query
+
+    async def page_jobs(self, size: int, after: Optional[str] = None, offset: int = 0,
+                        category: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Returns one page of jobs in job ID order, reading only that page.
+
+        The query is ordered by document ID and limited to one document more than
+        the page, which tells whether another page follows.
+
+        Args:
+            size: Jobs per page.
+            after: Start after this job ID (the cursor of the previous page).
+            offset: Jobs to skip when no cursor is given. Skipped documents are
+                still read by Firestore, so cursors are cheaper for deep pages.
+            category: Only return jobs in this category.
+
+        Returns:
+            Tuple of the page's jobs and the job ID to continue after, or None on the last page.
+        """
+        query = self._filtered(category).order_by('__name__')
+        if after is not None:
+            query = query.start_after({'__name__': after})
+        elif offset:
+            query = query.offset(offset)
+        docs = [doc async for doc in query.limit(size + 1).stream()]
+        has_more = len(docs) > size
+        docs = docs[:size]
+        return [doc.to_dict() for doc in docs], docs[-1].id if has_more else None
+
+    async def count_jobs(self, category: Optional[str] = None, max_age: Optional[float] = None) -> int:
+        """Counts the jobs (in one category) with an aggregation query, without reading them.
+
+        Counts are cached per category until they are older than max_age or
+        invalidated by a change to the collection.
+
+        Args:
+            category: Only count jobs in this category.
+            max_age: Seconds a cached count may be reused. Defaults to count_ttl.
+
+        Returns:
+            int: The number of jobs.
+        """
+        max_age = self.count_ttl if max_age is None else max_age
+        cached = self._counts.get(category)
+        if cached is not None and time.monotonic() - cached[1] <= max_age:
+            return cached[0]
+        result = await self._filtered(category).count().get()
+        count = int(result[0][0].value)
+        self._counts[category] = (count, time.monotonic())
+        return count
+
+    def invalidate_counts(self, categories: Optional[Iterable[Optional[str]]] = None) -> None:
+        """Drops cached counts after the collection changed.
+
+        Args:
+            categories: The categories of the changed jobs. The total of all jobs is always
+                dropped with them. Defaults to dropping every cached count.
+        """
+        if categories is None:
+            self._counts.clear()
+            return
+        for category in (None, *categories):
+            self._counts.pop(category, None)
+
+    async def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Returns one job, or None if it does not exist."""
+        doc = await self.collection.document(job_id).get()
+        return doc.to_dict() if doc.exists else None
+
+    async def delete_job(self, job_id: str) -> bool:
+        """Deletes one job.
+
+        Args:
+            job_id: The ID of the job to delete.
+
+        Returns:
+            bool: False if the job does not exist, True once it is deleted.
+        """
+        job_ref = self.collection.document(job_id)
+        doc = await job_ref.get()
+        if not doc.exists:
+            return False
+        await job_ref.delete()
+        self.invalidate_counts([(doc.to_dict() or {}).get('category')])
+        return True
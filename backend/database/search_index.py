@@ -0,0 +1,249 @@
+"""Full-text search over the jobs, ranked with BM25.
+
+An inverted index maps every token of a job's title, description and skills to
+the jobs containing it, with the token's positions. A query only touches the
+postings of its own terms, so its cost depends on how many jobs match rather
+than on the size of the collection. The index is updated one job at a time as
+the job index reports changes.
+
+Query syntax, per field:
+    engineer python      both terms must occur (in any order)
+    eng*                 any term starting with "eng"
+    "site reliability"   the terms must occur next to each other, in this order
+"""
+
+import bisect
+import html
+import math
+import re
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+# Searchable fields, keyed by the search parameter that queries them
+FIELDS = {
+    'title': 'title',
+    'description': 'job_description',
+    'skills': 'skills',
+}
+
+K1 = 1.2                # BM25 term frequency saturation
+B = 0.75                # BM25 document length normalization
+MAX_PREFIX_TERMS = 64   # Terms a prefix expands to at most, shortest first
+
+# Words and numbers, keeping a trailing + or # so "C++" and "C#" stay searchable
+TOKEN_PATTERN = re.compile(r"[^\W_]+[+#]*")
+QUERY_PATTERN = re.compile(r'"([^"]*)"?|(\S+)')
+# Tags and comments of the HTML job descriptions
+TAG_PATTERN = re.compile(r"<!--.*?-->|</?[A-Za-z][^>]*>", re.DOTALL)
+
+
+def tokenize(text: str) -> List[str]:
+    """Splits text into lowercase tokens."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def strip_html(text: str) -> str:
+    """Replaces the tags of an HTML fragment with spaces and decodes its entities."""
+    return html.unescape(TAG_PATTERN.sub(' ', text))
+
+
+def parse_query(query: str) -> List[Tuple[str, List[str]]]:
+    """Parses a query into clauses that must all match.
+
+    Args:
+        query: The query text.
+
+    Returns:
+        List of (kind, tokens) clauses, where kind is 'term', 'prefix' or 'phrase'.
+    """
+    clauses = []
+    for match in QUERY_PATTERN.finditer(query):
+        phrase, word = match.groups()
+        tokens = tokenize(phrase if phrase is not None else word)
+        if len(tokens) > 1:
+            # A quoted phrase, or a word like "node.js" that splits into several tokens
+            clauses.append(('phrase', tokens))
+        elif tokens:
+            prefix = phrase is None and word.endswith('*')
+            clauses.append(('prefix' if prefix else 'term', tokens))
+    return clauses
+
+
+def field_tokens(job: Dict[str, Any], field: str) -> List[str]:
+    """Returns the tokens of one field of a job, without its HTML markup.
+
+    Skills are kept apart so phrases don't span two skills.
+    """
+    value = job.get(field)
+    if isinstance(value, list):
+        tokens = []
+        for item in value:
+            if tokens:
+                tokens.append('')
+            tokens.extend(tokenize(strip_html(str(item))))
+        return tokens
+    return tokenize(strip_html(value)) if isinstance(value, str) else []
+
+
+class SearchIndex:
+    """An inverted index over the searchable fields of the jobs.
+
+    Updates and searches hold a lock, so the index can be updated from the
+    listener's thread while the event loop searches it.
+    """
+
+    def __init__(self, jobs: Optional[Iterable[Dict[str, Any]]] = None):
+        """Creates an index.
+
+        Args:
+            jobs: Jobs to index right away, keyed by their job_id.
+        """
+        self._lock = threading.Lock()
+        # field -> term -> job ID -> positions of the term in the field
+        self._postings: Dict[str, Dict[str, Dict[str, List[int]]]] = {field: {} for field in FIELDS.values()}
+        # field -> sorted terms, for prefix lookups
+        self._terms: Dict[str, List[str]] = {field: [] for field in FIELDS.values()}
+        self._lengths: Dict[str, Dict[str, int]] = {field: {} for field in FIELDS.values()}
+        self._total_lengths: Dict[str, int] = {field: 0 for field in FIELDS.values()}
+        self._doc_terms: Dict[str, Dict[str, Set[str]]] = {}
+        for job in jobs or ():
+            self.add(job['job_id'], job)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._doc_terms)
+
+    def on_change(self, job_id: str, old_job: Optional[Dict[str, Any]], new_job: Optional[Dict[str, Any]]) -> None:
+        """Applies a change reported by JobIndex.subscribe."""
+        if new_job is None:
+            self.remove(job_id)
+        else:
+            self.add(job_id, new_job)
+
+    def add(self, job_id: str, job: Dict[str, Any]) -> None:
+        """Indexes a job, replacing its previous version."""
+        with self._lock:
+            self._remove(job_id)
+            doc_terms = {}
+            for field in FIELDS.values():
+                tokens = field_tokens(job, field)
+                positions: Dict[str, List[int]] = {}
+                for position, token in enumerate(tokens):
+                    if token:
+                        positions.setdefault(token, []).append(position)
+                for term, term_positions in positions.items():
+                    postings = self._postings[field].get(term)
+                    if postings is None:
+                        postings = self._postings[field][term] = {}
+                        bisect.insort(self._terms[field], term)
+                    postings[job_id] = term_positions
+                self._lengths[field][job_id] = len(tokens)
+                self._total_lengths[field] += len(tokens)
+                doc_terms[field] = set(positions)
+            self._doc_terms[job_id] = doc_terms
+
+    def remove(self, job_id: str) -> None:
+        """Removes a job from the index, if it is indexed."""
+        with self._lock:
+            self._remove(job_id)
+
+    def _remove(self, job_id: str) -> None:
+        """Must be called with the lock held."""
+        doc_terms = self._doc_terms.pop(job_id, None)
+        if doc_terms is None:
+            return
+        for field, terms in doc_terms.items():
+            for term in terms:
+                postings = self._postings[field][term]
+                del postings[job_id]
+                if not postings:
+                    del self._postings[field][term]
+                    terms_list = self._terms[field]
+                    del terms_list[bisect.bisect_left(terms_list, term)]
+            self._total_lengths[field] -= self._lengths[field].pop(job_id)
+
+    def search(self, **queries: Optional[str]) -> Optional[List[str]]:
+        """Finds the jobs matching every query, best match first.
+
+        Args:
+            **queries: Query text per search parameter (title, description, skills).
+                Empty queries are ignored.
+
+        Returns:
+            The matching job IDs ordered by BM25 score, or None if no query had any terms.
+        """
+        clauses = [(FIELDS[name], clause) for name, query in queries.items() if query
+                   for clause in parse_query(query)]
+        if not clauses:
+            return None
+
+        with self._lock:
+            scores: Optional[Dict[str, float]] = None
+            # Match the rarest clauses first so the candidates shrink quickly
+            for field, clause in sorted(clauses, key=lambda item: self._estimate(*item)):
+                matches = self._match(field, clause, scores)
+                if scores is None:
+                    scores = matches
+                else:
+                    scores = {job_id: scores[job_id] + score for job_id, score in matches.items()}
+                if not scores:
+                    return []
+
+        return sorted(scores, key=lambda job_id: (-scores[job_id], job_id))
+
+    def _estimate(self, field: str, clause: Tuple[str, List[str]]) -> int:
+        """An upper bound on the jobs a clause matches, to order the clauses by."""
+        kind, tokens = clause
+        if kind == 'prefix':
+            return len(self._doc_terms)
+        return min(len(self._postings[field].get(token, ())) for token in tokens)
+
+    def _match(self, field: str, clause: Tuple[str, List[str]],
+               candidates: Optional[Dict[str, float]]) -> Dict[str, float]:
+        """Scores the jobs matching one clause, limited to the candidates if given."""
+        kind, tokens = clause
+        if kind == 'prefix':
+            scores: Dict[str, float] = {}
+            for term in self._expand(field, tokens[0]):
+                for job_id, score in self._score(field, term, candidates).items():
+                    scores[job_id] = scores.get(job_id, 0.0) + score
+            return scores
+
+        term_scores = [self._score(field, token, candidates) for token in tokens]
+        matching = set.intersection(*(set(scores) for scores in term_scores))
+        if kind == 'phrase':
+            matching = {job_id for job_id in matching if self._adjacent(field, tokens, job_id)}
+        return {job_id: sum(scores[job_id] for scores in term_scores) for job_id in matching}
+
+    def _expand(self, field: str, prefix: str) -> List[str]:
+        """Returns the indexed terms starting with prefix, shortest first."""
+        terms = self._terms[field]
+        start = bisect.bisect_left(terms, prefix)
+        end = bisect.bisect_left(terms, prefix + '\uffff', start)
+        return sorted(terms[start:end], key=len)[:MAX_PREFIX_TERMS]
+
+    def _adjacent(self, field: str, tokens: List[str], job_id: str) -> bool:
+        """True if the tokens occur next to each other, in order, in the job's field."""
+        positions = [set(self._postings[field][token][job_id]) for token in tokens]
+        return any(all(start + offset in positions[offset] for offset in range(1, len(tokens)))
+                   for start in positions[0])
+
+    def _score(self, field: str, term: str, candidates: Optional[Dict[str, float]]) -> Dict[str, float]:
+        """BM25 scores of a term for the jobs containing it."""
+        postings = self._postings[field].get(term)
+        if not postings:
+            return {}
+        count = len(self._doc_terms)
+        idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+        average_length = self._total_lengths[field] / count or 1
+        lengths = self._lengths[field]
+        if candidates is not None and len(candidates) < len(postings):
+            job_ids = [job_id for job_id in candidates if job_id in postings]
+        else:
+            job_ids = postings if candidates is None else [job_id for job_id in postings if job_id in candidates]
+        scores = {}
+        for job_id in job_ids:
+            frequency = len(postings[job_id])
+            norm = K1 * (1 - B + B * lengths[job_id] / average_length)
+            scores[job_id] = idf * frequency * (K1 + 1) / (frequency + norm)
+        return scores
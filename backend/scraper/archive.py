@@ -0,0 +1,137 @@
+# Description: A compressed, content-addressed archive of fetched listing pages.
+# Page bodies are compressed (zstd when the zstandard package is installed, zlib otherwise)
+# and appended to segment files; a SQLite index maps each job_id (as its job source
+# derives it) and fetch time to its page. Identical pages are stored once. The archive
+# lets extraction be re-run after a parser change without crawling the site again.
+
+import hashlib
+import threading
+import time
+import zlib
+from pathlib import Path
+from backend.scraper.local_store import connect, state_path
+from backend.scraper.sources import source_for
+
+try:
+    import zstandard
+except ImportError:  # Optional: zlib is used when zstandard is not installed
+    zstandard = None
+
+SEGMENT_SIZE = 256 * 1024 * 1024  # Start a new segment file after 256 MB
+
+def _compress(data):
+    """Return (codec, compressed bytes) using the best available codec."""
+    if zstandard is not None:
+        return 'zstd', zstandard.ZstdCompressor(level=10).compress(data)
+    return 'zlib', zlib.compress(data, 6)
+
+def _decompress(codec, data):
+    if codec == 'zstd':
+        if zstandard is None:
+            raise RuntimeError("This page was archived with zstd; install the zstandard package to read it")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return zlib.decompress(data)
+
+class PageArchive:
+    """
+    Append-only store of page HTML with a SQLite index.
+
+    Args:
+        path (str or Path, optional): The archive directory. Defaults to archive/ in the state directory.
+    """
+
+    def __init__(self, path=None):
+        self.path = Path(path or state_path("archive"))
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = connect(self.path / "index.sqlite3")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS blobs (digest TEXT PRIMARY KEY, segment TEXT, offset INTEGER, length INTEGER, codec TEXT)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages (job_id TEXT, url TEXT, fetched_at REAL, digest TEXT, "
+            "PRIMARY KEY (job_id, fetched_at))"
+        )
+
+    def _segment_for(self, size):
+        """Return the segment file to append to. Must be called with the lock held."""
+        segments = sorted(self.path.glob("segment-*.dat"))
+        if segments and segments[-1].stat().st_size + size <= SEGMENT_SIZE:
+            return segments[-1]
+        return self.path / f"segment-{len(segments) + 1:06d}.dat"
+
+    def store(self, url, html, fetched_at=None):
+        """
+        Archive the HTML of a listing page.
+
+        Args:
+            url (str): The listing URL.
+            html (str): The page HTML.
+            fetched_at (float, optional): Unix time of the fetch. Defaults to now.
+
+        Returns:
+            str: The SHA-256 digest the page is stored under.
+        """
+        data = html.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        # Keyed like the stored job, so boards sharing a slug don't share an entry
+        job_id = source_for(url).job_id(url)
+        fetched_at = fetched_at if fetched_at is not None else time.time()
+
+        with self._lock:
+            known = self._conn.execute("SELECT 1 FROM blobs WHERE digest = ?", (digest,)).fetchone()
+            if not known:
+                codec, compressed = _compress(data)
+                segment = self._segment_for(len(compressed))
+                # Append the bytes before indexing them; a crash leaves unreferenced bytes, never a broken index
+                with open(segment, 'ab') as f:
+                    offset = f.tell()
+                    f.write(compressed)
+                self._conn.execute(
+                    "INSERT INTO blobs (digest, segment, offset, length, codec) VALUES (?, ?, ?, ?, ?)",
+                    (digest, segment.name, offset, len(compressed), codec),
+                )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (job_id, url, fetched_at, digest) VALUES (?, ?, ?, ?)",
+                (job_id, url, fetched_at, digest),
+            )
+        return digest
+
+    def load(self, digest):
+        """
+        Return the HTML stored under a digest, or None if it is not in the archive.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT segment, offset, length, codec FROM blobs WHERE digest = ?", (digest,)
+            ).fetchone()
+        if not row:
+            return None
+        segment, offset, length, codec = row
+        with open(self.path / segment, 'rb') as f:
+            f.seek(offset)
+            return _decompress(codec, f.read(length)).decode('utf-8')
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(DISTINCT job_id) FROM pages").fetchone()[0]
+
+    def iter_latest(self):
+        """
+        Yield the most recent archived page of every job.
+
+        Yields:
+            tuple: (url, html, fetched_at)
+        """
+        with self._lock:
+            # SQLite returns the other columns from the row holding MAX(fetched_at)
+            rows = self._conn.execute(
+                "SELECT url, digest, MAX(fetched_at) FROM pages GROUP BY job_id ORDER BY job_id"
+            ).fetchall()
+        for url, digest, fetched_at in rows:
+            html = self.load(digest)
+            if html is not None:
+                yield url, html, fetched_at
+
+    def close(self):
+        self._conn.close()
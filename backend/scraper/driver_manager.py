@@ -0,0 +1,249 @@
+# Description: WebDriver lifecycle management.
+# A worker's Chrome is kept warm between pages and recycled after a number of pages,
+# when its memory grows past a threshold, or when it died. A watchdog thread kills
+# the browser's process tree when a page runs past its hard timeout, so a hung or
+# leaking Chrome never stalls the crawl. Process inspection reads /proc (Linux);
+# elsewhere memory-based recycling is skipped and only chromedriver itself is killed.
+
+import os
+import signal
+import threading
+import time
+from contextlib import contextmanager
+from backend.scraper.metrics import metrics
+from backend.scraper.resilience import TransientError
+
+DEFAULT_MAX_PAGES = 200       # Pages rendered before a browser is replaced
+DEFAULT_MAX_RSS_MB = 1500     # Memory of chromedriver and its Chrome processes before a browser is replaced
+DEFAULT_PAGE_TIMEOUT = 60.0   # Hard limit for one page, enforced by the watchdog
+RSS_CHECK_EVERY = 10          # Pages between memory checks
+
+def browser_pid(driver):
+    """Return the PID of the driver's chromedriver process, or None if it is not known."""
+    try:
+        pid = driver.service.process.pid
+    except AttributeError:
+        return None
+    return pid if isinstance(pid, int) else None
+
+def is_alive(driver):
+    """Return False once the driver's chromedriver process has exited."""
+    try:
+        returncode = driver.service.process.poll()
+    except AttributeError:
+        return True
+    return not isinstance(returncode, int)
+
+def process_tree(pid):
+    """
+    Return the PID and the PIDs of all its descendants, children last.
+
+    Returns:
+        list: The PIDs, or just [pid] if /proc is not available.
+    """
+    children = {}
+    try:
+        entries = os.listdir('/proc')
+    except OSError:
+        return [pid]
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat', 'rb') as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # The command name may contain spaces; the parent PID follows the closing parenthesis
+        parent = int(stat[stat.rindex(b')') + 2:].split()[1])
+        children.setdefault(parent, []).append(int(entry))
+    tree = [pid]
+    for current in tree:
+        tree.extend(children.get(current, []))
+    return tree
+
+def tree_rss_mb(pid):
+    """Return the resident memory of a process and its descendants in MB, or None if it cannot be read."""
+    page_size = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+    total = 0
+    for child in process_tree(pid):
+        try:
+            with open(f'/proc/{child}/statm') as f:
+                total += int(f.read().split()[1]) * page_size
+        except (OSError, ValueError, IndexError):
+            if child == pid:
+                return None
+    return total / (1024 * 1024)
+
+def kill_tree(pid):
+    """Kill a process and all its descendants with SIGKILL, children first."""
+    for child in reversed(process_tree(pid)):
+        try:
+            os.kill(child, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+def kill_browser(driver):
+    """Kill a driver's chromedriver and Chrome processes without talking to them."""
+    pid = browser_pid(driver)
+    if pid is not None:
+        kill_tree(pid)
+
+class Watchdog:
+    """
+    One background thread enforcing hard per-page deadlines.
+
+    A page runs inside guard(); if it is still running when its timeout passes, the
+    browser's processes are killed, which makes the blocked WebDriver call fail.
+
+    Args:
+        interval (float, optional): Seconds between deadline checks. Defaults to 1.
+    """
+
+    def __init__(self, interval=1.0):
+        self.interval = interval
+        self._pages = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @contextmanager
+    def guard(self, driver, timeout, label=''):
+        """
+        Run a block against a driver with a hard timeout.
+
+        Raises:
+            TransientError: If the watchdog killed the browser, whatever the block returned or raised.
+        """
+        token = object()
+        page = {'driver': driver, 'deadline': time.monotonic() + timeout, 'killed': False}
+        with self._lock:
+            self._pages[token] = page
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="page-watchdog", daemon=True)
+                self._thread.start()
+        try:
+            yield driver
+        except Exception as e:
+            if self._release(token)['killed']:
+                raise TransientError(f"Browser hung for over {timeout:.0f}s on {label} and was killed") from e
+            raise
+        else:
+            if self._release(token)['killed']:
+                raise TransientError(f"Browser hung for over {timeout:.0f}s on {label} and was killed")
+
+    def _release(self, token):
+        with self._lock:
+            return self._pages.pop(token)
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            now = time.monotonic()
+            with self._lock:
+                expired = [page for page in self._pages.values() if not page['killed'] and page['deadline'] <= now]
+                for page in expired:
+                    page['killed'] = True
+            for page in expired:
+                print("⏰ Page timed out, killing the browser")
+                metrics.count('browser_killed')
+                kill_browser(page['driver'])
+
+class ManagedDriver:
+    """
+    Hold one worker's WebDriver: started on first use, kept warm between pages,
+    and replaced after max_pages pages, when it uses more than max_rss_mb, or when it died.
+
+    Args:
+        factory (callable): Creates a new WebDriver.
+        driver (webdriver.Chrome, optional): An already started driver to use first.
+        max_pages (int, optional): Pages before the browser is recycled. 0 disables. Defaults to 200.
+        max_rss_mb (float, optional): Memory in MB before the browser is recycled. 0 disables. Defaults to 1500.
+    """
+
+    def __init__(self, factory, driver=None, max_pages=DEFAULT_MAX_PAGES, max_rss_mb=DEFAULT_MAX_RSS_MB):
+        self.factory = factory
+        self.driver = driver
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.pages = 0
+
+    def get(self):
+        """Return the WebDriver for the next page, recycling or starting it first if needed."""
+        if self.driver is not None:
+            reason = self._recycle_reason()
+            if reason:
+                self.recycle(reason)
+        if self.driver is None:
+            self.driver = self.factory()
+            self.pages = 0
+        self.pages += 1
+        return self.driver
+
+    def _recycle_reason(self):
+        if not is_alive(self.driver):
+            return "it exited"
+        if self.max_pages and self.pages >= self.max_pages:
+            return f"{self.pages} pages"
+        if self.max_rss_mb and self.pages and self.pages % RSS_CHECK_EVERY == 0:
+            pid = browser_pid(self.driver)
+            rss = tree_rss_mb(pid) if pid is not None else None
+            if rss is not None and rss > self.max_rss_mb:
+                return f"{rss:.0f} MB in use"
+        return None
+
+    def recycle(self, reason=''):
+        """Quit the current browser so the next get() starts a fresh one."""
+        print(f"♻️ Recycling browser ({reason})")
+        metrics.count('browser_recycled')
+        self.quit()
+
+    def quit(self):
+        """Quit the WebDriver if one was started, killing it if it does not respond."""
+        if self.driver is None:
+            return
+        driver, self.driver = self.driver, None
+        try:
+            if is_alive(driver):
+                driver.quit()
+        except Exception as e:
+            print(f"⚠️ Browser did not quit cleanly ({e}), killing it")
+            kill_browser(driver)
+
+class DriverPool:
+    """
+    Lend warm WebDrivers to code that needs a browser for a moment.
+
+    Args:
+        new_holder (callable): Creates a ManagedDriver when no idle one is left.
+    """
+
+    def __init__(self, new_holder):
+        self._new_holder = new_holder
+        self._idle = []
+        self._holders = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def lease(self):
+        """Borrow a driver for the duration of the block."""
+        with self._lock:
+            holder = self._idle.pop() if self._idle else None
+        if holder is None:
+            holder = self._new_holder()
+            with self._lock:
+                self._holders.append(holder)
+        try:
+            yield holder.get()
+        finally:
+            with self._lock:
+                self._idle.append(holder)
+
+    def close(self):
+        """Quit every driver of the pool."""
+        with self._lock:
+            holders, self._holders, self._idle = self._holders, [], []
+        for holder in holders:
+            holder.quit()
+
+# Shared by every worker; its thread only starts with the first guarded page
+page_watchdog = Watchdog()
@@ -0,0 +1,256 @@
+# Description: A persistent crawl frontier.
+# Every URL of a crawl is recorded in a local SQLite table with its state, number of
+# attempts and last error. Workers claim and complete entries in transactions, so a
+# crawl that crashes or is interrupted can be resumed where it stopped.
+
+import threading
+import time
+from backend.scraper.local_store import connect, state_path
+from backend.scraper.worker_pool import FAILED
+
+PENDING = 'pending'
+CLAIMED = 'claimed'
+DONE = 'done'
+FAILED_STATE = 'failed'
+
+MAX_ATTEMPTS = 3  # Failed URLs are retried (re-queued or on resume) until they have been tried this often
+
+class Frontier:
+    """
+    The URLs of the current crawl and how far each one got.
+
+    Args:
+        path (str or Path, optional): The SQLite file. Defaults to frontier.sqlite3 in the state directory.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or state_path("frontier.sqlite3")
+        self._lock = threading.Lock()
+        self._conn = connect(self.path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS frontier (url TEXT PRIMARY KEY, seq INTEGER, state TEXT, "
+            "attempts INTEGER DEFAULT 0, last_error TEXT, updated_at REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS frontier_state ON frontier (state, seq)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+    def _transaction(self, statements):
+        """Run (sql, params) statements in one write transaction. Must be called with the lock held."""
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            for sql, params in statements:
+                self._conn.execute(sql, params)
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def _get_meta(self, key):
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key, value):
+        return ("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    @property
+    def listed(self):
+        """True once every URL of the current crawl has been added."""
+        with self._lock:
+            return self._get_meta('listed') == '1'
+
+    def begin(self, resume=False):
+        """
+        Start a crawl, or resume the last one if it did not finish.
+
+        On resume, URLs that were claimed when the last run stopped, and failed URLs
+        with attempts left, are made pending again. Otherwise the frontier is cleared.
+
+        Args:
+            resume (bool, optional): Resume an unfinished crawl if there is one. Defaults to False.
+
+        Returns:
+            bool: True if an unfinished crawl is being resumed.
+        """
+        with self._lock:
+            unfinished = self._get_meta('status') == 'running'
+            if resume and unfinished:
+                self._transaction([
+                    ("UPDATE frontier SET state = ? WHERE state = ?", (PENDING, CLAIMED)),
+                    ("UPDATE frontier SET state = ? WHERE state = ? AND attempts < ?",
+                     (PENDING, FAILED_STATE, MAX_ATTEMPTS)),
+                ])
+                return True
+            self._transaction([
+                ("DELETE FROM frontier", ()),
+                self._set_meta('status', 'running'),
+                self._set_meta('listed', '0'),
+                self._set_meta('started_at', str(time.time())),
+            ])
+            return False
+
+    def add(self, urls):
+        """
+        Add URLs as pending. URLs already in the frontier keep their state.
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                seq = self._conn.execute("SELECT COALESCE(MAX(seq), 0) FROM frontier").fetchone()[0]
+                for url in urls:
+                    seq += 1
+                    self._conn.execute(
+                        "INSERT OR IGNORE INTO frontier (url, seq, state, updated_at) VALUES (?, ?, ?, ?)",
+                        (url, seq, PENDING, now),
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def mark_listed(self):
+        """Record that every URL of the crawl has been added, so a resume can skip the sitemap."""
+        with self._lock:
+            self._transaction([self._set_meta('listed', '1')])
+
+    def claim(self, url=None):
+        """
+        Claim the next pending URL (or the given one, if it is pending).
+
+        Returns:
+            str or None: The claimed URL, or None if nothing is pending.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                if url is None:
+                    row = self._conn.execute(
+                        "SELECT url FROM frontier WHERE state = ? ORDER BY seq LIMIT 1", (PENDING,)
+                    ).fetchone()
+                else:
+                    row = self._conn.execute(
+                        "SELECT url FROM frontier WHERE url = ? AND state = ?", (url, PENDING)
+                    ).fetchone()
+                if row:
+                    self._conn.execute(
+                        "UPDATE frontier SET state = ?, attempts = attempts + 1, updated_at = ? WHERE url = ?",
+                        (CLAIMED, time.time(), row[0]),
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return row[0] if row else None
+
+    def claims(self):
+        """
+        Yield pending URLs, claiming each one just before it is handed out.
+        """
+        while True:
+            url = self.claim()
+            if url is None:
+                return
+            yield url
+
+    def feed(self, urls):
+        """
+        Add URLs from a (lazy) source and yield the ones still to be crawled as they arrive.
+
+        URLs already completed in a resumed crawl are skipped. Once the source is
+        exhausted, any other pending URLs of a resumed crawl are yielded as well.
+        """
+        for url in urls:
+            self.add([url])
+            if self.claim(url) is not None:
+                yield url
+        self.mark_listed()
+        yield from self.claims()
+
+    def rounds(self, urls):
+        """
+        Yield the URL iterables of a crawl: first urls, then the claims of any URLs still
+        pending once the previous round has been processed.
+
+        A URL queued again with retry() after the dispatcher ran out of URLs is not handed
+        out by that round, so another round picks it up. Attempts are limited by retry(),
+        so the rounds end.
+        """
+        yield urls
+        while True:
+            pending = self.counts()[PENDING]
+            if not pending:
+                return
+            print(f"🔁 Retrying {pending} listings queued again")
+            yield self.claims()
+
+    @property
+    def unfinished(self):
+        """True while any URL of the crawl is pending or claimed."""
+        counts = self.counts()
+        return bool(counts[PENDING] or counts[CLAIMED])
+
+    def complete(self, url, status, error=None):
+        """
+        Record the outcome of a claimed URL.
+
+        Args:
+            url (str): The URL.
+            status (str): The worker_pool status; FAILED marks the entry failed, anything else done.
+            error (str, optional): A description of the failure.
+        """
+        state = FAILED_STATE if status == FAILED else DONE
+        with self._lock:
+            self._transaction([(
+                "UPDATE frontier SET state = ?, last_error = ?, updated_at = ? WHERE url = ?",
+                (state, error, time.time(), url),
+            )])
+
+    def retry(self, url, error=None):
+        """
+        Queue a claimed URL again after a transient failure, behind every pending URL.
+
+        Args:
+            url (str): The URL.
+            error (str, optional): A description of the failure.
+
+        Returns:
+            bool: True if the URL was queued again, False if it has used all its attempts
+                  and is now failed.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute("SELECT attempts FROM frontier WHERE url = ?", (url,)).fetchone()
+                requeued = row is not None and row[0] < MAX_ATTEMPTS
+                if requeued:
+                    seq = self._conn.execute("SELECT COALESCE(MAX(seq), 0) FROM frontier").fetchone()[0] + 1
+                    self._conn.execute(
+                        "UPDATE frontier SET state = ?, seq = ?, last_error = ?, updated_at = ? WHERE url = ?",
+                        (PENDING, seq, error, time.time(), url),
+                    )
+                else:
+                    self._conn.execute(
+                        "UPDATE frontier SET state = ?, last_error = ?, updated_at = ? WHERE url = ?",
+                        (FAILED_STATE, error, time.time(), url),
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return requeued
+
+    def counts(self):
+        """
+        Return the number of URLs in each state.
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT state, COUNT(*) FROM frontier GROUP BY state").fetchall()
+        return {state: 0 for state in (PENDING, CLAIMED, DONE, FAILED_STATE)} | dict(rows)
+
+    def finish(self):
+        """Mark the crawl as completed, so the next --resume starts a new crawl."""
+        with self._lock:
+            self._transaction([self._set_meta('status', 'complete')])
+
+    def close(self):
+        self._conn.close()
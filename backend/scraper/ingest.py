@@ -0,0 +1,137 @@
+# Description: A batched writer for the crawl's ingest path.
+# Validated jobs are buffered and flushed through a Firestore BulkWriter when the
+# buffer is full or has waited long enough. Documents are written with create(), so
+# an existing job is refused by the server instead of being read first, and the
+# result of every document is reported back to the crawl.
+
+import threading
+import time
+from backend.scraper.worker_pool import SUCCESS, FAILED, DUPLICATE
+from backend.scraper.metrics import metrics
+from backend.database.firebase_client import get_firestore_client
+
+ALREADY_EXISTS = 6      # gRPC status codes of a failed write
+RETRYABLE_CODES = {4, 8, 10, 13, 14}  # DEADLINE_EXCEEDED, RESOURCE_EXHAUSTED, ABORTED, INTERNAL, UNAVAILABLE
+MAX_WRITE_ATTEMPTS = 5
+
+class IngestWriter:
+    """
+    Buffers documents and writes them to a collection in batches.
+
+    Args:
+        collection_name (str, optional): The Firestore collection. Defaults to 'jobs'.
+        on_result (callable, optional): Called as on_result(key, status) once a document is
+                                        written (SUCCESS), refused because it exists (DUPLICATE)
+                                        or failed (FAILED). Runs on a writer thread.
+        batch_size (int, optional): Flush when this many documents are buffered. Defaults to 100.
+        flush_interval (float, optional): Flush documents that have waited this many seconds.
+                                          Defaults to 2.0.
+        client (firestore.Client, optional): The Firestore client. Defaults to get_firestore_client().
+    """
+
+    def __init__(self, collection_name='jobs', on_result=None, batch_size=100, flush_interval=2.0, client=None):
+        self.client = client or get_firestore_client()
+        self.collection = self.client.collection(collection_name)
+        self.on_result = on_result
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._buffer = []
+        self._oldest = None
+        self._in_flight = {}    # doc_id -> key of the document being written
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._flush_periodically, name="ingest-writer", daemon=True)
+        self._thread.start()
+
+    def add(self, data, key=None, doc_id=None):
+        """
+        Buffer a document for writing.
+
+        Args:
+            data (dict): The document.
+            key (optional): Passed back to on_result, e.g. the listing URL. Defaults to the document ID.
+            doc_id (str, optional): The document ID. Defaults to data['job_id'].
+        """
+        doc_id = doc_id or data['job_id']
+        key = doc_id if key is None else key
+        with self._lock:
+            if doc_id in self._in_flight:
+                duplicate = True
+            else:
+                duplicate = False
+                self._in_flight[doc_id] = key
+                self._buffer.append((doc_id, data))
+                if self._oldest is None:
+                    self._oldest = time.monotonic()
+            full = len(self._buffer) >= self.batch_size
+        if duplicate:
+            self._report(key, DUPLICATE)
+        elif full:
+            # Flushing in the caller's thread slows producers down when writes fall behind
+            self.flush()
+
+    def flush(self):
+        """Write every buffered document and wait for the results."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._buffer, self._oldest = self._buffer, [], None
+            if not batch:
+                return
+            # A BulkWriter does not send a partial batch after its first flush, so use one per flush
+            bulk = self.client.bulk_writer()
+            bulk.on_write_result(self._write_succeeded)
+            bulk.on_write_error(self._write_failed)
+            try:
+                with metrics.timer('firestore_batch_write'):
+                    for doc_id, data in batch:
+                        bulk.create(self.collection.document(doc_id), data)
+                    bulk.close()
+            except Exception as e:
+                print(f"❌ Batched write failed: {e}")
+                for doc_id, _ in batch:
+                    with self._lock:
+                        unfinished = doc_id in self._in_flight
+                    if unfinished:
+                        self._finish(doc_id, FAILED)
+
+    def close(self):
+        """Flush the remaining documents and stop the flush thread."""
+        self._stop.set()
+        self._thread.join(5)
+        self.flush()
+
+    def _flush_periodically(self):
+        while not self._stop.wait(min(self.flush_interval / 4, 1.0)):
+            with self._lock:
+                due = self._oldest is not None and time.monotonic() - self._oldest >= self.flush_interval
+            if due:
+                self.flush()
+
+    def _finish(self, doc_id, status):
+        with self._lock:
+            key = self._in_flight.pop(doc_id, doc_id)
+        self._report(key, status)
+
+    def _report(self, key, status):
+        if self.on_result is not None:
+            try:
+                self.on_result(key, status)
+            except Exception as e:
+                print(f"⚠️ Error recording write result for {key}: {e}")
+
+    def _write_succeeded(self, reference, result, bulk_writer):
+        self._finish(reference.id, SUCCESS)
+
+    def _write_failed(self, error, bulk_writer):
+        """Retry transient errors; report documents that exist as duplicates and anything else as failed."""
+        if error.code in RETRYABLE_CODES and error.attempts < MAX_WRITE_ATTEMPTS:
+            metrics.count('write_retry')
+            return True
+        doc_id = error.operation.reference.id
+        if error.code == ALREADY_EXISTS:
+            self._finish(doc_id, DUPLICATE)
+        else:
+            print(f"❌ Firestore error for {doc_id}: {error.message}")
+            self._finish(doc_id, FAILED)
+        return False
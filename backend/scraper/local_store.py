@@ -0,0 +1,46 @@
+# Description: Shared helpers for the scraper's local SQLite state files.
+# State lives in SCRAPER_STATE_DIR (default: .scraper_state/ in the project root)
+# so it survives between runs and container restarts when the directory is mounted.
+
+import os
+import sqlite3
+from pathlib import Path
+
+DEFAULT_STATE_DIR = Path(__file__).resolve().parent.parent.parent / ".scraper_state"
+
+def get_state_dir():
+    """
+    Return the directory for local scraper state, creating it if needed.
+
+    Returns:
+        Path: The state directory.
+    """
+    state_dir = Path(os.getenv("SCRAPER_STATE_DIR", DEFAULT_STATE_DIR))
+    state_dir.mkdir(parents=True, exist_ok=True)
+    return state_dir
+
+def state_path(filename):
+    """
+    Return the path of a file inside the state directory.
+    """
+    return get_state_dir() / filename
+
+def connect(path):
+    """
+    Open a SQLite database for scraper state.
+
+    The connection may be shared between worker threads (callers serialise access
+    with their own lock) and uses WAL so readers do not block the writer.
+
+    Args:
+        path (str or Path): The database file, or ':memory:'.
+
+    Returns:
+        sqlite3.Connection: The open connection in autocommit mode.
+    """
+    if str(path) != ':memory:':
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path), timeout=30, check_same_thread=False, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
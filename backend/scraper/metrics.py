@@ -0,0 +1,194 @@
+# Description: Per-stage timing metrics for the scraper.
+# Every stage of a crawl (sitemap fetch, page load, readiness wait, each field
+# extractor, validation, Firestore write, ...) records its latency in a histogram,
+# and notable events (timeouts, retries, fallbacks) are counted. The metrics are
+# written in the Prometheus text format, to a file or a /metrics endpoint, and
+# summarised at the end of a run.
+
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Latency bucket bounds in seconds
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+class Histogram:
+    """
+    Latency histogram with fixed buckets. Not thread-safe on its own; Metrics holds the lock.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)   # The last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                break
+        else:
+            index = len(self.buckets)
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q):
+        """Estimate a quantile as the upper bound of the bucket it falls in."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return self.buckets[index] if index < len(self.buckets) else float('inf')
+        return float('inf')
+
+class Metrics:
+    """
+    Thread-safe registry of stage latencies and event counters.
+
+    Args:
+        prefix (str, optional): Prefix of the exported metric names. Defaults to 'scraper'.
+        buckets (tuple, optional): Histogram bucket bounds in seconds.
+    """
+
+    def __init__(self, prefix='scraper', buckets=DEFAULT_BUCKETS):
+        self.prefix = prefix
+        self.buckets = buckets
+        self._stages = {}
+        self._events = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage, seconds):
+        """Record how long one run of a stage took."""
+        with self._lock:
+            histogram = self._stages.get(stage)
+            if histogram is None:
+                histogram = self._stages[stage] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    @contextmanager
+    def timer(self, stage):
+        """Context manager that records the time spent in its block, also when it raises."""
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start_time)
+
+    def timed(self, stage):
+        """Decorator that records every call of a function as a stage."""
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.timer(stage):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def count(self, event, amount=1):
+        """Count an event such as a timeout, a retry or a fallback."""
+        with self._lock:
+            self._events[event] = self._events.get(event, 0) + amount
+
+    def event_count(self, event):
+        with self._lock:
+            return self._events.get(event, 0)
+
+    def stage_count(self, stage):
+        with self._lock:
+            histogram = self._stages.get(stage)
+            return histogram.count if histogram else 0
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+            self._events.clear()
+
+    def render(self):
+        """
+        Return the metrics in the Prometheus text exposition format.
+        """
+        stage_metric = f"{self.prefix}_stage_seconds"
+        event_metric = f"{self.prefix}_events_total"
+        lines = [
+            f"# HELP {stage_metric} Time spent in each scraper stage.",
+            f"# TYPE {stage_metric} histogram",
+        ]
+        with self._lock:
+            for stage, histogram in sorted(self._stages.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + ('+Inf',), histogram.counts):
+                    cumulative += count
+                    lines.append(f'{stage_metric}_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+                lines.append(f'{stage_metric}_sum{{stage="{stage}"}} {histogram.sum:.6f}')
+                lines.append(f'{stage_metric}_count{{stage="{stage}"}} {histogram.count}')
+            lines.append(f"# HELP {event_metric} Timeouts, retries and fallbacks taken by the scraper.")
+            lines.append(f"# TYPE {event_metric} counter")
+            for event, count in sorted(self._events.items()):
+                lines.append(f'{event_metric}{{event="{event}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """
+        Write the metrics to a file for the Prometheus node exporter's textfile collector.
+
+        The file is replaced atomically, so the collector never reads a partial file.
+        """
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+
+    def serve(self, port, host='0.0.0.0'):
+        """
+        Serve the metrics at http://host:port/metrics from a background thread.
+
+        Returns:
+            ThreadingHTTPServer: The server; call shutdown() to stop it.
+        """
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+        return server
+
+    def summary(self):
+        """
+        Return a table of where the time went, slowest stage first, followed by the event counts.
+        """
+        with self._lock:
+            stages = sorted(self._stages.items(), key=lambda item: item[1].sum, reverse=True)
+            events = sorted(self._events.items())
+            rows = [
+                f"{stage:<24} {histogram.count:>7} {histogram.sum:>10.2f} {histogram.sum / histogram.count:>9.3f} "
+                f"{histogram.quantile(0.5):>8g} {histogram.quantile(0.95):>8g}"
+                for stage, histogram in stages
+            ]
+        lines = [f"{'stage':<24} {'count':>7} {'total s':>10} {'mean s':>9} {'p50 ≤':>8} {'p95 ≤':>8}"] + rows
+        if events:
+            lines.append("events: " + ", ".join(f"{event}={count}" for event, count in events))
+        return "\n".join(lines)
+
+# The registry the scraper records into
+metrics = Metrics()
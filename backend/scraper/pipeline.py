@@ -0,0 +1,138 @@
+# Description: A small asyncio pipeline of stages connected by bounded queues.
+# Each stage runs its own number of concurrent workers, so network fetches, parsing
+# and database writes for different URLs overlap instead of running one after another.
+
+import asyncio
+from backend.scraper.worker_pool import CrawlStats, FAILED, SUCCESS, QUEUED, RETRY
+
+class Stage:
+    """
+    One step of the pipeline.
+
+    The handler is a coroutine function called with one item. It returns either the
+    item to pass to the next stage, or a worker_pool status string (e.g. SKIPPED or
+    FAILED) to finish the item early. Whatever the last stage returns is recorded as
+    the item's final status.
+    """
+
+    def __init__(self, name, handler, concurrency=1):
+        if concurrency < 1:
+            raise ValueError(f"Concurrency for stage '{name}' must be at least 1")
+        self.name = name
+        self.handler = handler
+        self.concurrency = concurrency
+
+def parse_concurrency(values, stage_names):
+    """
+    Parse per-stage concurrency settings given as STAGE=N strings.
+
+    Args:
+        values (list): Settings such as ["fetch=8", "save=2"]. May be None.
+        stage_names (iterable): The valid stage names.
+
+    Returns:
+        dict: Mapping of stage name to concurrency.
+
+    Raises:
+        ValueError: If a setting is malformed or names an unknown stage.
+    """
+    concurrency = {}
+    for value in values or []:
+        name, sep, count = value.partition('=')
+        if not sep or name not in stage_names:
+            raise ValueError(f"Invalid stage concurrency '{value}', expected one of {', '.join(stage_names)} as STAGE=N")
+        try:
+            concurrency[name] = int(count)
+        except ValueError:
+            raise ValueError(f"Invalid stage concurrency '{value}', N must be an integer")
+        if concurrency[name] < 1:
+            raise ValueError(f"Invalid stage concurrency '{value}', N must be at least 1")
+    return concurrency
+
+async def _feed(items, out_queue, consumers):
+    """Push items into the first queue, iterating the source in a thread so a slow generator never blocks the loop."""
+    iterator = iter(items)
+    done = object()
+    index = 0
+    while True:
+        item = await asyncio.to_thread(next, iterator, done)
+        if item is done:
+            break
+        index += 1
+        await out_queue.put((index, item, item))
+    for _ in range(consumers):
+        await out_queue.put(None)
+
+async def _run_stage(stage, in_queue, out_queue, next_consumers, stats, progress_every, on_result):
+    """Run all workers of one stage, then tell the next stage that no more items are coming."""
+
+    def finish(source, status):
+        if on_result is not None:
+            # on_result may settle the status, e.g. a RETRY with no attempts left becomes FAILED
+            status = on_result(source, status) or status
+        processed = stats.record(status)
+        if progress_every and status not in (QUEUED, RETRY) and processed % progress_every == 0:
+            print(f"\n--- Progress: {processed} URLs | {stats.summary()} ---\n")
+
+    async def worker():
+        while True:
+            entry = await in_queue.get()
+            if entry is None:
+                break
+            index, source, item = entry
+            try:
+                result = await stage.handler(item)
+            except Exception as e:
+                print(f"[{index}] ❌ Error in {stage.name} stage: {e}")
+                result = FAILED
+
+            if isinstance(result, str):
+                finish(source, result)
+            elif out_queue is None:
+                finish(source, SUCCESS)
+            else:
+                await out_queue.put((index, source, result))
+
+    await asyncio.gather(*(worker() for _ in range(stage.concurrency)))
+    if out_queue is not None:
+        for _ in range(next_consumers):
+            await out_queue.put(None)
+
+async def run_pipeline(items, stages, stats=None, progress_every=50, on_result=None):
+    """
+    Run items through the stages, each connected to the next by a bounded queue.
+
+    Args:
+        items (iterable): The source items (URLs). May be a lazy generator.
+        stages (list): The Stage objects, in order.
+        stats (CrawlStats, optional): Counters to update. A new one is created if None.
+        progress_every (int, optional): Print a progress line every N finished items. Defaults to 50.
+        on_result (callable, optional): Called as on_result(source_item, status) when an item finishes.
+                                        A returned status replaces the one that is counted.
+
+    Returns:
+        CrawlStats: The aggregated counters.
+    """
+    stats = stats or CrawlStats()
+    # A queue in front of every stage, sized so each stage can keep a little work buffered
+    queues = [asyncio.Queue(maxsize=stage.concurrency * 2) for stage in stages]
+
+    tasks = [asyncio.create_task(_feed(items, queues[0], stages[0].concurrency))]
+    for position, stage in enumerate(stages):
+        is_last = position == len(stages) - 1
+        tasks.append(asyncio.create_task(_run_stage(
+            stage,
+            queues[position],
+            None if is_last else queues[position + 1],
+            0 if is_last else stages[position + 1].concurrency,
+            stats,
+            progress_every,
+            on_result,
+        )))
+
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+    return stats
@@ -0,0 +1,277 @@
+# Description: Per-host politeness scheduler for the scraper.
+# Requests to each host are paced by a token bucket whose rate comes from the
+# robots.txt Crawl-delay, backed off on 429/5xx responses, and limited to an
+# AIMD-adjusted number of concurrent requests based on observed latency.
+
+import random
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+import requests
+from backend.scraper.metrics import metrics
+
+BACKOFF_STATUSES = {429, 500, 502, 503, 504}
+
+class HostState:
+    """
+    Pacing state for a single host.
+    """
+
+    def __init__(self, interval, initial_concurrency, max_concurrency, robots=None):
+        self.interval = interval                    # Seconds between request starts (token refill period)
+        self.tokens = 1.0
+        self.last_refill = time.monotonic()
+        self.concurrency = float(initial_concurrency)
+        self.max_concurrency = max_concurrency
+        self.in_flight = 0
+        self.backoff_until = 0.0
+        self.consecutive_errors = 0
+        self.robots = robots
+
+    def refill(self, now):
+        if self.interval <= 0:
+            self.tokens = 1.0
+        else:
+            self.tokens = min(1.0, self.tokens + (now - self.last_refill) / self.interval)
+        self.last_refill = now
+
+def parse_retry_after(value):
+    """
+    Parse a Retry-After header given in seconds or as an HTTP date.
+
+    Returns:
+        float or None: The number of seconds to wait, or None if the header is missing or invalid.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+class PolitenessScheduler:
+    """
+    Thread-safe per-host request scheduler.
+
+    Callers wrap every page request in `with scheduler.request(url):`. Skipped URLs
+    never enter the scheduler and cost no delay.
+
+    Args:
+        default_delay (float, optional): Seconds between requests to a host when robots.txt sets
+                                         no Crawl-delay. Defaults to 1.0.
+        user_agent (str, optional): Name the crawler goes by in robots.txt rules. Defaults to '*'.
+        max_concurrency (int, optional): Upper bound for concurrent requests per host. Defaults to 4.
+        target_latency (float, optional): Latency in seconds above which concurrency is halved. Defaults to 10.0.
+        max_backoff (float, optional): Longest pause after repeated errors, in seconds. Defaults to 300.
+        session (requests.Session, optional): Session used to fetch robots.txt.
+        respect_robots (bool, optional): Read robots.txt for Crawl-delay and disallowed paths. Defaults to True.
+    """
+
+    def __init__(self, default_delay=1.0, user_agent='*', max_concurrency=4, target_latency=10.0,
+                 max_backoff=300.0, session=None, respect_robots=True):
+        self.default_delay = default_delay
+        self.user_agent = user_agent
+        self.max_concurrency = max_concurrency
+        self.target_latency = target_latency
+        self.max_backoff = max_backoff
+        self.session = session
+        self.respect_robots = respect_robots
+        self._hosts = {}
+        self._host_settings = {}
+        self._condition = threading.Condition()
+        self._robots_lock = threading.Lock()
+
+    def attach(self, session):
+        """
+        Observe every response of a requests.Session so 429/5xx answers trigger a backoff.
+        """
+        session.hooks.setdefault('response', []).append(self.observe_response)
+        return session
+
+    def configure_host(self, host, delay=None, max_concurrency=None):
+        """
+        Give a host its own pacing instead of the scheduler's defaults, e.g. a job source's budget.
+
+        robots.txt still takes precedence: a Crawl-delay replaces the delay and limits the
+        host to one request at a time.
+
+        Args:
+            host (str): The hostname, e.g. 'weworkremotely.com'.
+            delay (float, optional): Seconds between requests. Defaults to default_delay.
+            max_concurrency (int, optional): Upper bound for concurrent requests. Defaults to max_concurrency.
+        """
+        with self._condition:
+            self._host_settings[host] = (delay, max_concurrency)
+
+    def load_robots(self, scheme, host):
+        """
+        Fetch and parse robots.txt for a host.
+
+        Returns:
+            RobotFileParser or None: The parsed rules, or None if robots.txt is unavailable.
+        """
+        robots_url = f"{scheme}://{host}/robots.txt"
+        try:
+            getter = self.session.get if self.session is not None else requests.get
+            response = getter(robots_url, timeout=10)
+            if response.status_code != 200:
+                return None
+            robots = RobotFileParser(robots_url)
+            robots.parse(response.text.splitlines())
+            return robots
+        except requests.exceptions.RequestException as e:
+            print(f"⚠️ Could not read {robots_url}: {e}")
+            return None
+
+    def _host(self, url):
+        """Return the HostState for a URL, reading robots.txt the first time a host is seen."""
+        parsed = urlparse(url)
+        host = parsed.netloc
+        with self._condition:
+            state = self._hosts.get(host)
+        if state is not None:
+            return host, state
+
+        # Serialise robots.txt fetches so each host is only read once
+        with self._robots_lock:
+            with self._condition:
+                state = self._hosts.get(host)
+            if state is not None:
+                return host, state
+
+            robots = self.load_robots(parsed.scheme or 'https', host) if self.respect_robots else None
+            delay, max_concurrency = self._host_settings.get(host, (None, None))
+            interval = self.default_delay if delay is None else delay
+            if robots is not None:
+                crawl_delay = robots.crawl_delay(self.user_agent)
+                request_rate = robots.request_rate(self.user_agent)
+                if crawl_delay is not None:
+                    interval = float(crawl_delay)
+                elif request_rate is not None and request_rate.requests:
+                    interval = request_rate.seconds / request_rate.requests
+                print(f"🤖 {host}: {interval:.1f}s between requests")
+
+            # Stay at one request at a time when robots.txt asks for a delay
+            if robots is not None and robots.crawl_delay(self.user_agent):
+                max_concurrency = 1
+            elif max_concurrency is None:
+                max_concurrency = self.max_concurrency
+            state = HostState(interval, 1, max_concurrency, robots)
+            with self._condition:
+                self._hosts[host] = state
+            return host, state
+
+    def allowed(self, url):
+        """
+        Check whether robots.txt allows fetching the URL.
+        """
+        _, state = self._host(url)
+        if state.robots is None:
+            return True
+        return state.robots.can_fetch(self.user_agent, url)
+
+    def wait(self, url):
+        """
+        Block until a request to the URL's host may start, then reserve a slot for it.
+
+        Every call must be matched by a call to done().
+        """
+        _, state = self._host(url)
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                state.refill(now)
+                if now < state.backoff_until:
+                    timeout = state.backoff_until - now
+                elif state.in_flight >= max(1, int(state.concurrency)):
+                    timeout = None
+                elif state.tokens < 1.0:
+                    timeout = (1.0 - state.tokens) * state.interval
+                else:
+                    state.tokens -= 1.0
+                    state.in_flight += 1
+                    return
+                self._condition.wait(timeout)
+
+    def done(self, url, latency, status_code=None, retry_after=None):
+        """
+        Release the slot reserved by wait() and adjust the host's concurrency.
+
+        Args:
+            url (str): The requested URL.
+            latency (float): How long the request took, in seconds.
+            status_code (int, optional): HTTP status, if known.
+            retry_after (float, optional): Seconds the server asked us to wait.
+        """
+        host, state = self._host(url)
+        with self._condition:
+            state.in_flight = max(0, state.in_flight - 1)
+            if status_code is not None:
+                self._record_status(state, status_code, retry_after)
+            if state.consecutive_errors == 0:
+                if latency > self.target_latency:
+                    # Multiplicative decrease: the host is slowing down
+                    state.concurrency = max(1.0, state.concurrency / 2)
+                else:
+                    # Additive increase: roughly one more slot per window of successful requests
+                    state.concurrency = min(state.max_concurrency, state.concurrency + 1.0 / state.concurrency)
+            self._condition.notify_all()
+
+    def observe_response(self, response, *args, **kwargs):
+        """
+        requests response hook: back off the host on 429/5xx responses.
+        """
+        with self._condition:
+            # Only hosts we schedule are tracked; this also ignores the robots.txt fetch itself
+            state = self._hosts.get(urlparse(response.url).netloc)
+            if state is None:
+                return response
+            self._record_status(state, response.status_code, parse_retry_after(response.headers.get('Retry-After')))
+            self._condition.notify_all()
+        return response
+
+    def _record_status(self, state, status_code, retry_after):
+        """Update backoff state for an HTTP status. Must be called with the condition held."""
+        if status_code in BACKOFF_STATUSES:
+            state.consecutive_errors += 1
+            backoff = retry_after
+            if backoff is None:
+                backoff = min(self.max_backoff, max(state.interval, 1.0) * 2 ** state.consecutive_errors)
+                backoff *= random.uniform(0.5, 1.5)
+            state.backoff_until = max(state.backoff_until, time.monotonic() + min(backoff, self.max_backoff))
+            state.concurrency = max(1.0, state.concurrency / 2)
+            metrics.count('http_backoff')
+            print(f"🐢 HTTP {status_code}, backing off for {backoff:.1f}s")
+        elif status_code < 400:
+            state.consecutive_errors = 0
+
+    @contextmanager
+    def request(self, url):
+        """
+        Context manager wrapping one request: waits for a slot and releases it afterwards.
+
+        Responses the session hook never sees, like pages loaded by a browser, report a
+        429/5xx through the status_code of the error raised for them (see TransientError).
+        """
+        with metrics.timer('politeness_wait'):
+            self.wait(url)
+        start_time = time.monotonic()
+        status_code = None
+        try:
+            yield
+        except Exception as e:
+            status_code = getattr(e, 'status_code', None)
+            raise
+        finally:
+            self.done(url, time.monotonic() - start_time, status_code)
@@ -0,0 +1,240 @@
+# Description: Retries, backoff and circuit breakers for the scraper's dependencies.
+# Errors are classified as transient (timeouts, dropped connections, 429/5xx, an
+# unavailable database) or permanent. Transient failures are retried with jittered
+# exponential backoff, and a circuit breaker per dependency pauses every worker
+# while the site or Firestore keeps failing, instead of failing the rest of the URLs.
+
+import random
+import threading
+import time
+import requests
+from google.api_core import exceptions as google_exceptions
+from selenium.common.exceptions import (
+    WebDriverException, NoSuchElementException, InvalidArgumentException, InvalidSelectorException,
+    JavascriptException,
+)
+from backend.scraper.metrics import metrics
+
+# HTTP statuses worth retrying
+RETRYABLE_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+# Firestore errors that go away when retried
+RETRYABLE_GOOGLE_ERRORS = (
+    google_exceptions.ServiceUnavailable, google_exceptions.DeadlineExceeded,
+    google_exceptions.InternalServerError, google_exceptions.TooManyRequests,
+    google_exceptions.ResourceExhausted, google_exceptions.Aborted,
+    google_exceptions.GatewayTimeout, google_exceptions.RetryError,
+)
+
+# WebDriver errors about the page itself rather than the browser or the network
+PERMANENT_WEBDRIVER_ERRORS = (NoSuchElementException, InvalidArgumentException, InvalidSelectorException, JavascriptException)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+class TransientError(Exception):
+    """
+    A failure that is expected to go away, such as a timeout or a 503.
+
+    Args:
+        message (str): What failed.
+        status_code (int, optional): HTTP status of a response the politeness scheduler
+                                     has not seen otherwise, e.g. a page the browser loaded.
+    """
+
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+def is_retryable(error):
+    """
+    Classify an exception as transient (worth retrying) or permanent.
+
+    Args:
+        error (Exception): The exception.
+
+    Returns:
+        bool: True for timeouts, connection errors, 429/5xx responses, unavailable
+              Firestore and browser/network WebDriver errors.
+    """
+    if isinstance(error, (TransientError, ConnectionError, TimeoutError)):
+        return True
+    if isinstance(error, WebDriverException):
+        return not isinstance(error, PERMANENT_WEBDRIVER_ERRORS)
+    if isinstance(error, requests.exceptions.HTTPError):
+        return error.response is not None and error.response.status_code in RETRYABLE_STATUSES
+    if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return True
+    return isinstance(error, RETRYABLE_GOOGLE_ERRORS)
+
+def backoff_delay(attempt, base_delay=1.0, max_delay=60.0):
+    """
+    Full-jitter exponential backoff: a random delay of up to base_delay * 2^(attempt - 1), capped at max_delay.
+
+    The jitter keeps workers that failed together from retrying together.
+    """
+    return random.uniform(0, min(max_delay, base_delay * 2 ** (attempt - 1)))
+
+class CircuitBreaker:
+    """
+    Stops calls to a dependency that keeps failing, for every thread at once.
+
+    After failure_threshold consecutive transient failures the circuit opens and
+    acquire() blocks all callers. Once reset_timeout has passed one caller is let
+    through as a probe: success closes the circuit, failure opens it again for
+    twice as long (up to max_reset_timeout).
+
+    Args:
+        name (str): The dependency, used in messages and metrics (e.g. 'site', 'firestore').
+        failure_threshold (int, optional): Consecutive failures that open the circuit. Defaults to 5.
+        reset_timeout (float, optional): Seconds the circuit stays open at first. Defaults to 30.
+        max_reset_timeout (float, optional): Upper bound of the growing open time. Defaults to 600.
+    """
+
+    def __init__(self, name, failure_threshold=5, reset_timeout=30.0, max_reset_timeout=600.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self._open_for = reset_timeout
+        self._opened_at = 0.0
+        self._probing = False
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        """Block while the circuit is open or a probe is in flight, then allow one call."""
+        with self._condition:
+            while True:
+                if self.state == CLOSED:
+                    return
+                if self.state == OPEN:
+                    remaining = self._opened_at + self._open_for - time.monotonic()
+                    if remaining <= 0:
+                        self.state = HALF_OPEN
+                        continue
+                    self._condition.wait(remaining)
+                elif not self._probing:
+                    self._probing = True
+                    return
+                else:
+                    self._condition.wait()
+
+    def record_success(self):
+        with self._condition:
+            if self.state != CLOSED:
+                print(f"🔌 {self.name} recovered, resuming")
+            self.state = CLOSED
+            self.failures = 0
+            self._open_for = self.reset_timeout
+            self._probing = False
+            self._condition.notify_all()
+
+    def record_failure(self):
+        with self._condition:
+            self.failures += 1
+            if self.state == HALF_OPEN:
+                self._open_for = min(self.max_reset_timeout, self._open_for * 2)
+                self._open()
+            elif self.state == CLOSED and self.failures >= self.failure_threshold:
+                self._open()
+
+    def release(self):
+        """End a call that was interrupted before it succeeded or failed, so another caller can probe."""
+        with self._condition:
+            self._probing = False
+            self._condition.notify_all()
+
+    def _open(self):
+        """Open the circuit. Must be called with the condition held."""
+        self.state = OPEN
+        self._opened_at = time.monotonic()
+        self._probing = False
+        metrics.count(f'{self.name}_circuit_open')
+        print(f"🔌 {self.name} is failing ({self.failures} errors in a row), pausing for {self._open_for:.0f}s")
+        self._condition.notify_all()
+
+class RetryPolicy:
+    """
+    Call a function, retrying transient failures with backoff behind a circuit breaker.
+
+    Args:
+        name (str): The dependency, used in metrics (e.g. 'site' counts 'site_retry').
+        attempts (int, optional): Calls before giving up. Defaults to 3.
+        base_delay (float, optional): Backoff before the first retry, in seconds (upper bound). Defaults to 1.
+        max_delay (float, optional): Largest backoff in seconds. Defaults to 30.
+        breaker (CircuitBreaker, optional): Shared breaker of the dependency.
+        retryable (callable, optional): Classifies exceptions. Defaults to is_retryable.
+    """
+
+    def __init__(self, name, attempts=3, base_delay=1.0, max_delay=30.0, breaker=None, retryable=is_retryable):
+        self.name = name
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.breaker = breaker
+        self.retryable = retryable
+        self._scopes = {}
+        self._scopes_lock = threading.Lock()
+
+    def scoped(self, key):
+        """
+        Return the policy for one part of the dependency, e.g. one job board of the site.
+
+        It has the same settings and its own circuit breaker, so a part that keeps
+        failing only pauses its own calls. The policy is created on first use.
+
+        Args:
+            key (str): The part, e.g. a job source key.
+
+        Returns:
+            RetryPolicy: The policy for key.
+        """
+        with self._scopes_lock:
+            policy = self._scopes.get(key)
+            if policy is None:
+                breaker = self.breaker
+                if breaker is not None:
+                    breaker = CircuitBreaker(f"{breaker.name}:{key}", breaker.failure_threshold,
+                                             breaker.reset_timeout, breaker.max_reset_timeout)
+                policy = self._scopes[key] = RetryPolicy(self.name, self.attempts, self.base_delay,
+                                                         self.max_delay, breaker, self.retryable)
+            return policy
+
+    def call(self, fn, *args, **kwargs):
+        """
+        Call fn(*args, **kwargs) and return its result.
+
+        Permanent errors are raised at once. Transient errors are retried, and the
+        last one is raised when every attempt failed.
+        """
+        for attempt in range(1, self.attempts + 1):
+            if self.breaker is not None:
+                self.breaker.acquire()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                if not self.retryable(e):
+                    # The dependency answered; the problem is the request itself
+                    if self.breaker is not None:
+                        self.breaker.record_success()
+                    raise
+                if self.breaker is not None:
+                    self.breaker.record_failure()
+                if attempt == self.attempts:
+                    raise
+                metrics.count(f'{self.name}_retry')
+                delay = backoff_delay(attempt, self.base_delay, self.max_delay)
+                print(f"🔁 {self.name} error ({e}), retry {attempt}/{self.attempts - 1} in {delay:.1f}s")
+                time.sleep(delay)
+            except BaseException:
+                # KeyboardInterrupt or SystemExit: no verdict, but a probe must not stay taken
+                if self.breaker is not None:
+                    self.breaker.release()
+                raise
+            else:
+                if self.breaker is not None:
+                    self.breaker.record_success()
+                return result
@@ -0,0 +1,167 @@
+# Description: Content hashes of stored jobs, for revisiting them and detecting edits.
+# Each stored job's field hashes are cached in a local SQLite file along with the time
+# it was last checked. A revisit fetches the listing again and compares hashes, so an
+# unchanged job costs no Firestore write and an edited one only writes the changed fields.
+
+import json
+import threading
+import time
+from backend.scraper.local_store import connect, state_path
+from backend.scraper.schema import HASHED_FIELDS, add_content_hashes
+from backend.database.firebase_client import list_document_fields
+
+DEFAULT_REVISIT_AGE = 24 * 60 * 60      # Revisit a job once a day
+DEFAULT_REFRESH_AGE = 24 * 60 * 60      # Reload the stored hashes from Firestore once a day
+
+class JobHashes:
+    """
+    The field hashes of stored jobs and when each job was last checked.
+
+    Args:
+        path (str or Path, optional): The SQLite file. Defaults to job_hashes.sqlite3 in the state directory.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or state_path("job_hashes.sqlite3")
+        self._lock = threading.Lock()
+        self._conn = connect(self.path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs (job_id TEXT PRIMARY KEY, content_hash TEXT, "
+            "field_hashes TEXT, checked_at REAL)"
+        )
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    def is_stale(self, max_age=DEFAULT_REFRESH_AGE):
+        """
+        Check whether the hashes should be reloaded from Firestore.
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'refreshed_at'").fetchone()
+        return row is None or time.time() - float(row[0]) > max_age
+
+    def replace(self, documents):
+        """
+        Replace the stored hashes with the ones in Firestore, keeping the check times.
+
+        Args:
+            documents (dict): {job_id: {'content_hash': ..., 'field_hashes': {...}}}. Jobs saved
+                              before hashes were introduced have neither field.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.execute("CREATE TEMP TABLE fresh (job_id TEXT PRIMARY KEY, content_hash TEXT, field_hashes TEXT)")
+                self._conn.executemany(
+                    "INSERT INTO fresh VALUES (?, ?, ?)",
+                    ((job_id, doc.get('content_hash'), json.dumps(doc['field_hashes']) if doc.get('field_hashes') else None)
+                     for job_id, doc in documents.items()),
+                )
+                self._conn.execute("DELETE FROM jobs WHERE job_id NOT IN (SELECT job_id FROM fresh)")
+                self._conn.execute(
+                    "INSERT INTO jobs (job_id, content_hash, field_hashes) SELECT job_id, content_hash, field_hashes FROM fresh "
+                    "WHERE true ON CONFLICT (job_id) DO UPDATE SET content_hash = excluded.content_hash, "
+                    "field_hashes = excluded.field_hashes"
+                )
+                self._conn.execute("DROP TABLE fresh")
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('refreshed_at', ?)", (str(time.time()),)
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def due(self, max_age=DEFAULT_REVISIT_AGE, limit=None):
+        """
+        Return the IDs of jobs that have not been checked for max_age seconds, oldest first.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT job_id FROM jobs WHERE checked_at IS NULL OR checked_at < ? "
+                "ORDER BY COALESCE(checked_at, 0) LIMIT ?",
+                (time.time() - max_age, -1 if limit is None else limit),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def get(self, job_id):
+        """
+        Return the stored field hashes of a job.
+
+        Returns:
+            tuple: (content_hash, field_hashes), both None for jobs saved without hashes.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content_hash, field_hashes FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        if row is None or row[1] is None:
+            return None, None
+        return row[0], json.loads(row[1])
+
+    def record(self, job_id, job_data=None):
+        """
+        Mark a job as checked now, storing its new hashes if it changed.
+        """
+        now = time.time()
+        with self._lock:
+            if job_data is None:
+                self._conn.execute("UPDATE jobs SET checked_at = ? WHERE job_id = ?", (now, job_id))
+            else:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO jobs (job_id, content_hash, field_hashes, checked_at) VALUES (?, ?, ?, ?)",
+                    (job_id, job_data['content_hash'], json.dumps(job_data['field_hashes']), now),
+                )
+
+    def close(self):
+        self._conn.close()
+
+def changed_fields(job_data, stored_hashes):
+    """
+    Compute the field-level update for a revisited job.
+
+    Args:
+        job_data (dict): The freshly extracted and validated job data.
+        stored_hashes (dict or None): The field hashes stored with the job.
+
+    Returns:
+        dict: The fields to write, including the new hashes, or an empty dict if the
+              content is unchanged. Jobs stored without hashes get every content field.
+    """
+    add_content_hashes(job_data)
+    if stored_hashes is None:
+        fields = HASHED_FIELDS
+    else:
+        fields = [field for field in HASHED_FIELDS if job_data['field_hashes'][field] != stored_hashes.get(field)]
+        if not fields:
+            return {}
+    update = {field: job_data.get(field) for field in fields}
+    update['field_hashes'] = job_data['field_hashes']
+    update['content_hash'] = job_data['content_hash']
+    return update
+
+def load_job_hashes(collection_name='jobs', path=None, max_age=DEFAULT_REFRESH_AGE, refresh=False):
+    """
+    Load the stored jobs' hashes, refreshing the local cache from Firestore when it is stale.
+
+    Args:
+        collection_name (str, optional): The Firestore collection. Defaults to 'jobs'.
+        path (str or Path, optional): The SQLite file for the cache.
+        max_age (float, optional): Seconds before the cache is refreshed. Defaults to one day.
+        refresh (bool, optional): Always refresh from Firestore. Defaults to False.
+
+    Returns:
+        JobHashes: The loaded hashes.
+    """
+    hashes = JobHashes(path)
+    if refresh or hashes.is_stale(max_age):
+        print(f"🔑 Loading content hashes from '{collection_name}'...")
+        documents = list_document_fields(collection_name, ['content_hash', 'field_hashes'])
+        if documents is not None:
+            hashes.replace(documents)
+        else:
+            print(f"⚠️ Using {len(hashes)} cached content hashes")
+    return hashes
@@ -1,6 +1,9 @@
 # Description: This file contains the schema for the job data that is scraped from the job boards.
-# Also it contains a function to validate the job data.
+# Also it contains a function to validate the job data, and the content hashes used
+# to detect edited postings.
 
+import hashlib
+import json
 
 ALLOWED_CATEGORIES = {
     "Full-Stack Programming",
@@ -33,4 +36,32 @@ def validate_job_data(job_data):
     job_data.setdefault('skills', [])
     job_data.setdefault('timezones', [])
     
-    return job_data
\ No newline at end of file
+    return job_data
+
+# Fields compared when a stored job is revisited (job_id identifies the job, timestamp is bookkeeping)
+HASHED_FIELDS = [field for field in REQUIRED_FIELDS if field != 'job_id'] + ['salary_range', 'countries', 'skills', 'timezones']
+
+def normalize_field(value):
+    # Collapse whitespace so re-rendered markup does not count as a change; list order is not content
+    if isinstance(value, str):
+        return " ".join(value.split())
+    if isinstance(value, (list, tuple)):
+        return sorted(normalize_field(item) for item in value)
+    return value
+
+def field_hashes(job_data):
+    """Return a short hash of every normalized content field of a job."""
+    return {
+        field: hashlib.sha1(json.dumps(normalize_field(job_data.get(field)), sort_keys=True).encode('utf-8')).hexdigest()[:16]
+        for field in HASHED_FIELDS
+    }
+
+def content_hash(hashes):
+    """Return one hash over the field hashes of a job."""
+    return hashlib.sha1(json.dumps(hashes, sort_keys=True).encode('utf-8')).hexdigest()
+
+def add_content_hashes(job_data):
+    """Store the field hashes and the content hash in the job data, so revisits can detect edits."""
+    job_data['field_hashes'] = field_hashes(job_data)
+    job_data['content_hash'] = content_hash(job_data['field_hashes'])
+    return job_data
@@ -1,10 +1,11 @@
 import os
 import time
+import atexit
 import json
+import asyncio
 import requests
 from datetime import datetime
 from urllib.parse import urlparse
-from xml.etree import ElementTree
 from dotenv import load_dotenv
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
@@ -13,12 +14,37 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException, StaleElementReferenceException
 from pathlib import Path
-from backend.scraper.schema import validate_job_data
+from contextlib import ExitStack
+from concurrent.futures import ThreadPoolExecutor
+from backend.scraper.schema import validate_job_data, add_content_hashes
+from backend.scraper.static_extractor import (
+    BOT_NAME, create_session, extract_job_data_static, fetch_listing_html, parse_job_html, find_json_in_scripts
+)
+from backend.scraper.worker_pool import CrawlStats, run_worker_pool, SUCCESS, FAILED, SKIPPED, DUPLICATE, QUEUED, RETRY
+from backend.scraper.pipeline import Stage, run_pipeline, parse_concurrency
+from backend.scraper.politeness import PolitenessScheduler
+from backend.scraper.seen_set import load_seen_set
+from backend.scraper.sitemap import SitemapState, parse_sitemap_incremental, stream_sitemap
+from backend.scraper.archive import PageArchive
+from backend.scraper.frontier import Frontier, PENDING, CLAIMED, DONE, FAILED_STATE
+from backend.scraper.work_queue import LeaseKeeper, LEASE_TTL, default_worker_id, open_work_queue
+from backend.scraper.revisit import DEFAULT_REVISIT_AGE, changed_fields, load_job_hashes
+from backend.scraper.ingest import IngestWriter
+from backend.scraper.browser_profile import DEFAULT_BLOCKLIST, create_lean_options, block_urls, load_blocklist
+from backend.scraper.metrics import metrics
+from backend.scraper.resilience import CircuitBreaker, RetryPolicy, TransientError, is_retryable, RETRYABLE_STATUSES
+from backend.scraper.driver_manager import (
+    DEFAULT_MAX_PAGES, DEFAULT_MAX_RSS_MB, DEFAULT_PAGE_TIMEOUT, DriverPool, ManagedDriver, page_watchdog
+)
+from backend.scraper.sources import (
+    JobSource, SourceBudgets, interleave, parse_source_budgets, register_source, registered_sources,
+    select_sources, source_for, source_for_job_id
+)
 import pprint
 import re
 
 # Import Firebase client
-from backend.database.firebase_client import get_firestore_client, exists_in_collection, save_to_collection
+from backend.database.firebase_client import get_firestore_client, exists_in_collection, save_to_collection, update_in_collection
 
 # Import firestore from firebase_admin
 from firebase_admin import firestore
@@ -38,6 +64,52 @@ chrome_options.add_argument("--no-sandbox")
 chrome_options.add_argument("--disable-dev-shm-usage")
 chrome_options.add_argument("--window-size=1920,1080")
 
+# Browser profile and lifecycle limits used by get_driver() and LazyDriver; see configure_browser().
+# user_agent is the crawler's name in robots.txt, for create_scheduler()
+browser_settings = {
+    'lean': False,
+    'blocklist': DEFAULT_BLOCKLIST,
+    'page_timeout': DEFAULT_PAGE_TIMEOUT,
+    'max_pages': DEFAULT_MAX_PAGES,
+    'max_rss_mb': DEFAULT_MAX_RSS_MB,
+    'user_agent': BOT_NAME,
+}
+
+SITEMAP_URL = "https://weworkremotely.com/sitemap.xml"
+JOB_URL_TEMPLATE = "https://weworkremotely.com/remote-jobs/{slug}"
+
+# Stages of the asyncio crawl pipeline and their default concurrency
+PIPELINE_STAGES = ('check', 'fetch', 'parse', 'validate', 'save')
+DEFAULT_STAGE_CONCURRENCY = {'check': 8, 'fetch': 4, 'parse': 2, 'validate': 1, 'save': 4}
+
+# Retry policies for page fetches and Firestore writes. Their circuit breakers are
+# shared by every worker, so a degraded database pauses the whole crawl; page fetches
+# use one breaker per job source (site_retry.scoped), so a failing board only pauses itself.
+site_retry = RetryPolicy('site', attempts=3, base_delay=2.0, max_delay=30.0,
+                         breaker=CircuitBreaker('site', failure_threshold=5, reset_timeout=30.0))
+firestore_retry = RetryPolicy('firestore', attempts=4, base_delay=0.5, max_delay=10.0,
+                              breaker=CircuitBreaker('firestore', failure_threshold=5, reset_timeout=15.0))
+
+def configure_browser(lean=False, blocklist=None, page_timeout=DEFAULT_PAGE_TIMEOUT,
+                      max_pages=DEFAULT_MAX_PAGES, max_rss_mb=DEFAULT_MAX_RSS_MB):
+    """
+    Choose the browser profile and lifecycle limits for every driver created afterwards.
+    
+    Args:
+        lean (bool, optional): Use eager page loads and block images, fonts, media and
+                               trackers. Defaults to False.
+        blocklist (list, optional): URL patterns to block in lean mode. Defaults to DEFAULT_BLOCKLIST.
+        page_timeout (float, optional): Hard limit in seconds for one page; a browser still busy
+                                        after it is killed. Page loads time out after half of it.
+        max_pages (int, optional): Pages a browser renders before it is replaced. 0 disables.
+        max_rss_mb (float, optional): Memory in MB a browser may use before it is replaced. 0 disables.
+    """
+    browser_settings['lean'] = lean
+    browser_settings['blocklist'] = blocklist if blocklist is not None else DEFAULT_BLOCKLIST
+    browser_settings['page_timeout'] = page_timeout
+    browser_settings['max_pages'] = max_pages
+    browser_settings['max_rss_mb'] = max_rss_mb
+
 def get_driver():
     """
     Create and return a configured Chrome WebDriver instance.
@@ -45,54 +117,157 @@ def get_driver():
     Returns:
         webdriver.Chrome: A configured Chrome WebDriver with headless options.
     """
-    return webdriver.Chrome(options=chrome_options)
+    if not browser_settings['lean']:
+        driver = webdriver.Chrome(options=chrome_options)
+    else:
+        driver = webdriver.Chrome(options=create_lean_options(chrome_options))
+        try:
+            block_urls(driver, browser_settings['blocklist'])
+        except WebDriverException as e:
+            print(f"⚠️ Could not set up request blocking: {e}")
+    # A slow load fails as a normal timeout well before the watchdog has to kill the browser
+    driver.set_page_load_timeout(browser_settings['page_timeout'] / 2)
+    return driver
 
 def parse_sitemap(url):
     """
     Parse XML sitemap to extract job URLs.
     
+    Nested sitemaps are fetched concurrently and streamed (see stream_sitemap).
+    
     Args:
         url (str): The URL of the sitemap to parse.
         
     Returns:
         list: A list of job URLs extracted from the sitemap.
     """
-    job_urls = []
     try:
-        response = requests.get(url, timeout=10)
-        root = ElementTree.fromstring(response.content)
-        
-        # Define namespace if present in the XML
-        ns = {'ns': root.tag.split('}')[0].strip('{')} if '}' in root.tag else {}
-        
-        # Check for nested sitemaps and job URLs
-        for child in root:
-            tag_name = child.tag.split('}')[-1] if '}' in child.tag else child.tag
-            
-            if tag_name == 'sitemap':
-                loc_element = child.find('.//ns:loc' if ns else './/loc', ns)
-                if loc_element is not None:
-                    job_urls.extend(parse_sitemap(loc_element.text))
-            elif tag_name in ['url', 'item']:  # Check both url and item tags
-                loc_element = child.find('.//ns:loc' if ns else './/loc', ns)
-                if loc_element is not None and '/listings/' in loc_element.text:  # Look for /listings/ instead of /remote-jobs/
-                    job_urls.append(loc_element.text)
-        
-        return job_urls
+        return list(stream_sitemap(url))
     except Exception as e:
         print(f"Error parsing sitemap: {e}")
         return []
 
-def check_for_json_data(driver):
+# Selectors whose text is read by get_text_safely during extraction
+SNAPSHOT_TEXT_SELECTORS = [
+    '.lis-container__header__hero__company-info__title',
+    '.lis-container__job__sidebar__companyDetails__info__title h3',
+    '.lis-container__header__hero__company-info__description',
+    '.lis-container__job__content__description',
+    '.lis-container__header__navigation__tab--category',
+    '.lis-container__job__sidebar__job-about__list__item span',
+]
+
+# Collects every field the extractors need in one WebDriver round trip.
+# Mirrors the XPath lookups below: a sidebar item is matched on its own text nodes.
+PAGE_SNAPSHOT_SCRIPT = """
+const textSelectors = arguments[0];
+const textOf = (el) => (el ? el.innerText || '' : '').trim();
+const ownText = (el) => Array.from(el.childNodes)
+    .filter((node) => node.nodeType === Node.TEXT_NODE)
+    .map((node) => node.textContent)
+    .join('');
+const allItems = Array.from(document.querySelectorAll('li'));
+const sidebarItems = allItems.filter((li) => (li.getAttribute('class') || '')
+    .includes('lis-container__job__sidebar__job-about__list__item'));
+const sidebarItem = (label) => sidebarItems.find((li) => ownText(li).includes(label));
+const labelledBoxes = (label) => allItems
+    .filter((li) => ownText(li).includes(label))
+    .flatMap((li) => Array.from(li.querySelectorAll('span[class*="box--blue"]')))
+    .map(textOf);
+const boxes = (label, selector) => {
+    const item = sidebarItem(label);
+    const found = item ? Array.from(item.querySelectorAll(selector)).map(textOf) : [];
+    return found.length ? found : labelledBoxes(label);
+};
+
+const texts = {};
+for (const selector of textSelectors) {
+    texts[selector] = textOf(document.querySelector(selector));
+}
+
+const regionItem = sidebarItem('Region');
+let region = regionItem ? Array.from(regionItem.querySelectorAll('.box--region')).map(textOf) : [];
+if (!region.length) {
+    region = Array.from(document.querySelectorAll('.box--region')).map(textOf);
+}
+
+const salaryItem = sidebarItem('Salary');
+const salary = salaryItem ? textOf(salaryItem.querySelector('.box--blue')) : (labelledBoxes('Salary')[0] || '');
+
+const apply = document.querySelector('.listing-apply-cta__btn #job-cta-alt') || document.getElementById('job-cta-alt');
+
+return {
+    texts: texts,
+    region: region,
+    salary_range: salary,
+    countries: boxes('Country', '.box--blue'),
+    skills: boxes('Skills', '.box--blue'),
+    timezones: boxes('Timezones', '.box--blue'),
+    apply_url: apply ? apply.href : null,
+    json_ld: Array.from(document.querySelectorAll('script[type="application/ld+json"]')).map((s) => s.innerHTML),
+    scripts: Array.from(document.scripts).map((s) => s.innerHTML).filter((t) => t.includes('window.jobData')),
+};
+"""
+
+@metrics.timed('snapshot')
+def get_page_snapshot(driver):
+    """
+    Collect all fields of a loaded job listing with a single execute_script call.
+    
+    The extract_* helpers below accept the snapshot and read from it instead of
+    sending their own XPath lookups and .text calls to the browser.
+    
+    Args:
+        driver (webdriver.Chrome): The Selenium WebDriver instance.
+        
+    Returns:
+        dict or None: The page snapshot, or None if the script could not run.
+    """
+    try:
+        snapshot = driver.execute_script(PAGE_SNAPSHOT_SCRIPT, SNAPSHOT_TEXT_SELECTORS)
+    except WebDriverException:
+        return None
+    return snapshot if isinstance(snapshot, dict) else None
+
+def check_page_status(driver, url):
+    """
+    Raise a TransientError if the browser's page was answered with a 429 or 5xx.
+    
+    The status comes from the page's navigation timing entry, which Selenium does not
+    otherwise expose. Pages whose status cannot be read are left alone.
+    
+    Args:
+        driver (webdriver.Chrome): The Selenium WebDriver instance, after driver.get().
+        url (str): The URL that was loaded.
+    
+    Raises:
+        TransientError: With the status_code, so the politeness scheduler backs off the host.
+    """
+    try:
+        status = driver.execute_script(
+            "const entry = performance.getEntriesByType('navigation')[0];"
+            "return entry ? entry.responseStatus : null;"
+        )
+    except WebDriverException:
+        return
+    if isinstance(status, int) and status in RETRYABLE_STATUSES:
+        raise TransientError(f"HTTP {status} loading {url}", status_code=status)
+
+def check_for_json_data(driver, snapshot=None):
     """
     Try to find and extract structured JSON data on the page.
     
     Args:
         driver (webdriver.Chrome): The Selenium WebDriver instance.
+        snapshot (dict, optional): A page snapshot from get_page_snapshot(). Taken from the driver if not given.
         
     Returns:
         dict or None: Extracted job posting JSON data if found, None otherwise.
     """
+    snapshot = snapshot if snapshot is not None else get_page_snapshot(driver)
+    if snapshot is not None:
+        return find_json_in_scripts(snapshot.get('json_ld', []), snapshot.get('scripts', []))
+    
     try:
         # Look for script tags with type="application/ld+json"
         script_elements = driver.find_elements(By.XPATH, "//script[@type='application/ld+json']")
@@ -122,7 +297,7 @@ def check_for_json_data(driver):
         print(f"Error extracting JSON data: {e}")
         return None
 
-def get_text_safely(driver, selector, wait_time=5):
+def get_text_safely(driver, selector, wait_time=5, snapshot=None):
     """
     Safely extract text from an element using explicit wait.
     
@@ -130,10 +305,14 @@ def get_text_safely(driver, selector, wait_time=5):
         driver (webdriver.Chrome): The Selenium WebDriver instance.
         selector (str): CSS selector to locate the element.
         wait_time (int, optional): Maximum time to wait for element. Defaults to 5.
+        snapshot (dict, optional): A page snapshot from get_page_snapshot(). Selectors it
+                                   covers are read from it without waiting.
         
     Returns:
         str: The extracted text or empty string if element not found.
     """
+    if snapshot is not None and selector in snapshot.get('texts', {}):
+        return snapshot['texts'][selector]
     try:
         element = WebDriverWait(driver, wait_time).until(
             EC.presence_of_element_located((By.CSS_SELECTOR, selector))
@@ -162,16 +341,22 @@ def get_elements_safely(driver, selector, wait_time=5):
     except (TimeoutException, NoSuchElementException):
         return []
 
-def extract_region(driver):
+@metrics.timed('extract_region')
+def extract_region(driver, snapshot=None):
     """
     Extract region information from the job listing.
     
     Args:
         driver (webdriver.Chrome): The Selenium WebDriver instance.
+        snapshot (dict, optional): A page snapshot from get_page_snapshot(). Taken from the driver if not given.
         
     Returns:
         list: A list of region names as strings.
     """
+    snapshot = snapshot if snapshot is not None else get_page_snapshot(driver)
+    if snapshot is not None:
+        return snapshot.get('region', [])
+    
     regions = []
     try:
         # Look for list item containing "Region"
@@ -192,16 +377,22 @@ def extract_region(driver):
     
     return regions
 
-def extract_salary(driver):
+@metrics.timed('extract_salary')
+def extract_salary(driver, snapshot=None):
     """
     Extract salary information from the job listing.
     
     Args:
         driver (webdriver.Chrome): The Selenium WebDriver instance.
+        snapshot (dict, optional): A page snapshot from get_page_snapshot(). Taken from the driver if not given.
         
     Returns:
         str: The salary range as a string, or empty string if not found.
     """
+    snapshot = snapshot if snapshot is not None else get_page_snapshot(driver)
+    if snapshot is not None:
+        return snapshot.get('salary_range', "")
+    
     try:
         # Look for list item containing "Salary"
         salary_items = driver.find_elements(By.XPATH, "//li[contains(@class, 'lis-container__job__sidebar__job-about__list__item') and contains(text(), 'Salary')]")
@@ -222,16 +413,22 @@ def extract_salary(driver):
     
     return ""  # Return empty string if no salary found
 
-def extract_countries(driver):
+@metrics.timed('extract_countries')
+def extract_countries(driver, snapshot=None):
     """
     Extract countries information from the job listing.
     
     Args:
         driver (webdriver.Chrome): The Selenium WebDriver instance.
+        snapshot (dict, optional): A page snapshot from get_page_snapshot(). Taken from the driver if not given.
         
     Returns:
         list: A list of country names as strings.
     """
+    snapshot = snapshot if snapshot is not None else get_page_snapshot(driver)
+    if snapshot is not None:
+        return snapshot.get('countries', [])
+    
     countries = []
     try:
         # Look for list item containing "Country"
@@ -253,16 +450,22 @@ def extract_countries(driver):
     
     return countries
 
-def extract_skills(driver):
+@metrics.timed('extract_skills')
+def extract_skills(driver, snapshot=None):
     """
     Extract skills information from the job listing.
     
     Args:
         driver (webdriver.Chrome): The Selenium WebDriver instance.
+        snapshot (dict, optional): A page snapshot from get_page_snapshot(). Taken from the driver if not given.
         
     Returns:
         list: A list of skill names as strings.
     """
+    snapshot = snapshot if snapshot is not None else get_page_snapshot(driver)
+    if snapshot is not None:
+        return snapshot.get('skills', [])
+    
     skills = []
     try:
         # Look for list item containing "Skills"
@@ -284,16 +487,22 @@ def extract_skills(driver):
     
     return skills
 
-def extract_timezones(driver):
+@metrics.timed('extract_timezones')
+def extract_timezones(driver, snapshot=None):
     """
     Extract timezones information from the job listing.
     
     Args:
         driver (webdriver.Chrome): The Selenium WebDriver instance.
+        snapshot (dict, optional): A page snapshot from get_page_snapshot(). Taken from the driver if not given.
         
     Returns:
         list: A list of timezone names as strings.
     """
+    snapshot = snapshot if snapshot is not None else get_page_snapshot(driver)
+    if snapshot is not None:
+        return snapshot.get('timezones', [])
+    
     timezones = []
     try:
         # Look for list item containing "Timezones"
@@ -315,6 +524,35 @@ def extract_timezones(driver):
     
     return timezones
 
+@metrics.timed('extract_apply_url')
+def extract_apply_url(driver, url, snapshot=None):
+    """
+    Extract the apply URL from the job listing.
+    
+    Args:
+        driver (webdriver.Chrome): The Selenium WebDriver instance.
+        url (str): The URL of the job listing, used when there is no apply button.
+        snapshot (dict, optional): A page snapshot from get_page_snapshot(). Taken from the driver if not given.
+        
+    Returns:
+        str: The apply URL.
+    """
+    snapshot = snapshot if snapshot is not None else get_page_snapshot(driver)
+    if snapshot is not None:
+        return snapshot.get('apply_url') or url
+    
+    try:
+        # Updated selector to match the element structure you provided
+        apply_button = driver.find_element(By.CSS_SELECTOR, ".listing-apply-cta__btn #job-cta-alt")
+        return apply_button.get_attribute('href')
+    except NoSuchElementException:
+        # Fallback to just looking for the ID
+        try:
+            apply_button = driver.find_element(By.ID, 'job-cta-alt')
+            return apply_button.get_attribute('href')
+        except NoSuchElementException:
+            return url
+
 def extract_job_data(url, driver):
     """
     Extract complete job data from a job listing page.
@@ -326,24 +564,45 @@ def extract_job_data(url, driver):
     Returns:
         dict or None: A dictionary containing all extracted job data,
                      or None if extraction failed.
+    
+    Raises:
+        TransientError: If the page failed to load in a way worth retrying (a page load
+                        timeout, a network error or a browser failure).
     """
     try:
-        driver.get(url)
+        with metrics.timer('page_load'):
+            try:
+                driver.get(url)
+            except WebDriverException as e:
+                if is_retryable(e):
+                    raise TransientError(f"Page load failed for {url}: {e}") from e
+                raise
         
         # Wait for the job listing to load
-        try:
-            WebDriverWait(driver, 15).until(
-                EC.presence_of_element_located((By.CLASS_NAME, 'listing-header-container'))
-            )
-        except TimeoutException:
-            # Try an alternative selector
-            WebDriverWait(driver, 5).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, '.lis-container'))
-            )
+        with metrics.timer('ready_wait'):
+            try:
+                WebDriverWait(driver, 15).until(
+                    EC.presence_of_element_located((By.CLASS_NAME, 'listing-header-container'))
+                )
+            except TimeoutException:
+                # An error page never shows the listing; back off instead of waiting for it
+                check_page_status(driver, url)
+                # Try an alternative selector
+                metrics.count('wait_fallback')
+                WebDriverWait(driver, 5).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, '.lis-container'))
+                )
+        
+        # Read every field in one round trip; None falls back to per-field lookups
+        snapshot = get_page_snapshot(driver)
+        if snapshot is None:
+            metrics.count('snapshot_fallback')
         
         # Try to extract structured JSON data first
-        json_data = check_for_json_data(driver)
+        json_data = check_for_json_data(driver, snapshot)
         if json_data and isinstance(json_data, dict):
+            if snapshot is not None:
+                return process_json_job_data(json_data, url, driver, snapshot=snapshot)
             return process_json_job_data(json_data, url, driver)
         
         # Fall back to direct Selenium extraction if no JSON is found
@@ -360,20 +619,20 @@ def extract_job_data(url, driver):
         # Extract main job details using Selenium
         job_data = {
             'job_id': job_id,
-            'title': get_text_safely(driver, '.lis-container__header__hero__company-info__title'),
-            'company': get_text_safely(driver, '.lis-container__job__sidebar__companyDetails__info__title h3'),
-            'company_about': get_text_safely(driver, '.lis-container__header__hero__company-info__description'),
-            'job_description': get_text_safely(driver, '.lis-container__job__content__description'),
-            'category': get_text_safely(driver, '.lis-container__header__navigation__tab--category') or category,
+            'title': get_text_safely(driver, '.lis-container__header__hero__company-info__title', snapshot=snapshot),
+            'company': get_text_safely(driver, '.lis-container__job__sidebar__companyDetails__info__title h3', snapshot=snapshot),
+            'company_about': get_text_safely(driver, '.lis-container__header__hero__company-info__description', snapshot=snapshot),
+            'job_description': get_text_safely(driver, '.lis-container__job__content__description', snapshot=snapshot),
+            'category': get_text_safely(driver, '.lis-container__header__navigation__tab--category', snapshot=snapshot) or category,
             
             # Extract region as a list
-            'region': extract_region(driver),
+            'region': extract_region(driver, snapshot),
             
             # Optional fields with improved extraction
-            'salary_range': extract_salary(driver),
-            'countries': extract_countries(driver),
-            'skills': extract_skills(driver),
-            'timezones': extract_timezones(driver),
+            'salary_range': extract_salary(driver, snapshot),
+            'countries': extract_countries(driver, snapshot),
+            'skills': extract_skills(driver, snapshot),
+            'timezones': extract_timezones(driver, snapshot),
             
             # Metadata
             'url': url,
@@ -381,30 +640,23 @@ def extract_job_data(url, driver):
             'timestamp': firestore.SERVER_TIMESTAMP
         }
         
-        # Try to get apply URL from the correct element
-        try:
-            # Updated selector to match the element structure you provided
-            apply_button = driver.find_element(By.CSS_SELECTOR, ".listing-apply-cta__btn #job-cta-alt")
-            job_data['apply_url'] = apply_button.get_attribute('href')
-        except NoSuchElementException:
-            # Fallback to just looking for the ID
-            try:
-                apply_button = driver.find_element(By.ID, 'job-cta-alt')
-                job_data['apply_url'] = apply_button.get_attribute('href')
-            except NoSuchElementException:
-                job_data['apply_url'] = url
+        job_data['apply_url'] = extract_apply_url(driver, url, snapshot)
         
-        job_data['apply_before'] = get_text_safely(driver, '.lis-container__job__sidebar__job-about__list__item span') or 'Not specified'
+        job_data['apply_before'] = get_text_safely(driver, '.lis-container__job__sidebar__job-about__list__item span', snapshot=snapshot) or 'Not specified'
         
         return job_data
+    except TransientError:
+        raise
     except (TimeoutException, NoSuchElementException, WebDriverException) as e:
+        if isinstance(e, TimeoutException):
+            metrics.count('timeout')
         print(f"❌ Error scraping {url}: {e}")
         return None
     except Exception as e:
         print(f"❌ Unexpected error processing {url}: {e}")
         return None
 
-def process_json_job_data(json_data, url, existing_driver=None):
+def process_json_job_data(json_data, url, existing_driver=None, snapshot=None):
     """
     Process structured JSON job data from a job listing.
     
@@ -412,7 +664,8 @@ def process_json_job_data(json_data, url, existing_driver=None):
         json_data (dict): The structured JSON data containing job information.
         url (str): The URL of the job listing.
         existing_driver (webdriver.Chrome, optional): An existing WebDriver instance.
-                                                     If None, a new instance will be created.
+                                                     If None, a warm one is borrowed from driver_pool.
+        snapshot (dict, optional): A page snapshot from get_page_snapshot() of the loaded listing.
     
     Returns:
         dict: A dictionary containing all processed job data.
@@ -447,47 +700,177 @@ def process_json_job_data(json_data, url, existing_driver=None):
     # Since JSON data doesn't reliably contain all information we need,
     # we'll extract additional information from the page
     driver = existing_driver
-    need_to_quit_driver = False
     
     try:
-        if not driver:
-            driver = get_driver()
-            need_to_quit_driver = True
-            driver.get(url)
-            # Wait for the job information to load
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, '.lis-container'))
-            )
-        
-        # Extract additional information from the page
-        job_data['company_about'] = get_text_safely(driver, '.lis-container__header__hero__company-info__description')
-        job_data['region'] = extract_region(driver)
-        job_data['salary_range'] = extract_salary(driver)
-        job_data['countries'] = extract_countries(driver)
-        job_data['skills'] = extract_skills(driver)
-        job_data['timezones'] = extract_timezones(driver)
-        
-        # Extract apply URL from the correct element
-        try:
-            # Updated selector to match the element structure you provided
-            apply_button = driver.find_element(By.CSS_SELECTOR, ".listing-apply-cta__btn #job-cta-alt")
-            job_data['apply_url'] = apply_button.get_attribute('href')
-        except NoSuchElementException:
-            # Fallback to just looking for the ID
-            try:
-                apply_button = driver.find_element(By.ID, 'job-cta-alt')
-                job_data['apply_url'] = apply_button.get_attribute('href')
-            except NoSuchElementException:
-                job_data['apply_url'] = url
+        with ExitStack() as stack:
+            if not driver:
+                # Borrow a warm browser instead of starting one for a single page
+                driver = stack.enter_context(driver_pool.lease())
+                stack.enter_context(page_watchdog.guard(driver, browser_settings['page_timeout'], url))
+                driver.get(url)
+                # Wait for the job information to load
+                WebDriverWait(driver, 10).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, '.lis-container'))
+                )
+            
+            # Extract additional information from the page in one round trip
+            if snapshot is None:
+                snapshot = get_page_snapshot(driver)
+            job_data['company_about'] = get_text_safely(driver, '.lis-container__header__hero__company-info__description', snapshot=snapshot)
+            job_data['region'] = extract_region(driver, snapshot)
+            job_data['salary_range'] = extract_salary(driver, snapshot)
+            job_data['countries'] = extract_countries(driver, snapshot)
+            job_data['skills'] = extract_skills(driver, snapshot)
+            job_data['timezones'] = extract_timezones(driver, snapshot)
+            
+            job_data['apply_url'] = extract_apply_url(driver, url, snapshot)
         
     except Exception as e:
         print(f"❌ Error extracting additional info: {e}")
-    finally:
-        if driver and need_to_quit_driver:
-            driver.quit()
     
     return job_data
 
+class LazyDriver(ManagedDriver):
+    """
+    Hold a worker's WebDriver, only started the first time it is needed.
+    
+    The static engine rarely needs a browser, so Chrome is not launched
+    unless a listing has to fall back to Selenium. Once started, the browser is
+    kept warm between pages and replaced when it reaches the page or memory
+    limits in browser_settings, or when it died.
+    """
+    
+    def __init__(self, driver=None):
+        super().__init__(lambda: get_driver(), driver,
+                         max_pages=browser_settings['max_pages'], max_rss_mb=browser_settings['max_rss_mb'])
+
+# Warm browsers lent to code outside of a worker, e.g. process_json_job_data without a driver
+driver_pool = DriverPool(LazyDriver)
+atexit.register(driver_pool.close)
+
+def render_and_extract(url, driver, archive=None, source=None):
+    """
+    Extract job data with Selenium, archiving the rendered page if an archive is given.
+    
+    Args:
+        url (str): The URL of the job listing to scrape.
+        driver (webdriver.Chrome): The Selenium WebDriver instance.
+        archive (PageArchive, optional): Stores the page HTML for later re-extraction.
+        source (JobSource, optional): The listing's job board. Defaults to source_for(url).
+        
+    Returns:
+        dict or None: The extracted job data, or None if extraction failed.
+    
+    Raises:
+        TransientError: If the page failed to load, or hung and the watchdog killed the browser.
+    """
+    with page_watchdog.guard(driver, browser_settings['page_timeout'], url):
+        job_data = (source or source_for(url)).extract(url, driver)
+        if archive is not None:
+            try:
+                archive.store(url, driver.page_source)
+            except WebDriverException as e:
+                print(f"⚠️ Could not archive {url}: {e}")
+    return job_data
+
+def extract_job_data_with_fallback(url, session, get_fallback_driver, archive=None, source=None):
+    """
+    Extract job data over plain HTTP, falling back to Selenium when the static parse fails.
+    
+    Args:
+        url (str): The URL of the job listing to scrape.
+        session (requests.Session): A pooled session from create_session().
+        get_fallback_driver (callable): Returns the WebDriver to use for the fallback.
+                                        Only called when the static parse fails.
+        archive (PageArchive, optional): Stores fetched pages for later re-extraction.
+        source (JobSource, optional): The listing's job board. Defaults to source_for(url).
+        
+    Returns:
+        dict or None: A dictionary containing all extracted job data,
+                     or None if both extraction methods failed.
+    """
+    source = source or source_for(url)
+    job_data = source.extract_static(url, session, archive)
+    if job_data:
+        return job_data
+    
+    metrics.count('static_fallback')
+    print(f"↪️ Static parse failed, falling back to Selenium: {url}")
+    return render_and_extract(url, get_fallback_driver(), archive, source)
+
+def create_scheduler(session=None, delay=1.0, sources=None):
+    """
+    Create the per-host politeness scheduler for a crawl.
+    
+    Args:
+        session (requests.Session, optional): The static engine's session. Its responses
+                                              are observed so 429/5xx answers trigger a backoff.
+                                              Browser page loads report theirs via TransientError.
+        delay (float, optional): Seconds between requests when robots.txt sets no Crawl-delay.
+                                 Defaults to 1.0.
+        sources (list, optional): The crawl's JobSources. Each one's hosts are paced by its
+                                  own delay and concurrency budget.
+        
+    Returns:
+        PolitenessScheduler: The scheduler.
+    """
+    scheduler = PolitenessScheduler(default_delay=delay, user_agent=browser_settings['user_agent'], session=session)
+    for source in sources or []:
+        for host in source.hosts:
+            scheduler.configure_host(host, delay=source.delay, max_concurrency=source.concurrency)
+    if session is not None:
+        scheduler.attach(session)
+    return scheduler
+
+def extract_with_engine(url, engine, driver, session=None, archive=None, source=None):
+    """
+    Extract job data with the selected extraction engine.
+    
+    Args:
+        url (str): The URL of the job listing to scrape.
+        engine (str): 'selenium' to render every page in Chrome, or 'static' to
+                      fetch and parse the HTML and only fall back to Selenium when needed.
+        driver (LazyDriver): The WebDriver holder used for Selenium extraction.
+        session (requests.Session, optional): Pooled session used by the static engine.
+        archive (PageArchive, optional): Stores fetched pages for later re-extraction.
+        source (JobSource, optional): The listing's job board. Defaults to source_for(url).
+        
+    Returns:
+        dict or None: The extracted job data, or None if extraction failed.
+    
+    Raises:
+        TransientError: If the page could not be fetched for a reason worth retrying.
+    """
+    if engine == 'static':
+        return extract_job_data_with_fallback(url, session, driver.get, archive, source)
+    return render_and_extract(url, driver.get(), archive, source)
+
+def fetch_with_retry(url, scheduler, fetch):
+    """
+    Fetch a page in a politeness slot, retrying transient failures.
+    
+    Every attempt waits for its own scheduler slot and the backoff between attempts
+    is spent outside of it. All attempts go through the circuit breaker of the URL's
+    job source, so workers pause that source while it keeps failing.
+    
+    Args:
+        url (str): The URL being fetched.
+        scheduler (PolitenessScheduler or None): Paces the requests.
+        fetch (callable): Makes one attempt and returns its result.
+        
+    Returns:
+        The result of fetch.
+    
+    Raises:
+        Exception: A permanent error, or the last transient one once every attempt failed.
+    """
+    def attempt():
+        if scheduler is None:
+            return fetch()
+        with scheduler.request(url):
+            return fetch()
+    return site_retry.scoped(source_for(url).key).call(attempt)
+
 def exists_in_firestore(job_id):
     """
     Check if a job with this ID already exists in Firestore.
@@ -498,7 +881,8 @@ def exists_in_firestore(job_id):
     Returns:
         bool: True if the job exists, False otherwise.
     """
-    return exists_in_collection('jobs', job_id)
+    with metrics.timer('firestore_exists'):
+        return exists_in_collection('jobs', job_id)
 
 def save_to_firestore(job_data, dry_run=False):
     """
@@ -509,11 +893,17 @@ def save_to_firestore(job_data, dry_run=False):
         dry_run (bool, optional): If True, don't actually save data. Defaults to False.
         
     Returns:
-        bool: True if save was successful (or would be in dry_run mode), False otherwise.
+        bool: True if save was successful (or would be in dry_run mode), False if the job already exists.
+    
+    Raises:
+        Exception: A Firestore error that is permanent or persisted through every retry.
     """
-    return save_to_collection('jobs', job_data, dry_run=dry_run)
+    # Hashes of the content let a later revisit detect edits without comparing documents
+    add_content_hashes(job_data)
+    with metrics.timer('firestore_write'):
+        return firestore_retry.call(save_to_collection, 'jobs', job_data, dry_run=dry_run, raise_errors=True)
 
-def test_scrape(test_urls=None, dry_run=False):
+def test_scrape(test_urls=None, dry_run=False, engine='selenium', delay=1.0):
     """
     Test the scraping process with specific URLs.
     
@@ -521,6 +911,8 @@ def test_scrape(test_urls=None, dry_run=False):
         test_urls (list, optional): List of URLs to test scrape. 
                                    If None, default test URLs are used.
         dry_run (bool, optional): If True, don't save data to Firestore. Defaults to False.
+        engine (str, optional): Extraction engine, 'selenium' or 'static'. Defaults to 'selenium'.
+        delay (float, optional): Seconds between requests when robots.txt sets no Crawl-delay. Defaults to 1.0.
         
     Returns:
         None
@@ -528,7 +920,9 @@ def test_scrape(test_urls=None, dry_run=False):
     Usage: 
         test_scrape(["https://example.com/job"], dry_run=True)
     """
-    driver = get_driver()
+    driver = LazyDriver(get_driver() if engine == 'selenium' else None)
+    session = create_session() if engine == 'static' else None
+    scheduler = create_scheduler(session, delay, registered_sources())
     
     if not test_urls:
         test_urls = [
@@ -548,9 +942,8 @@ def test_scrape(test_urls=None, dry_run=False):
             start_time = time.time()
             
             try:
-                # Extract job_id from URL first
-                parsed_url = urlparse(url)
-                job_id = parsed_url.path.split('/')[-1]
+                # Derive the job_id from the URL first
+                job_id = source_for(url).job_id(url)
                 
                 # Check if job already exists in database to avoid unnecessary processing
                 if not dry_run and exists_in_firestore(job_id):
@@ -559,7 +952,8 @@ def test_scrape(test_urls=None, dry_run=False):
                 
                 # Extraction
                 print(f"Extracting job data...")
-                raw_data = extract_job_data(url, driver)
+                with scheduler.request(url):
+                    raw_data = extract_with_engine(url, engine, driver, session)
                 
                 if not raw_data:
                     print("❌ No data extracted")
@@ -589,16 +983,249 @@ def test_scrape(test_urls=None, dry_run=False):
                 elapsed_time = time.time() - start_time
                 print(f"⏱ Time: {elapsed_time:.2f}s")
             
-            # Add a small delay between requests
-            time.sleep(1)
-            
     finally:
         driver.quit()
         print("\n🏁 Test complete")
 
-def main():
+@register_source
+class WeWorkRemotelySource(JobSource):
+    """
+    We Work Remotely, extracted with the Selenium and static extractors of this module.
+    
+    Its job IDs are the bare listing slugs, as stored before other sources existed.
+    """
+    
+    key = 'wwr'
+    name = 'WeWorkRemotely'
+    hosts = ('weworkremotely.com', 'www.weworkremotely.com')
+    sitemap_url = SITEMAP_URL
+    job_url_template = JOB_URL_TEMPLATE
+    
+    def discover(self, sitemap_state=None, session=None, lazy=False):
+        if lazy:
+            return stream_sitemap(self.sitemap_url, session, sitemap_state)
+        if sitemap_state is not None:
+            job_urls = parse_sitemap_incremental(self.sitemap_url, sitemap_state, session)
+            print(f"📋 Found {len(job_urls)} new or changed job URLs")
+        else:
+            job_urls = parse_sitemap(self.sitemap_url)
+            print(f"📋 Found {len(job_urls)} job URLs")
+        return job_urls
+    
+    def extract(self, url, driver):
+        return extract_job_data(url, driver)
+    
+    def parse_html(self, html, url):
+        return parse_job_html(html, url)
+    
+    def extract_static(self, url, session, archive=None):
+        return extract_job_data_static(url, session, archive)
+
+def fetch_job_urls(sitemap_state=None, session=None, lazy=False, sources=None):
+    """
+    Fetch job listing URLs from the sitemaps of the job sources.
+    
+    With several sources their URLs are interleaved, so every board has work
+    throughout the crawl instead of one after the other.
+    
+    Args:
+        sitemap_state (SitemapState, optional): Stored sitemap validators. When given, only
+                                                new or changed listings are returned.
+        session (requests.Session, optional): Session used for incremental sitemap requests.
+        lazy (bool, optional): Return a generator that yields URLs while the sitemaps are
+                               still downloading. Defaults to False.
+        sources (list, optional): The JobSources to crawl. Defaults to every registered source.
+    
+    Returns:
+        list or generator: The job URLs.
+    """
+    sources = sources or registered_sources()
+    print("🔍 Fetching job URLs from sitemap...")
+    if len(sources) == 1:
+        return sources[0].discover(sitemap_state, session, lazy=lazy)
+    job_urls = interleave([source.discover(sitemap_state, session, lazy=lazy) for source in sources])
+    return job_urls if lazy else list(job_urls)
+
+def claim_job_urls(frontier, sitemap_state=None, session=None, lazy=False, resume=False, sources=None):
+    """
+    Start (or resume) a crawl in the frontier and return the URLs still to be processed.
+    
+    A resumed crawl whose URL list was complete skips the sitemap entirely. Otherwise
+    the sitemap is fetched again and URLs that were already processed are left out.
+    Every returned URL is claimed in the frontier as it is handed out.
+    
+    Args:
+        frontier (Frontier): The persistent crawl frontier.
+        sitemap_state (SitemapState, optional): Stored sitemap validators for incremental crawling.
+        session (requests.Session, optional): Session used for incremental sitemap requests.
+        lazy (bool, optional): Add URLs while the sitemaps are still downloading. Defaults to False.
+        resume (bool, optional): Continue the last crawl if it did not finish. Defaults to False.
+        sources (list, optional): The JobSources to crawl. Defaults to every registered source.
+    
+    Returns:
+        tuple: (generator of claimed URLs, number of URLs or None when lazy and not yet known)
+    """
+    resumed = frontier.begin(resume)
+    if resumed:
+        counts = frontier.counts()
+        print(f"⏯️ Resuming crawl: {counts[PENDING]} pending, {counts[DONE]} done, {counts[FAILED_STATE]} failed")
+    if not frontier.listed:
+        job_urls = fetch_job_urls(sitemap_state, session, lazy=lazy, sources=sources)
+        if lazy:
+            return frontier.feed(job_urls), None
+        frontier.add(job_urls)
+        frontier.mark_listed()
+    return frontier.claims(), frontier.counts()[PENDING]
+
+def finish_listing(sitemap_state, url, status, frontier=None):
+    """
+    Record the outcome of a listing.
+    
+    The frontier entry is completed, and the incremental sitemap state is told when
+    a listing failed so the next run retries it. A listing that failed with a transient
+    error (RETRY) is queued again at the end of the frontier while it has attempts left,
+    and counts as failed after that. Listings handed to a batched writer are recorded
+    when their write completes.
+    
+    Returns:
+        str: The status to count: RETRY if the listing was queued again, FAILED if it
+             could not be, otherwise the given status.
+    """
+    if status == QUEUED:
+        return status
+    if status == RETRY:
+        if frontier is not None and frontier.retry(url, error="transient error"):
+            return RETRY
+        status = FAILED
+    elif frontier is not None:
+        frontier.complete(url, status)
+    if sitemap_state is not None and status == FAILED:
+        sitemap_state.discard(url)
+    return status
+
+def create_ingest_writer(stats, sitemap_state=None, frontier=None, seen=None):
+    """
+    Create a batched writer whose per-document results update the crawl's counters and listing state.
+    
+    A job is added to the seen set only once its write succeeded (or found it already
+    stored), so a failed write is crawled again by the next run.
+    """
+    def record(url, status):
+        if seen is not None and status in (SUCCESS, DUPLICATE):
+            seen.add(source_for(url).job_id(url))
+        stats.record(finish_listing(sitemap_state, url, status, frontier))
+    return IngestWriter('jobs', on_result=record)
+
+def finish_crawl(sitemap_state, frontier):
+    """
+    Commit the incremental sitemap state and close the frontier's crawl once every URL is processed.
+    
+    If the frontier still has pending or claimed URLs, neither is done, so the next
+    --resume (or incremental run) picks those URLs up.
+    """
+    if frontier is not None and frontier.unfinished:
+        counts = frontier.counts()
+        print(f"⚠️ Crawl not finished: {counts[PENDING]} pending, {counts[CLAIMED]} claimed; "
+              f"run with --resume to continue")
+        return
+    if sitemap_state is not None:
+        sitemap_state.commit()
+    if frontier is not None:
+        frontier.finish()
+
+def process_job_url(url, i, total, driver, session=None, engine='selenium', scheduler=None, seen=None, archive=None,
+                    writer=None):
     """
-    Main function to scrape all job listings from WeWorkRemotely.
+    Check, extract, validate and save a single job listing.
+    
+    Args:
+        url (str): The URL of the job listing.
+        i (int): Position of the URL in the crawl, used for progress output.
+        total (int): Total number of URLs in the crawl.
+        driver (LazyDriver): The WebDriver holder used for extraction.
+        session (requests.Session, optional): Pooled session used by the static engine.
+        engine (str, optional): Extraction engine, 'selenium' or 'static'. Defaults to 'selenium'.
+        scheduler (PolitenessScheduler, optional): Paces the page request. Existing jobs
+                                                   are skipped before reaching it, so they cost no delay.
+        seen (SeenSet, optional): Preloaded IDs of stored jobs. When given, the existence
+                                  check is an in-memory lookup instead of a Firestore read.
+        archive (PageArchive, optional): Stores fetched pages for later re-extraction.
+        writer (IngestWriter, optional): Batches the save. The writer reports the outcome,
+                                         and QUEUED is returned.
+        
+    Returns:
+        str: One of the worker_pool statuses (SUCCESS, FAILED, SKIPPED, DUPLICATE or QUEUED),
+             or RETRY if the site or Firestore kept failing with transient errors.
+    """
+    # Only print details for every 10th job to reduce output
+    verbose = i % 10 == 0 or i == 1 or i == total
+    start_time = time.time()
+    
+    try:
+        # Derive the job_id from the URL first
+        source = source_for(url)
+        job_id = source.job_id(url)
+        
+        # Check if job already exists in database
+        already_stored = job_id in seen if seen is not None else exists_in_firestore(job_id)
+        if already_stored:
+            if verbose:
+                print(f"[{i}/{total}] ⏩ Skipped: {job_id}")
+            return SKIPPED
+            
+        # Process the job only if it doesn't exist
+        if scheduler is not None and not scheduler.allowed(url):
+            print(f"[{i}/{total}] 🚫 Disallowed by robots.txt: {url}")
+            return SKIPPED
+        try:
+            raw_data = fetch_with_retry(url, scheduler,
+                                        lambda: extract_with_engine(url, engine, driver, session, archive, source))
+        except TransientError as e:
+            print(f"[{i}/{total}] 🔁 Giving up for now, will retry: {e}")
+            return RETRY
+        if not raw_data:
+            print(f"[{i}/{total}] ❌ Failed to extract: {url}")
+            return FAILED
+        
+        try:
+            with metrics.timer('validate'):
+                validated_data = validate_job_data(raw_data)
+            if writer is not None:
+                writer.add(add_content_hashes(validated_data), url)
+                return QUEUED
+            saved = save_to_firestore(validated_data)
+            if seen is not None:
+                seen.add(job_id)
+            if saved:
+                if verbose:
+                    print(f"[{i}/{total}] ✅ Saved: {raw_data['title']} @ {raw_data['company']}")
+                return SUCCESS
+            # This should rarely happen since we check existence first
+            return DUPLICATE
+        except ValueError as e:
+            print(f"[{i}/{total}] ❌ Invalid job data: {e}")
+            return FAILED
+        except Exception as e:
+            if is_retryable(e):
+                print(f"[{i}/{total}] 🔁 Firestore unavailable, will retry: {e}")
+                return RETRY
+            print(f"[{i}/{total}] ❌ Error validating: {e}")
+            return FAILED
+            
+    except Exception as e:
+        print(f"[{i}/{total}] ❌ Error: {e}")
+        return FAILED
+        
+    finally:
+        elapsed_time = time.time() - start_time
+        metrics.observe('listing', elapsed_time)
+        if verbose:
+            print(f"⏱ Time: {elapsed_time:.2f}s")
+
+def main(engine='selenium', workers=1, delay=1.0, seen=None, sitemap_state=None, archive=None,
+         frontier=None, resume=False, batch_writes=False, sources=None):
+    """
+    Main function to scrape all job listings from the job sources.
     
     This function:
     1. Fetches all job URLs from the sitemap
@@ -607,80 +1234,512 @@ def main():
     4. Saves it to Firestore
     5. Provides progress updates
     
+    Args:
+        engine (str, optional): Extraction engine, 'selenium' or 'static'. Defaults to 'selenium'.
+        workers (int, optional): Number of parallel browser workers sharing the URL queue.
+                                 Defaults to 1 (a single serial loop).
+        delay (float, optional): Seconds between requests when robots.txt sets no Crawl-delay.
+                                 Defaults to 1.0.
+        seen (SeenSet, optional): Preloaded IDs of stored jobs (see load_seen_set). When None,
+                                  every URL is checked with a Firestore read.
+        sitemap_state (SitemapState, optional): Enables incremental crawling: only new or
+                                                changed listings are processed, and the
+                                                state is committed when the crawl completes.
+        archive (PageArchive, optional): Stores every fetched page for later re-extraction.
+        frontier (Frontier, optional): Records the state of every URL, so an interrupted
+                                       crawl can be resumed.
+        resume (bool, optional): Continue the frontier's last crawl if it did not finish.
+                                 Defaults to False.
+        batch_writes (bool, optional): Buffer new jobs and write them to Firestore in batches.
+                                       Defaults to False (one write per job).
+        sources (list, optional): The JobSources to crawl. Defaults to every registered source.
+    
     Returns:
         None
     """
-    driver = get_driver()
+    sources = sources or registered_sources()
+    if workers > 1:
+        return run_parallel_crawl(engine=engine, workers=workers, delay=delay, seen=seen,
+                                  sitemap_state=sitemap_state, archive=archive,
+                                  frontier=frontier, resume=resume, batch_writes=batch_writes,
+                                  sources=sources)
+    
+    driver = LazyDriver(get_driver() if engine == 'selenium' else None)
+    session = create_session() if engine == 'static' else None
+    scheduler = create_scheduler(session, delay, sources)
+    stats = CrawlStats()
+    writer = create_ingest_writer(stats, sitemap_state, frontier, seen) if batch_writes else None
     
     try:
-        print("🔍 Fetching job URLs from sitemap...")
-        sitemap_url = "https://weworkremotely.com/sitemap.xml"
-        job_urls = parse_sitemap(sitemap_url)
-        print(f"📋 Found {len(job_urls)} job URLs")
-        
-        # Track progress
-        successful = 0
-        failed = 0
-        skipped = 0
-        
-        for i, url in enumerate(job_urls, 1):
-            # Initialize start_time at the beginning of each iteration
-            start_time = time.time()
+        if frontier is not None:
+            job_urls, total = claim_job_urls(frontier, sitemap_state, session, resume=resume, sources=sources)
+        else:
+            job_urls = fetch_job_urls(sitemap_state, session, sources=sources)
+            total = len(job_urls)
+        
+        # Batched writes can queue a listing again after the URLs ran out; another round claims it
+        for urls in (frontier.rounds(job_urls) if frontier is not None else [job_urls]):
+            for i, url in enumerate(urls, 1):
+                status = process_job_url(url, i, total, driver, session, engine, scheduler, seen, archive, writer)
+                stats.record(finish_listing(sitemap_state, url, status, frontier))
+                
+                # Periodic status update
+                if i % 50 == 0:
+                    print(f"\n--- Progress: {i}/{total} URLs | {stats.summary()} ---\n")
             
-            try:
-                # Extract job_id from URL first
-                parsed_url = urlparse(url)
-                job_id = parsed_url.path.split('/')[-1]
+            if writer is not None:
+                writer.flush()
+        finish_crawl(sitemap_state, frontier)
                 
-                # Check if job already exists in database
-                if exists_in_firestore(job_id):
-                    skipped += 1
-                    if i % 10 == 0 or i == 1 or i == len(job_urls):
-                        print(f"[{i}/{len(job_urls)}] ⏩ Skipped: {job_id}")
-                    continue
-                    
-                # Process the job only if it doesn't exist
-                raw_data = extract_job_data(url, driver)
-                if raw_data:
+    finally:
+        if writer is not None:
+            writer.close()
+        driver.quit()
+        print(f"\n🏁 Scraping completed: {stats.summary()}")
+
+def run_parallel_crawl(engine='selenium', workers=4, delay=1.0, seen=None, sitemap_state=None, archive=None,
+                       frontier=None, resume=False, batch_writes=False, sources=None):
+    """
+    Scrape all job listings with a pool of browser workers sharing one URL queue.
+    
+    Each worker owns a WebDriver (started on first use). All workers share one
+    politeness scheduler, so the site sees the same per-host pacing however many
+    workers run. URLs are handed to the workers within each source's concurrency
+    budget, so a slow source cannot occupy every worker. Every driver is quit when
+    the crawl ends, fails, or is interrupted with Ctrl-C.
+    
+    Args:
+        engine (str, optional): Extraction engine, 'selenium' or 'static'. Defaults to 'selenium'.
+        workers (int, optional): Number of parallel workers. Defaults to 4.
+        delay (float, optional): Seconds between requests when robots.txt sets no Crawl-delay.
+                                 Defaults to 1.0.
+        seen (SeenSet, optional): Preloaded IDs of stored jobs for in-memory existence checks.
+        sitemap_state (SitemapState, optional): Enables incremental crawling of new or changed listings.
+        archive (PageArchive, optional): Stores every fetched page for later re-extraction.
+        frontier (Frontier, optional): Records the state of every URL for crash-safe resume.
+        resume (bool, optional): Continue the frontier's last crawl if it did not finish.
+        batch_writes (bool, optional): Buffer new jobs and write them to Firestore in batches.
+        sources (list, optional): The JobSources to crawl. Defaults to every registered source.
+        
+    Returns:
+        None
+    """
+    sources = sources or registered_sources()
+    # requests.Session is safe to share for plain GETs; size the pool for all workers
+    session = create_session(pool_size=workers) if engine == 'static' else None
+    scheduler = create_scheduler(session, delay, sources)
+    budgets = SourceBudgets(sources, default_limit=workers)
+    stats = CrawlStats()
+    writer = create_ingest_writer(stats, sitemap_state, frontier, seen) if batch_writes else None
+    
+    def handle_url(url, i, driver):
+        try:
+            status = process_job_url(url, i, total, driver, session, engine, scheduler, seen, archive, writer)
+            return finish_listing(sitemap_state, url, status, frontier)
+        finally:
+            budgets.release(url)
+    
+    try:
+        if frontier is not None:
+            job_urls, total = claim_job_urls(frontier, sitemap_state, session, resume=resume, sources=sources)
+        else:
+            job_urls = fetch_job_urls(sitemap_state, session, sources=sources)
+            total = len(job_urls)
+        print(f"👷 Processing with {workers} workers")
+        
+        # A listing queued again after the dispatcher ran out of URLs is claimed in another round
+        for urls in (frontier.rounds(job_urls) if frontier is not None else [job_urls]):
+            run_worker_pool(budgets.dispatch(urls), handle_url, workers,
+                            start_worker=LazyDriver, stop_worker=lambda driver: driver.quit(),
+                            stats=stats)
+            if writer is not None:
+                writer.flush()
+        finish_crawl(sitemap_state, frontier)
+    finally:
+        if writer is not None:
+            writer.close()
+        print(f"\n🏁 Scraping completed: {stats.summary()}")
+
+def run_pipeline_crawl(engine='static', concurrency=None, delay=1.0, seen=None, sitemap_state=None, archive=None,
+                       frontier=None, resume=False, batch_writes=False, sources=None):
+    """
+    Scrape all job listings with an asyncio pipeline of bounded-queue stages.
+    
+    The stages are check (existence in Firestore), fetch (download the page, or
+    render it in Chrome for the selenium engine), parse, validate and save. Every
+    stage has its own concurrency, so fetching one listing overlaps with parsing
+    and saving others. URLs enter the pipeline within each source's concurrency
+    budget, so a slow source cannot fill the stages.
+    
+    Args:
+        engine (str, optional): Extraction engine, 'selenium' or 'static'. Defaults to 'static'.
+        concurrency (dict, optional): Per-stage concurrency overrides, e.g. {'fetch': 8}.
+        delay (float, optional): Seconds between requests when robots.txt sets no Crawl-delay.
+                                 Defaults to 1.0.
+        seen (SeenSet, optional): Preloaded IDs of stored jobs for in-memory existence checks.
+        sitemap_state (SitemapState, optional): Enables incremental crawling of new or changed listings.
+        archive (PageArchive, optional): Stores every fetched page for later re-extraction.
+        frontier (Frontier, optional): Records the state of every URL for crash-safe resume.
+        resume (bool, optional): Continue the frontier's last crawl if it did not finish.
+        batch_writes (bool, optional): The save stage hands jobs to a batched writer instead
+                                       of writing each one itself.
+        sources (list, optional): The JobSources to crawl. Defaults to every registered source.
+        
+    Returns:
+        CrawlStats: The aggregated counters.
+    """
+    sources = sources or registered_sources()
+    concurrency = {**DEFAULT_STAGE_CONCURRENCY, **(concurrency or {})}
+    session = create_session(pool_size=concurrency['fetch']) if engine == 'static' else None
+    scheduler = create_scheduler(session, delay, sources)
+    # Without a budget, a source may fill every stage
+    budgets = SourceBudgets(sources, default_limit=sum(concurrency.values()))
+    # One browser per concurrent fetch; started on first use and shared with parse fallbacks
+    drivers = [LazyDriver() for _ in range(concurrency['fetch'])]
+    stats = CrawlStats()
+    writer = create_ingest_writer(stats, sitemap_state, frontier, seen) if batch_writes else None
+    
+    async def crawl(job_urls):
+        idle_drivers = asyncio.Queue()
+        for driver in drivers:
+            idle_drivers.put_nowait(driver)
+        
+        async def polite(url, fetch):
+            # The scheduler and the retry backoff block, so run the whole fetch in a thread
+            return await asyncio.to_thread(fetch_with_retry, url, scheduler, fetch)
+        
+        async def extract_in_browser(url, source):
+            driver = await idle_drivers.get()
+            try:
+                return await polite(url, lambda: render_and_extract(url, driver.get(), archive, source))
+            finally:
+                idle_drivers.put_nowait(driver)
+        
+        async def check(url):
+            source = source_for(url)
+            job_id = source.job_id(url)
+            if seen is not None:
+                if job_id in seen:
+                    return SKIPPED
+            elif await asyncio.to_thread(exists_in_firestore, job_id):
+                return SKIPPED
+            if not await asyncio.to_thread(scheduler.allowed, url):
+                print(f"🚫 Disallowed by robots.txt: {url}")
+                return SKIPPED
+            return {'url': url, 'job_id': job_id, 'source': source}
+        
+        async def fetch(item):
+            try:
+                if engine == 'static':
+                    item['html'] = await polite(item['url'], lambda: fetch_listing_html(item['url'], session))
+                    if item['html'] is not None and archive is not None:
+                        await asyncio.to_thread(archive.store, item['url'], item['html'])
+                else:
+                    item['job_data'] = await extract_in_browser(item['url'], item['source'])
+            except TransientError as e:
+                print(f"🔁 Giving up for now, will retry: {e}")
+                return RETRY
+            return item
+        
+        async def parse(item):
+            if 'job_data' not in item:
+                job_data = None
+                if item['html']:
                     try:
-                        validated_data = validate_job_data(raw_data)
-                        if save_to_firestore(validated_data):
-                            successful += 1
-                            if i % 10 == 0 or i == 1 or i == len(job_urls):
-                                print(f"[{i}/{len(job_urls)}] ✅ Saved: {raw_data['title']} @ {raw_data['company']}")
-                        else:
-                            # This should rarely happen since we check existence first
-                            skipped += 1
-                    except ValueError as e:
-                        print(f"[{i}/{len(job_urls)}] ❌ Invalid job data: {e}")
-                        failed += 1
+                        job_data = await asyncio.to_thread(item['source'].parse_html, item['html'], item['url'])
                     except Exception as e:
-                        print(f"[{i}/{len(job_urls)}] ❌ Error validating: {e}")
-                        failed += 1
-                else:
-                    failed += 1
-                    print(f"[{i}/{len(job_urls)}] ❌ Failed to extract: {url}")
-                    
+                        print(f"⚠️ Static parse failed for {item['url']}: {e}")
+                if not job_data:
+                    print(f"↪️ Static parse failed, falling back to Selenium: {item['url']}")
+                    try:
+                        job_data = await extract_in_browser(item['url'], item['source'])
+                    except TransientError as e:
+                        print(f"🔁 Giving up for now, will retry: {e}")
+                        return RETRY
+                item['job_data'] = job_data
+            if not item['job_data']:
+                print(f"❌ Failed to extract: {item['url']}")
+                return FAILED
+            return item
+        
+        async def validate(item):
+            try:
+                with metrics.timer('validate'):
+                    item['job_data'] = validate_job_data(item['job_data'])
+            except ValueError as e:
+                print(f"❌ Invalid job data for {item['url']}: {e}")
+                return FAILED
+            return item
+        
+        async def save(item):
+            if writer is not None:
+                await asyncio.to_thread(writer.add, add_content_hashes(item['job_data']), item['url'])
+                return QUEUED
+            try:
+                saved = await asyncio.to_thread(save_to_firestore, item['job_data'])
             except Exception as e:
-                print(f"[{i}/{len(job_urls)}] ❌ Error: {e}")
-                failed += 1
-                
-            finally:
-                # Only print timing for non-skipped jobs to reduce output
-                if i % 10 == 0 or i == 1 or i == len(job_urls):
-                    elapsed_time = time.time() - start_time
-                    print(f"⏱ Time: {elapsed_time:.2f}s")
-                
-            # Add a small delay between requests to be respectful
-            time.sleep(3)
+                if not is_retryable(e):
+                    raise
+                print(f"🔁 Firestore unavailable, will retry {item['url']}: {e}")
+                return RETRY
+            if seen is not None:
+                seen.add(item['job_id'])
+            return SUCCESS if saved else DUPLICATE
+        
+        handlers = {'check': check, 'fetch': fetch, 'parse': parse, 'validate': validate, 'save': save}
+        stages = [Stage(name, handlers[name], concurrency[name]) for name in PIPELINE_STAGES]
+        
+        # Blocking calls run in threads; make sure every stage worker can get one
+        loop = asyncio.get_running_loop()
+        loop.set_default_executor(ThreadPoolExecutor(max_workers=sum(concurrency.values()) + 1))
+        def on_result(url, status):
+            budgets.release(url)
+            return finish_listing(sitemap_state, url, status, frontier)
+        
+        await run_pipeline(budgets.dispatch(job_urls), stages, stats, on_result=on_result)
+    
+    try:
+        if frontier is not None:
+            job_urls, _ = claim_job_urls(frontier, sitemap_state, session, lazy=True, resume=resume, sources=sources)
+        else:
+            job_urls = fetch_job_urls(sitemap_state, session, lazy=True, sources=sources)
+        print("🚰 Pipeline concurrency: " + ", ".join(f"{name}={concurrency[name]}" for name in PIPELINE_STAGES))
+        # A listing queued again after the dispatcher ran out of URLs is claimed in another round
+        for urls in (frontier.rounds(job_urls) if frontier is not None else [job_urls]):
+            asyncio.run(crawl(urls))
+            if writer is not None:
+                writer.flush()
+        finish_crawl(sitemap_state, frontier)
+    finally:
+        if writer is not None:
+            writer.close()
+        for driver in drivers:
+            driver.quit()
+        print(f"\n🏁 Scraping completed: {stats.summary()}")
+    return stats
+
+def run_queue_crawl(queue, engine='selenium', workers=1, delay=1.0, seen=None, archive=None,
+                    seed=False, worker_id=None, lease_ttl=LEASE_TTL, sources=None):
+    """
+    Scrape job listings leased from a work queue shared with other scraper processes.
+    
+    Any number of processes, on one host (SQLite queue) or many (Redis queue), can
+    run this against the same queue. Each one leases URLs, renews its leases with a
+    heartbeat while they are processed, and exits once the queue is drained. URLs
+    leased by a process that dies are queued again when the lease expires.
+    
+    Args:
+        queue (SQLiteWorkQueue or RedisWorkQueue): The shared work queue.
+        engine (str, optional): Extraction engine, 'selenium' or 'static'. Defaults to 'selenium'.
+        workers (int, optional): Number of parallel workers in this process. Defaults to 1.
+        delay (float, optional): Seconds between requests when robots.txt sets no Crawl-delay.
+                                 Defaults to 1.0.
+        seen (SeenSet, optional): Preloaded IDs of stored jobs for in-memory existence checks.
+        archive (PageArchive, optional): Stores every fetched page for later re-extraction.
+        seed (bool, optional): Start a new crawl: clear the queue and fill it from the
+                               sitemap before working. Run one seeding process per crawl.
+        worker_id (str, optional): The ID leases are held under. Defaults to host-pid-random.
+        lease_ttl (float, optional): Seconds a lease lasts without a heartbeat.
+        sources (list, optional): The JobSources to seed the queue from and whose budgets pace
+                                  this process. Defaults to every registered source.
+        
+    Returns:
+        CrawlStats: The counters of this process.
+    """
+    sources = sources or registered_sources()
+    worker_id = worker_id or default_worker_id()
+    session = create_session(pool_size=workers) if engine == 'static' else None
+    scheduler = create_scheduler(session, delay, sources)
+    budgets = SourceBudgets(sources, default_limit=workers)
+    stats = CrawlStats()
+    leases = LeaseKeeper(queue, worker_id, lease_ttl)
+    
+    def handle_url(url, i, driver):
+        try:
+            status = process_job_url(url, i, '?', driver, session, engine, scheduler, seen, archive)
+        finally:
+            budgets.release(url)
+        if status == RETRY:
+            # The queue itself requeues failed URLs while they have attempts left
+            status = FAILED
+        leases.complete(url, status)
+        return status
+    
+    try:
+        if seed:
+            queue.reset()
+            queue.add(fetch_job_urls(session=session, sources=sources))
+            queue.seal()
+        print(f"🪪 Worker {worker_id} | queue: " + ", ".join(f"{k}={v}" for k, v in queue.counts().items()))
+        
+        with leases:
+            run_worker_pool(budgets.dispatch(leases.urls()), handle_url, workers,
+                            start_worker=LazyDriver, stop_worker=lambda driver: driver.quit(),
+                            stats=stats)
+    finally:
+        print(f"\n🏁 Worker {worker_id} completed: {stats.summary()}")
+    return stats
+
+def revisit_job(job_id, hashes, driver, session=None, engine='static', scheduler=None, archive=None):
+    """
+    Fetch a stored job again and write the fields that changed since it was saved.
+    
+    Args:
+        job_id (str): The ID of the stored job.
+        hashes (JobHashes): The stored content hashes.
+        driver (LazyDriver): The WebDriver holder used for Selenium extraction.
+        session (requests.Session, optional): Pooled session used by the static engine.
+        engine (str, optional): Extraction engine, 'selenium' or 'static'. Defaults to 'static'.
+        scheduler (PolitenessScheduler, optional): Paces the page request.
+        archive (PageArchive, optional): Stores fetched pages for later re-extraction.
+        
+    Returns:
+        str: SUCCESS if the job was updated, SKIPPED if it is unchanged, FAILED otherwise.
+    """
+    url = source_for_job_id(job_id).job_url(job_id)
+    try:
+        raw_data = fetch_with_retry(url, scheduler, lambda: extract_with_engine(url, engine, driver, session, archive))
+    except TransientError as e:
+        # Not recorded as checked, so the next revisit picks the job up again
+        print(f"❌ Failed to revisit {url}: {e}")
+        return FAILED
+    if not raw_data:
+        print(f"❌ Failed to revisit: {url}")
+        return FAILED
+    
+    try:
+        with metrics.timer('validate'):
+            job_data = validate_job_data(raw_data)
+    except ValueError as e:
+        print(f"❌ Invalid job data for {url}: {e}")
+        return FAILED
+    
+    _, stored_hashes = hashes.get(job_id)
+    update = changed_fields(job_data, stored_hashes)
+    if not update:
+        hashes.record(job_id)
+        return SKIPPED
+    
+    update['updated_at'] = firestore.SERVER_TIMESTAMP
+    try:
+        with metrics.timer('firestore_update'):
+            firestore_retry.call(update_in_collection, 'jobs', job_id, update, raise_errors=True)
+    except Exception as e:
+        # Not recorded as checked, so the next revisit tries again
+        print(f"❌ Failed to update {job_id}: {e}")
+        return FAILED
+    hashes.record(job_id, job_data)
+    print(f"✏️ Updated {job_id}: {', '.join(sorted(k for k in update if k not in ('field_hashes', 'content_hash', 'updated_at')))}")
+    return SUCCESS
+
+def revisit_jobs(engine='static', workers=1, delay=1.0, max_age=DEFAULT_REVISIT_AGE, limit=None,
+                 hashes=None, archive=None, sources=None):
+    """
+    Revisit stored jobs and update the ones whose listing was edited.
+    
+    Each due job is fetched again (plain HTTP with the static engine) and its field
+    hashes are compared with the stored ones. Unchanged jobs cost no Firestore write;
+    edited jobs get a field-level update of the changed fields only.
+    
+    Args:
+        engine (str, optional): Extraction engine, 'selenium' or 'static'. Defaults to 'static'.
+        workers (int, optional): Number of parallel workers. Defaults to 1.
+        delay (float, optional): Seconds between requests when robots.txt sets no Crawl-delay.
+                                 Defaults to 1.0.
+        max_age (float, optional): Revisit jobs last checked more than this many seconds ago.
+                                   Defaults to one day.
+        limit (int, optional): Revisit at most this many jobs, oldest check first.
+        hashes (JobHashes, optional): The stored content hashes. Loaded with load_job_hashes if None.
+        archive (PageArchive, optional): Stores every fetched page for later re-extraction.
+        sources (list, optional): The JobSources whose jobs are revisited. Defaults to every registered source.
+        
+    Returns:
+        CrawlStats: Updated (successful), unchanged (skipped) and failed counts.
+    """
+    if hashes is None:
+        hashes = load_job_hashes('jobs')
+    sources = sources or registered_sources()
+    keys = {source.key for source in sources}
+    session = create_session(pool_size=workers) if engine == 'static' else None
+    scheduler = create_scheduler(session, delay, sources)
+    budgets = SourceBudgets(sources, source_of=source_for_job_id, default_limit=workers)
+    stats = CrawlStats()
+    
+    def handle_job(job_id, i, driver):
+        try:
+            return revisit_job(job_id, hashes, driver, session, engine, scheduler, archive)
+        finally:
+            budgets.release(job_id)
+    
+    try:
+        job_ids = hashes.due(max_age)
+        job_ids = [job_id for job_id in job_ids if source_for_job_id(job_id).key in keys][:limit]
+        print(f"🔁 Revisiting {len(job_ids)} of {len(hashes)} stored jobs")
+        run_worker_pool(budgets.dispatch(job_ids), handle_job, workers,
+                        start_worker=LazyDriver, stop_worker=lambda driver: driver.quit(),
+                        stats=stats)
+    finally:
+        print(f"\n🏁 Revisit completed: ✏️ Updated: {stats.successful} | ❌ Failed: {stats.failed} | ⏩ Unchanged: {stats.skipped}")
+    return stats
+
+def reextract_from_archive(archive, output=None):
+    """
+    Re-run extraction and validation over the archived pages, without network or browser.
+    
+    Useful after a parser change: the latest archived page of every job is parsed
+    again with its source's parser and validated.
+    
+    Args:
+        archive (PageArchive): The page archive.
+        output (str, optional): File to write the validated jobs to, one JSON object per line.
+        
+    Returns:
+        CrawlStats: Successful and failed counts.
+    """
+    stats = CrawlStats()
+    out = open(output, 'w', encoding='utf-8') if output else None
+    print(f"📦 Re-extracting {len(archive)} archived jobs...")
+    
+    try:
+        for i, (url, html, fetched_at) in enumerate(archive.iter_latest(), 1):
+            try:
+                job_data = source_for(url).parse_html(html, url)
+                if not job_data:
+                    print(f"[{i}] ❌ Failed to extract: {url}")
+                    stats.record(FAILED)
+                    continue
+                validated_data = validate_job_data(job_data)
+            except Exception as e:
+                print(f"[{i}] ❌ Invalid job data for {url}: {e}")
+                stats.record(FAILED)
+                continue
             
-            # Periodic status update
-            if i % 50 == 0:
-                print(f"\n--- Progress: {i}/{len(job_urls)} URLs | ✅ Success: {successful} | ❌ Failed: {failed} | ⏩ Skipped: {skipped} ---\n")
-                
+            stats.record(SUCCESS)
+            if out is not None:
+                validated_data.pop('timestamp', None)
+                validated_data['fetched_at'] = datetime.fromtimestamp(fetched_at).isoformat()
+                out.write(json.dumps(validated_data, ensure_ascii=False) + "\n")
     finally:
-        driver.quit()
-        print(f"\n🏁 Scraping completed: ✅ Success: {successful} | ❌ Failed: {failed} | ⏩ Skipped: {skipped}")
+        if out is not None:
+            out.close()
+        print(f"\n🏁 Re-extraction completed: {stats.summary()}")
+    return stats
+
+def report_metrics(path=None):
+    """
+    Print where the run's time went and optionally export the metrics.
+    
+    Args:
+        path (str, optional): Write the metrics to this file in the Prometheus text format,
+                              e.g. for the node exporter's textfile collector.
+    """
+    print(f"\n📈 Stage timings:\n{metrics.summary()}")
+    if path:
+        try:
+            metrics.write(path)
+            print(f"📈 Metrics written to {path}")
+        except OSError as e:
+            print(f"⚠️ Could not write metrics to {path}: {e}")
 
 if __name__ == "__main__":
     import argparse
@@ -692,12 +1751,127 @@ if __name__ == "__main__":
                        help='Specific URLs to test')
     parser.add_argument('--dry-run', action='store_true',
                        help='Run without saving to Firestore')
+    parser.add_argument('--engine', choices=['selenium', 'static'],
+                       help='Extraction engine: render every page in Chrome, or fetch the HTML and only fall back to Chrome when needed '
+                            '(default: selenium, or static with --revisit)')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Number of parallel browser workers sharing the URL queue')
+    parser.add_argument('--sources', nargs='+', metavar='SOURCE',
+                       help=f'Job sources to crawl (default: all of {", ".join(source.key for source in registered_sources())})')
+    parser.add_argument('--source-budget', nargs='+', metavar='SOURCE=N[:DELAY]',
+                       help='Per-source budget: at most N listings in flight (default: all workers or pipeline stages), '
+                            'and DELAY seconds between requests when robots.txt sets no Crawl-delay (default: --delay)')
+    parser.add_argument('--delay', type=float, default=1.0,
+                       help='Seconds between requests to a host when robots.txt sets no Crawl-delay')
+    parser.add_argument('--no-seen-cache', action='store_true',
+                       help='Check every URL against Firestore instead of preloading the stored job IDs')
+    parser.add_argument('--refresh-seen', action='store_true',
+                       help='Reload the stored job IDs (or, with --revisit, content hashes) from Firestore even if the local cache is fresh')
+    parser.add_argument('--lean', action='store_true',
+                       help='Lean browser: eager page loads, no images, fonts, media or trackers')
+    parser.add_argument('--blocklist', metavar='FILE',
+                       help='File of URL patterns to block in lean mode (implies --lean)')
+    parser.add_argument('--page-timeout', type=float, default=DEFAULT_PAGE_TIMEOUT, metavar='SECONDS',
+                       help='Hard limit for one page; a browser still busy after it is killed and replaced')
+    parser.add_argument('--recycle-pages', type=int, default=DEFAULT_MAX_PAGES, metavar='N',
+                       help='Replace each browser after N pages (0 disables)')
+    parser.add_argument('--recycle-memory', type=float, default=DEFAULT_MAX_RSS_MB, metavar='MB',
+                       help='Replace a browser once its processes use more than MB of memory (0 disables)')
+    parser.add_argument('--incremental', action='store_true',
+                       help='Only crawl listings that are new or changed since the last run (conditional sitemap requests)')
+    parser.add_argument('--archive', action='store_true',
+                       help='Store every fetched listing page in the compressed local archive')
+    parser.add_argument('--from-archive', action='store_true',
+                       help='Re-run extraction and validation over the archived pages (no network or browser)')
+    parser.add_argument('--output', metavar='FILE',
+                       help='With --from-archive, write the validated jobs to FILE as JSON lines')
+    parser.add_argument('--batch-writes', action='store_true',
+                       help='Buffer new jobs and write them to Firestore in batches (BulkWriter) instead of one by one')
+    parser.add_argument('--resume', action='store_true',
+                       help='Continue the last crawl from its checkpointed frontier instead of starting over')
+    parser.add_argument('--queue', metavar='LOCATION',
+                       help='Lease URLs from a work queue shared with other scraper processes: '
+                            'sqlite, sqlite:///path or redis://host:port/db')
+    parser.add_argument('--seed', action='store_true',
+                       help='With --queue, start a new crawl by filling the queue from the sitemap')
+    parser.add_argument('--worker-id',
+                       help='With --queue, the ID this process holds its leases under')
+    parser.add_argument('--revisit', action='store_true',
+                       help='Fetch stored jobs again (over plain HTTP unless --engine selenium) and update the fields of edited listings')
+    parser.add_argument('--revisit-age', type=float, default=DEFAULT_REVISIT_AGE / 3600, metavar='HOURS',
+                       help='With --revisit, only revisit jobs last checked more than HOURS ago')
+    parser.add_argument('--limit', type=int,
+                       help='With --revisit, revisit at most this many jobs')
+    parser.add_argument('--metrics-file', metavar='FILE',
+                       help='Write per-stage timings and event counters to FILE in the Prometheus text format')
+    parser.add_argument('--metrics-port', type=int, metavar='PORT',
+                       help='Serve per-stage timings and event counters at http://localhost:PORT/metrics while crawling')
+    parser.add_argument('--pipeline', action='store_true',
+                       help='Crawl with the asyncio pipeline (check → fetch → parse → validate → save)')
+    parser.add_argument('--concurrency', nargs='+', metavar='STAGE=N',
+                       help=f'Per-stage pipeline concurrency, stages: {", ".join(PIPELINE_STAGES)} '
+                            f'(defaults: {" ".join(f"{k}={v}" for k, v in DEFAULT_STAGE_CONCURRENCY.items())})')
     
     args = parser.parse_args()
+    # Revisits compare plain HTML by default; crawls render in Chrome
+    args.engine = args.engine or ('static' if args.revisit else 'selenium')
     
-    if args.test:
-        test_scrape(test_urls=args.urls, dry_run=args.dry_run)
-    else:
-        if args.dry_run:
-            print("⚠️ Dry run only works with --test mode")
-        main()
+    try:
+        stage_concurrency = parse_concurrency(args.concurrency, PIPELINE_STAGES)
+        sources = select_sources(args.sources, parse_source_budgets(args.source_budget))
+    except ValueError as e:
+        parser.error(str(e))
+    
+    try:
+        configure_browser(lean=bool(args.lean or args.blocklist),
+                          blocklist=load_blocklist(args.blocklist) if args.blocklist else None,
+                          page_timeout=args.page_timeout, max_pages=args.recycle_pages,
+                          max_rss_mb=args.recycle_memory)
+    except OSError as e:
+        parser.error(f"Could not read blocklist: {e}")
+    
+    if args.queue and (args.pipeline or stage_concurrency or args.incremental or args.resume or args.batch_writes):
+        parser.error("--queue cannot be combined with --pipeline, --concurrency, --incremental, --resume or --batch-writes")
+    
+    if args.metrics_port:
+        metrics.serve(args.metrics_port)
+        print(f"📈 Serving metrics at http://localhost:{args.metrics_port}/metrics")
+    
+    try:
+        if args.from_archive:
+            reextract_from_archive(PageArchive(), output=args.output)
+        elif args.revisit:
+            revisit_jobs(engine=args.engine, workers=args.workers, delay=args.delay,
+                         max_age=args.revisit_age * 3600, limit=args.limit,
+                         hashes=load_job_hashes('jobs', refresh=args.refresh_seen),
+                         archive=PageArchive() if args.archive else None, sources=sources)
+        elif args.test:
+            test_scrape(test_urls=args.urls, dry_run=args.dry_run, engine=args.engine, delay=args.delay)
+        else:
+            if args.dry_run:
+                print("⚠️ Dry run only works with --test mode")
+            seen = None if args.no_seen_cache else load_seen_set('jobs', refresh=args.refresh_seen)
+            sitemap_state = SitemapState() if args.incremental else None
+            archive = PageArchive() if args.archive else None
+            if args.queue:
+                try:
+                    queue = open_work_queue(args.queue)
+                except (ValueError, RuntimeError) as e:
+                    parser.error(str(e))
+                run_queue_crawl(queue, engine=args.engine, workers=args.workers, delay=args.delay,
+                                seen=seen, archive=archive, seed=args.seed, worker_id=args.worker_id,
+                                sources=sources)
+            elif args.pipeline or stage_concurrency:
+                frontier = Frontier()
+                run_pipeline_crawl(engine=args.engine, concurrency=stage_concurrency, delay=args.delay,
+                                   seen=seen, sitemap_state=sitemap_state, archive=archive,
+                                   frontier=frontier, resume=args.resume, batch_writes=args.batch_writes,
+                                   sources=sources)
+            else:
+                frontier = Frontier()
+                main(engine=args.engine, workers=args.workers, delay=args.delay,
+                     seen=seen, sitemap_state=sitemap_state, archive=archive,
+                     frontier=frontier, resume=args.resume, batch_writes=args.batch_writes,
+                     sources=sources)
+    finally:
+        report_metrics(args.metrics_file)
@@ -0,0 +1,102 @@
+# Description: A persisted set of job IDs already stored in Firestore.
+# The set is loaded once per crawl with a single keys-only query and cached in a
+# local SQLite file, so existence checks are in-memory lookups instead of one
+# Firestore read per sitemap URL.
+
+import threading
+import time
+from backend.scraper.local_store import connect, state_path
+from backend.database.firebase_client import list_document_ids
+
+DEFAULT_MAX_AGE = 24 * 60 * 60  # Refresh the cached IDs from Firestore once a day
+
+class SeenSet:
+    """
+    Set of known job IDs backed by a SQLite file.
+
+    Args:
+        path (str or Path, optional): The SQLite file. Defaults to seen_jobs.sqlite3 in the state directory.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or state_path("seen_jobs.sqlite3")
+        self._lock = threading.Lock()
+        self._conn = connect(self.path)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS seen (job_id TEXT PRIMARY KEY)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self._ids = {row[0] for row in self._conn.execute("SELECT job_id FROM seen")}
+
+    def __contains__(self, job_id):
+        return job_id in self._ids
+
+    def __len__(self):
+        return len(self._ids)
+
+    @property
+    def refreshed_at(self):
+        """Unix time of the last full refresh from Firestore, or None if never refreshed."""
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'refreshed_at'").fetchone()
+        return float(row[0]) if row else None
+
+    def is_stale(self, max_age=DEFAULT_MAX_AGE):
+        """
+        Check whether the set should be refreshed from Firestore.
+        """
+        refreshed_at = self.refreshed_at
+        return refreshed_at is None or time.time() - refreshed_at > max_age
+
+    def add(self, job_id):
+        """
+        Record a job ID as stored.
+        """
+        with self._lock:
+            if job_id in self._ids:
+                return
+            self._ids.add(job_id)
+            self._conn.execute("INSERT OR IGNORE INTO seen (job_id) VALUES (?)", (job_id,))
+
+    def replace(self, job_ids):
+        """
+        Replace the whole set with a fresh list of IDs from Firestore.
+        """
+        job_ids = set(job_ids)
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.execute("DELETE FROM seen")
+                self._conn.executemany("INSERT INTO seen (job_id) VALUES (?)", ((job_id,) for job_id in job_ids))
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('refreshed_at', ?)", (str(time.time()),)
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._ids = job_ids
+
+    def close(self):
+        self._conn.close()
+
+def load_seen_set(collection_name='jobs', path=None, max_age=DEFAULT_MAX_AGE, refresh=False):
+    """
+    Load the known job IDs, refreshing the local cache from Firestore when it is stale.
+
+    Args:
+        collection_name (str, optional): The Firestore collection. Defaults to 'jobs'.
+        path (str or Path, optional): The SQLite file for the cache.
+        max_age (float, optional): Seconds before the cache is refreshed. Defaults to one day.
+        refresh (bool, optional): Always refresh from Firestore. Defaults to False.
+
+    Returns:
+        SeenSet: The loaded set.
+    """
+    seen = SeenSet(path)
+    if refresh or seen.is_stale(max_age):
+        print(f"🔑 Loading stored job IDs from '{collection_name}' (keys only)...")
+        job_ids = list_document_ids(collection_name)
+        if job_ids is not None:
+            seen.replace(job_ids)
+        else:
+            print(f"⚠️ Using {len(seen)} cached job IDs")
+    print(f"🔑 {len(seen)} known job IDs")
+    return seen
@@ -0,0 +1,337 @@
+# Description: Streaming, concurrent and incremental sitemap reading.
+# Nested sitemaps are fetched by a pool of threads and parsed with iterparse as they
+# download (gzipped sitemaps included), and listing URLs are yielded as soon as they are
+# found. For incremental crawls, each sitemap's ETag/Last-Modified headers and each
+# listing's <lastmod> are kept in a local SQLite file, so later runs send conditional
+# requests and only return listing URLs that are new or changed since the last crawl.
+
+import gzip
+import io
+import queue
+import threading
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from xml.etree import ElementTree
+from backend.scraper.local_store import connect, state_path
+from backend.scraper.metrics import metrics
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+def _local_name(tag):
+    return tag.split('}')[-1] if '}' in tag else tag
+
+def _child_text(element, name):
+    """Return the text of the first direct child with the given local name."""
+    for child in element:
+        if _local_name(child.tag) == name:
+            return (child.text or '').strip() or None
+    return None
+
+def is_listing_url(url):
+    """Check whether a sitemap URL points to a job listing."""
+    return '/listings/' in url
+
+class SitemapState:
+    """
+    Persisted validators for sitemaps and lastmod values for listing URLs.
+
+    Changes are buffered during a crawl and only written by commit(), so a crawl
+    that crashes is simply repeated. Listings that fail are discard()ed, which also
+    keeps the validators of the sitemaps that contain them from being saved; the
+    next run then fetches those sitemaps again and retries the listing.
+
+    Args:
+        path (str or Path, optional): The SQLite file. Defaults to sitemap_state.sqlite3 in the state directory.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or state_path("sitemap_state.sqlite3")
+        self._lock = threading.Lock()
+        self._conn = connect(self.path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sitemaps (url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, lastmod TEXT)"
+        )
+        self._conn.execute("CREATE TABLE IF NOT EXISTS listings (url TEXT PRIMARY KEY, lastmod TEXT)")
+        self._pending_sitemaps = {}   # url -> (etag, last_modified, lastmod, parent_url)
+        self._pending_listings = {}   # url -> (lastmod, sitemap_url)
+        self._dirty_sitemaps = set()
+
+    def sitemap_validators(self, url):
+        """
+        Return the stored (etag, last_modified, lastmod) of a sitemap, or Nones if unknown.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, lastmod FROM sitemaps WHERE url = ?", (url,)
+            ).fetchone()
+        return row if row else (None, None, None)
+
+    def listing_lastmod(self, url):
+        """
+        Return (known, lastmod) for a listing URL.
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT lastmod FROM listings WHERE url = ?", (url,)).fetchone()
+        return (True, row[0]) if row else (False, None)
+
+    def record_sitemap(self, url, etag, last_modified, lastmod=None, parent=None):
+        with self._lock:
+            self._pending_sitemaps[url] = (etag, last_modified, lastmod, parent)
+
+    def record_listing(self, url, lastmod, sitemap_url):
+        with self._lock:
+            self._pending_listings[url] = (lastmod, sitemap_url)
+
+    def discard(self, url):
+        """
+        Forget a listing that failed, so the next incremental run offers it again.
+        """
+        with self._lock:
+            pending = self._pending_listings.pop(url, None)
+            if pending is not None:
+                # Its sitemap (and every parent index) must be fetched again next time
+                self._mark_dirty(pending[1])
+
+    def mark_failed(self, sitemap_url, parent=None):
+        """
+        Record that a sitemap could not be read, so its parents are not marked as up to date.
+        """
+        with self._lock:
+            self._dirty_sitemaps.add(sitemap_url)
+            self._mark_dirty(parent)
+
+    def _mark_dirty(self, sitemap_url):
+        """Mark a sitemap and its ancestors dirty. Must be called with the lock held."""
+        while sitemap_url and sitemap_url not in self._dirty_sitemaps:
+            self._dirty_sitemaps.add(sitemap_url)
+            sitemap_url = self._pending_sitemaps.get(sitemap_url, (None, None, None, None))[3]
+
+    def commit(self):
+        """
+        Persist everything recorded during the crawl.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO sitemaps (url, etag, last_modified, lastmod) VALUES (?, ?, ?, ?)",
+                    [
+                        (url, etag, last_modified, lastmod)
+                        for url, (etag, last_modified, lastmod, _) in self._pending_sitemaps.items()
+                        if url not in self._dirty_sitemaps
+                    ],
+                )
+                # Old validators of dirty sitemaps would make the next run get a 304 and miss them
+                self._conn.executemany(
+                    "DELETE FROM sitemaps WHERE url = ?", [(url,) for url in self._dirty_sitemaps]
+                )
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO listings (url, lastmod) VALUES (?, ?)",
+                    [(url, lastmod) for url, (lastmod, _) in self._pending_listings.items()],
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._pending_sitemaps.clear()
+            self._pending_listings.clear()
+            self._dirty_sitemaps.clear()
+
+    def close(self):
+        self._conn.close()
+
+def fetch_sitemap_conditionally(url, state=None, session=None, timeout=10):
+    """
+    Start a streamed request for a sitemap, sending If-None-Match / If-Modified-Since
+    from the stored validators.
+
+    Args:
+        url (str): The sitemap URL.
+        state (SitemapState, optional): Stored validators. Without it the request is unconditional.
+        session (requests.Session, optional): Session used for the request.
+        timeout (int, optional): Request timeout in seconds. Defaults to 10.
+
+    Returns:
+        requests.Response or None: The response, or None if the sitemap is unchanged (304).
+    """
+    headers = {}
+    if state is not None:
+        etag, last_modified, _ = state.sitemap_validators(url)
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+
+    getter = session.get if session is not None else requests.get
+    with metrics.timer('sitemap_fetch'):
+        response = getter(url, headers=headers, timeout=timeout, stream=True)
+    if response.status_code == 304:
+        metrics.count('sitemap_not_modified')
+        response.close()
+        return None
+    response.raise_for_status()
+    return response
+
+def open_sitemap(response):
+    """
+    Return a file-like object over a streamed sitemap body.
+
+    Content-Encoding: gzip is undone while reading; gzipped sitemap files (.xml.gz)
+    are recognised by their magic bytes and decompressed on the fly.
+    """
+    response.raw.decode_content = True
+    stream = io.BufferedReader(response.raw)
+    if stream.peek(2)[:2] == GZIP_MAGIC:
+        return gzip.GzipFile(fileobj=stream)
+    return stream
+
+def iter_sitemap_entries(stream):
+    """
+    Parse a sitemap incrementally.
+
+    Every entry is cleared from the tree once it has been read, so memory use stays
+    flat however large the sitemap is.
+
+    Args:
+        stream (file-like): The sitemap XML.
+
+    Yields:
+        tuple: (kind, loc, lastmod), where kind is 'sitemap' for a nested sitemap and 'url' for a page.
+    """
+    root = None
+    for event, element in ElementTree.iterparse(stream, events=('start', 'end')):
+        if root is None:
+            root = element
+            continue
+        tag_name = _local_name(element.tag)
+        if event != 'end' or tag_name not in ('sitemap', 'url', 'item'):
+            continue
+        loc = _child_text(element, 'loc')
+        lastmod = _child_text(element, 'lastmod')
+        root.clear()
+        if loc:
+            yield ('sitemap' if tag_name == 'sitemap' else 'url'), loc, lastmod
+
+def stream_sitemap(url, session=None, state=None, max_workers=4, timeout=10, buffer_size=1000,
+                   is_listing=is_listing_url):
+    """
+    Yield listing URLs from a sitemap and all of its nested sitemaps.
+
+    Nested sitemaps are read concurrently by a pool of threads. URLs are handed over
+    through a bounded queue, so the caller can start on the first listing while other
+    sitemaps are still downloading, and a slow caller pauses the readers instead of
+    piling up URLs in memory.
+
+    With a state the read is incremental: nested sitemaps whose <lastmod> in the index
+    is unchanged are not requested, the others are requested conditionally and skipped
+    on 304 Not Modified, and only new or changed listings are yielded.
+
+    Args:
+        url (str): The sitemap (or sitemap index) URL.
+        session (requests.Session, optional): Session used for requests.
+        state (SitemapState, optional): Stored validators and listing lastmods.
+        max_workers (int, optional): Sitemaps fetched at the same time. Defaults to 4.
+        timeout (int, optional): Request timeout in seconds. Defaults to 10.
+        buffer_size (int, optional): URLs buffered ahead of the caller. Defaults to 1000.
+        is_listing (callable, optional): Selects the listing URLs among the sitemap's URLs.
+                                         Defaults to is_listing_url.
+
+    Yields:
+        str: Listing URLs, in no particular order across sitemaps.
+    """
+    done = object()
+    results = queue.Queue(maxsize=buffer_size)
+    stopped = threading.Event()
+    pending_lock = threading.Lock()
+    pending = [0]
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def put(item):
+        while not stopped.is_set():
+            try:
+                results.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def submit(sitemap_url, lastmod, parent):
+        with pending_lock:
+            pending[0] += 1
+        try:
+            executor.submit(read, sitemap_url, lastmod, parent)
+        except RuntimeError:
+            # The caller stopped reading and the pool is shut down
+            with pending_lock:
+                pending[0] -= 1
+
+    def read(sitemap_url, lastmod, parent):
+        try:
+            read_sitemap(sitemap_url, lastmod, parent)
+        finally:
+            with pending_lock:
+                pending[0] -= 1
+                finished = pending[0] == 0
+            if finished:
+                put(done)
+
+    def read_sitemap(sitemap_url, lastmod, parent):
+        if stopped.is_set():
+            return
+        try:
+            if state is not None:
+                _, _, stored_lastmod = state.sitemap_validators(sitemap_url)
+                if lastmod and stored_lastmod == lastmod:
+                    return
+
+            response = fetch_sitemap_conditionally(sitemap_url, state, session, timeout)
+            if response is None:
+                return
+            if state is not None:
+                # Recorded before the children are read so failures can find their parents
+                state.record_sitemap(sitemap_url, response.headers.get('ETag'),
+                                     response.headers.get('Last-Modified'), lastmod, parent)
+
+            try:
+                for kind, loc, entry_lastmod in iter_sitemap_entries(open_sitemap(response)):
+                    if stopped.is_set():
+                        return
+                    if kind == 'sitemap':
+                        submit(loc, entry_lastmod, sitemap_url)
+                    elif is_listing(loc):
+                        if state is not None:
+                            known, stored = state.listing_lastmod(loc)
+                            if known and not (entry_lastmod and entry_lastmod != stored):
+                                continue
+                            state.record_listing(loc, entry_lastmod, sitemap_url)
+                        put(loc)
+            finally:
+                response.close()
+        except Exception as e:
+            print(f"Error parsing sitemap {sitemap_url}: {e}")
+            if state is not None:
+                state.mark_failed(sitemap_url, parent)
+
+    submit(url, None, None)
+    try:
+        while True:
+            item = results.get()
+            if item is done:
+                return
+            yield item
+    finally:
+        stopped.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def parse_sitemap_incremental(url, state, session=None):
+    """
+    Return the listing URLs that are new or changed since the last committed crawl.
+
+    Args:
+        url (str): The sitemap (or sitemap index) URL.
+        state (SitemapState): Stored validators and listing lastmods.
+        session (requests.Session, optional): Session used for requests.
+
+    Returns:
+        list: New or changed listing URLs.
+    """
+    return list(stream_sitemap(url, session, state))
@@ -0,0 +1,306 @@
+# Description: Job sources (one adapter per job board) and their crawl budgets.
+# An adapter knows how to discover a board's listings, extract a listing page and
+# derive a job ID. Crawls run every selected source under one politeness scheduler;
+# each source has its own concurrency and request-rate budget, so a slow board only
+# holds its own share of the workers and the others keep going.
+
+import threading
+from collections import deque
+from itertools import cycle
+from urllib.parse import urlparse
+from backend.scraper.sitemap import is_listing_url, stream_sitemap
+from backend.scraper.static_extractor import fetch_listing_html
+
+DEFAULT_LOOKAHEAD = 100  # URLs of busy sources held back while other sources' URLs pass
+
+class JobSource:
+    """
+    A job board the scraper can crawl.
+
+    Subclasses set the class attributes and implement extract(); boards whose pages
+    can be parsed without a browser also implement parse_html(). Register them with
+    @register_source.
+
+    Attributes:
+        key (str): Short name used on the command line, e.g. 'wwr'.
+        name (str): Stored in every job's 'source' field, e.g. 'WeWorkRemotely'.
+        hosts (tuple): Hostnames whose URLs belong to the source.
+        sitemap_url (str): The sitemap (or sitemap index) listing the board's jobs.
+        job_url_template (str): Listing URL with a {slug} placeholder.
+        id_prefix (str): Prepended to the slug to form the job ID, so IDs of different
+                         boards cannot collide. The first source keeps bare slugs.
+        concurrency (int): Listings of this source in flight at once. None (the default)
+                           allows as many as the crawl's workers or stages can hold.
+        delay (float): Seconds between requests to the source's hosts when robots.txt sets
+                       no Crawl-delay. None uses the crawl's delay.
+    """
+
+    key = None
+    name = None
+    hosts = ()
+    sitemap_url = None
+    job_url_template = None
+    id_prefix = ''
+    concurrency = None
+    delay = None
+
+    def owns(self, url):
+        """Check whether a URL belongs to this source."""
+        return urlparse(url).netloc in self.hosts
+
+    def is_listing(self, url):
+        """Check whether a sitemap URL points to a job listing."""
+        return is_listing_url(url)
+
+    def job_id(self, url):
+        """Derive the job ID of a listing URL."""
+        return self.id_prefix + urlparse(url).path.rstrip('/').split('/')[-1]
+
+    def job_url(self, job_id):
+        """Return the listing URL of a job ID created by job_id()."""
+        return self.job_url_template.format(slug=job_id[len(self.id_prefix):])
+
+    def discover(self, sitemap_state=None, session=None, lazy=False):
+        """
+        Find the source's listing URLs.
+
+        Args:
+            sitemap_state (SitemapState, optional): Stored sitemap validators. When given, only
+                                                    new or changed listings are returned.
+            session (requests.Session, optional): Session used for sitemap requests.
+            lazy (bool, optional): Return a generator that yields URLs while the sitemaps are
+                                   still downloading. Defaults to False.
+
+        Returns:
+            list or generator: The listing URLs.
+        """
+        urls = stream_sitemap(self.sitemap_url, session, sitemap_state, is_listing=self.is_listing)
+        if lazy:
+            return urls
+        try:
+            job_urls = list(urls)
+        except Exception as e:
+            print(f"Error parsing sitemap: {e}")
+            job_urls = []
+        print(f"📋 {self.name}: found {len(job_urls)} job URLs")
+        return job_urls
+
+    def extract(self, url, driver):
+        """
+        Render a listing in the browser and extract its job data.
+
+        Returns:
+            dict or None: The job data, or None if extraction failed.
+
+        Raises:
+            TransientError: If the page failed to load in a way worth retrying.
+        """
+        raise NotImplementedError
+
+    def parse_html(self, html, url):
+        """
+        Parse a listing's HTML without a browser.
+
+        Returns:
+            dict or None: The job data, or None to fall back to extract().
+        """
+        return None
+
+    def extract_static(self, url, session, archive=None):
+        """
+        Fetch and parse a listing over plain HTTP.
+
+        Returns:
+            dict or None: The job data, or None if the page has to be rendered instead.
+
+        Raises:
+            TransientError: If the fetch failed in a way worth retrying.
+        """
+        html = fetch_listing_html(url, session)
+        if html is None:
+            return None
+        if archive is not None:
+            archive.store(url, html)
+        try:
+            return self.parse_html(html, url)
+        except Exception as e:
+            print(f"⚠️ Static parse failed for {url}: {e}")
+            return None
+
+# Registered sources by key, in registration order; the first one is the default
+_sources = {}
+
+def register_source(cls):
+    """Class decorator adding a JobSource subclass to the registry."""
+    _sources[cls.key] = cls()
+    return cls
+
+def registered_sources():
+    """Return every registered source, the default one first."""
+    return list(_sources.values())
+
+def get_source(key):
+    """
+    Return the registered source with the given key.
+
+    Raises:
+        ValueError: If no source has that key.
+    """
+    try:
+        return _sources[key]
+    except KeyError:
+        raise ValueError(f"Unknown source '{key}', expected one of {', '.join(_sources)}")
+
+def source_for(url):
+    """
+    Return the source a URL belongs to, or the default source for unknown hosts.
+
+    Before any source is registered, a bare JobSource is returned, which keeps slugs as job IDs.
+    """
+    sources = registered_sources()
+    for source in sources:
+        if source.owns(url):
+            return source
+    return sources[0] if sources else JobSource()
+
+def source_for_job_id(job_id):
+    """Return the source whose id_prefix a job ID carries, or the default source for bare IDs."""
+    sources = registered_sources()
+    prefixed = [source for source in sources if source.id_prefix and job_id.startswith(source.id_prefix)]
+    if prefixed:
+        return max(prefixed, key=lambda source: len(source.id_prefix))
+    return sources[0]
+
+def parse_source_budgets(values):
+    """
+    Parse per-source budgets given as KEY=CONCURRENCY[:DELAY] strings.
+
+    Args:
+        values (list): Settings such as ["wwr=2", "wwr=4:0.5"]. May be None.
+
+    Returns:
+        dict: Mapping of source key to (concurrency, delay or None).
+
+    Raises:
+        ValueError: If a setting is malformed or names an unknown source.
+    """
+    budgets = {}
+    for value in values or []:
+        key, sep, budget = value.partition('=')
+        if not sep or key not in _sources:
+            raise ValueError(f"Invalid source budget '{value}', expected one of {', '.join(_sources)} as KEY=N[:DELAY]")
+        concurrency, _, delay = budget.partition(':')
+        try:
+            budgets[key] = (int(concurrency), float(delay) if delay else None)
+        except ValueError:
+            raise ValueError(f"Invalid source budget '{value}', N must be an integer and DELAY a number of seconds")
+        if budgets[key][0] < 1:
+            raise ValueError(f"Invalid source budget '{value}', N must be at least 1")
+    return budgets
+
+def select_sources(keys=None, budgets=None):
+    """
+    Choose the sources of a crawl and apply budget overrides to them.
+
+    Args:
+        keys (list, optional): Source keys. Defaults to every registered source.
+        budgets (dict, optional): Overrides from parse_source_budgets.
+
+    Returns:
+        list: The JobSource objects.
+    """
+    sources = [get_source(key) for key in keys] if keys else registered_sources()
+    for key, (concurrency, delay) in (budgets or {}).items():
+        source = get_source(key)
+        source.concurrency = concurrency
+        if delay is not None:
+            source.delay = delay
+    return sources
+
+def interleave(streams):
+    """Yield from several iterables in turn, so every source's URLs are spread through the crawl."""
+    iterators = deque(iter(stream) for stream in streams)
+    while iterators:
+        iterator = iterators.popleft()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            continue
+        iterators.append(iterator)
+        yield item
+
+class SourceBudgets:
+    """
+    Limit how many items of each source are in flight at once.
+
+    dispatch() hands items out only while their source is under its concurrency,
+    and release() is called when an item is finished. Items of a source at its limit
+    are held back (up to lookahead of them) while items of other sources pass, so a
+    slow or rate-limited board never ties up the workers the others could use.
+
+    Args:
+        sources (list): The crawl's JobSource objects.
+        source_of (callable, optional): Maps an item to its source. Defaults to source_for (URLs).
+        lookahead (int, optional): Items held back at most. Defaults to 100.
+        default_limit (int, optional): The limit of sources without a budget, normally the
+                                       crawl's worker count. Defaults to no limit.
+    """
+
+    def __init__(self, sources, source_of=source_for, lookahead=DEFAULT_LOOKAHEAD, default_limit=None):
+        # A source without a budget may use all of the crawl's concurrency
+        self.limits = {source.key: source.concurrency or default_limit or float('inf') for source in sources}
+        self.in_flight = dict.fromkeys(self.limits, 0)
+        self.source_of = source_of
+        self.lookahead = lookahead
+        self._condition = threading.Condition()
+
+    def _key(self, item):
+        key = self.source_of(item).key
+        # Items of a source outside the crawl (e.g. an unknown host) share the first budget
+        return key if key in self.limits else next(iter(self.limits))
+
+    def dispatch(self, items):
+        """
+        Yield the items, each once its source has a free slot.
+
+        Every yielded item must be passed to release() when it is finished.
+        """
+        held = {key: deque() for key in self.limits}
+        order = cycle(list(self.limits))
+        iterator = iter(items)
+        exhausted = False
+        waiting = 0
+        while True:
+            item = None
+            with self._condition:
+                # Take a held item of the next source with room, rotating for fairness
+                for _ in range(len(held)):
+                    key = next(order)
+                    if held[key] and self.in_flight[key] < self.limits[key]:
+                        item = held[key].popleft()
+                        self.in_flight[key] += 1
+                        waiting -= 1
+                        break
+                if item is None and (exhausted or waiting >= self.lookahead):
+                    if not waiting:
+                        return
+                    # Woken by release(); the timeout keeps Ctrl-C responsive
+                    self._condition.wait(0.5)
+                    continue
+            if item is not None:
+                yield item
+                continue
+            try:
+                item = next(iterator)
+            except StopIteration:
+                exhausted = True
+                continue
+            held[self._key(item)].append(item)
+            waiting += 1
+
+    def release(self, item):
+        """Free the slot taken by a dispatched item."""
+        key = self._key(item)
+        with self._condition:
+            self.in_flight[key] = max(0, self.in_flight[key] - 1)
+            self._condition.notify_all()
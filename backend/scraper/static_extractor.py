@@ -0,0 +1,317 @@
+# Description: Browserless extraction of job listings using plain HTTP requests and BeautifulSoup.
+# Most of what extract_job_data reads through Selenium (the JSON-LD JobPosting, the
+# .lis-container__* sidebar boxes and #job-cta-alt) is already in the server-rendered HTML.
+
+import json
+import re
+import requests
+from urllib.parse import urlparse
+from bs4 import BeautifulSoup, NavigableString
+from requests.adapters import HTTPAdapter
+from firebase_admin import firestore
+from backend.scraper.metrics import metrics
+from backend.scraper.resilience import RETRYABLE_STATUSES, TransientError
+
+SIDEBAR_ITEM_CLASS = 'lis-container__job__sidebar__job-about__list__item'
+
+# The crawler's name, matched against the User-agent lines of robots.txt
+BOT_NAME = 'RemoteJobBankBot'
+
+DEFAULT_HEADERS = {
+    'User-Agent': f'Mozilla/5.0 (compatible; {BOT_NAME}/1.0; +https://github.com/cathyfu1215/remoteJobBank)',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+}
+
+def create_session(pool_size=10):
+    """
+    Create a requests.Session with a pooled HTTP adapter.
+
+    Args:
+        pool_size (int, optional): Number of keep-alive connections to keep per host. Defaults to 10.
+
+    Returns:
+        requests.Session: A session that reuses connections across listing fetches.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update(DEFAULT_HEADERS)
+    return session
+
+@metrics.timed('static_fetch')
+def fetch_listing_html(url, session, timeout=15):
+    """
+    Fetch the server-rendered HTML of a job listing.
+
+    Args:
+        url (str): The URL of the job listing.
+        session (requests.Session): The session used to fetch the page.
+        timeout (int, optional): Request timeout in seconds. Defaults to 15.
+
+    Returns:
+        str or None: The page HTML, or None if the request failed.
+
+    Raises:
+        TransientError: On timeouts, connection errors and 429/5xx responses, which are worth retrying.
+    """
+    try:
+        response = session.get(url, timeout=timeout)
+    except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+        raise TransientError(f"Error fetching {url}: {e}") from e
+    except requests.exceptions.RequestException as e:
+        print(f"⚠️ Error fetching {url}: {e}")
+        return None
+    if response.status_code in RETRYABLE_STATUSES:
+        raise TransientError(f"HTTP {response.status_code} fetching {url}")
+    if response.status_code != 200:
+        print(f"⚠️ HTTP {response.status_code} fetching {url}")
+        return None
+    return response.text
+
+def get_soup_text(element):
+    """
+    Return the stripped text of a BeautifulSoup element, or an empty string for None.
+    """
+    if element is None:
+        return ""
+    return element.get_text("\n", strip=True)
+
+def find_json_in_scripts(ld_json_texts, script_texts):
+    """
+    Find structured job data in the text of page scripts.
+
+    Args:
+        ld_json_texts (list): Contents of the application/ld+json scripts.
+        script_texts (list): Contents of the other scripts.
+
+    Returns:
+        dict or None: The JobPosting JSON-LD or window.jobData object if found, None otherwise.
+    """
+    for text in ld_json_texts:
+        try:
+            json_content = json.loads(text or '')
+            if isinstance(json_content, dict) and json_content.get('@type') == 'JobPosting':
+                return json_content
+        except json.JSONDecodeError:
+            continue
+
+    for text in script_texts:
+        match = re.search(r'window\.jobData\s*=\s*({.*?});', text or '', re.DOTALL)
+        if match:
+            try:
+                return json.loads(match.group(1))
+            except json.JSONDecodeError:
+                continue
+
+    return None
+
+def find_json_data(soup):
+    """
+    Find structured job data in the page scripts, mirroring check_for_json_data.
+
+    Args:
+        soup (BeautifulSoup): The parsed listing page.
+
+    Returns:
+        dict or None: The JobPosting JSON-LD or window.jobData object if found, None otherwise.
+    """
+    return find_json_in_scripts(
+        [script.string for script in soup.find_all('script', attrs={'type': 'application/ld+json'})],
+        [script.string for script in soup.find_all('script')],
+    )
+
+def _has_direct_text(element, label):
+    """Check whether one of the element's own text nodes contains the label."""
+    return any(
+        isinstance(child, NavigableString) and label in child
+        for child in element.children
+    )
+
+def find_sidebar_item(soup, label, sidebar_only=True):
+    """
+    Find the first list item whose own text contains the label (e.g. "Region").
+
+    Args:
+        soup (BeautifulSoup): The parsed listing page.
+        label (str): The label text to look for.
+        sidebar_only (bool, optional): Only consider sidebar "job about" items. Defaults to True.
+
+    Returns:
+        Tag or None: The matching <li> element, or None if not found.
+    """
+    items = soup.find_all('li', class_=SIDEBAR_ITEM_CLASS) if sidebar_only else soup.find_all('li')
+    for item in items:
+        if _has_direct_text(item, label):
+            return item
+    return None
+
+def get_box_texts(element, box_class):
+    """Return the text of every box with the given class inside an element."""
+    if element is None:
+        return []
+    return [get_soup_text(box) for box in element.select(f'.{box_class}')]
+
+def extract_labelled_boxes(soup, label, box_class='box--blue'):
+    """
+    Extract the box texts of a labelled sidebar item, with the same fallback as the Selenium extractors.
+
+    Args:
+        soup (BeautifulSoup): The parsed listing page.
+        label (str): The sidebar label, e.g. "Skills" or "Timezones".
+        box_class (str, optional): CSS class of the value boxes. Defaults to 'box--blue'.
+
+    Returns:
+        list: A list of box texts as strings.
+    """
+    values = get_box_texts(find_sidebar_item(soup, label), box_class)
+    if not values:
+        values = [
+            get_soup_text(span)
+            for span in _iter_labelled_spans(soup, label, box_class)
+        ]
+    return values
+
+def _iter_labelled_spans(soup, label, box_class):
+    """Yield box spans of every list item mentioning the label (fallback lookup)."""
+    for item in soup.find_all('li'):
+        if _has_direct_text(item, label):
+            yield from item.find_all('span', class_=box_class)
+
+def extract_region_from_soup(soup):
+    """
+    Extract region information, mirroring extract_region.
+
+    Returns:
+        list: A list of region names as strings.
+    """
+    regions = get_box_texts(find_sidebar_item(soup, 'Region'), 'box--region')
+    if not regions:
+        regions = get_box_texts(soup, 'box--region')
+    return regions
+
+def extract_salary_from_soup(soup):
+    """
+    Extract the salary range, mirroring extract_salary.
+
+    Returns:
+        str: The salary range, or empty string if not found.
+    """
+    salaries = extract_labelled_boxes(soup, 'Salary')
+    return salaries[0] if salaries else ""
+
+def extract_apply_url_from_soup(soup, url):
+    """
+    Extract the apply URL from the #job-cta-alt button, falling back to the listing URL.
+    """
+    apply_button = soup.select_one('.listing-apply-cta__btn #job-cta-alt') or soup.find(id='job-cta-alt')
+    if apply_button is not None and apply_button.get('href'):
+        return apply_button['href']
+    return url
+
+def is_listing_page(soup):
+    """
+    Check that the page contains a rendered listing, equivalent to the readiness waits in extract_job_data.
+    """
+    return soup.find(class_='listing-header-container') is not None or soup.select_one('.lis-container') is not None
+
+@metrics.timed('static_parse')
+def parse_job_html(html, url):
+    """
+    Parse a listing page into the same dictionary extract_job_data returns.
+
+    Args:
+        html (str): The listing page HTML.
+        url (str): The URL of the job listing.
+
+    Returns:
+        dict or None: The job data, or None if the page could not be parsed statically.
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    if not is_listing_page(soup):
+        return None
+
+    parsed_url = urlparse(url)
+    job_id = parsed_url.path.split('/')[-1]
+    json_data = find_json_data(soup)
+
+    if json_data and isinstance(json_data, dict):
+        # Same shape as process_json_job_data
+        hiring_organization = json_data.get('hiringOrganization')
+        job_data = {
+            'job_id': job_id,
+            'title': json_data.get('title', ''),
+            'company': hiring_organization.get('name', '') if isinstance(hiring_organization, dict) else '',
+            'company_about': get_soup_text(soup.select_one('.lis-container__header__hero__company-info__description')),
+            'apply_url': extract_apply_url_from_soup(soup, url),
+            'apply_before': json_data.get('validThrough', 'Not specified'),
+            'job_description': json_data.get('description', ''),
+            'category': json_data.get('occupationalCategory', 'All Other Remote Jobs'),
+            'region': extract_region_from_soup(soup),
+            'salary_range': extract_salary_from_soup(soup),
+            'countries': extract_labelled_boxes(soup, 'Country'),
+            'skills': extract_labelled_boxes(soup, 'Skills'),
+            'timezones': extract_labelled_boxes(soup, 'Timezones'),
+            'url': url,
+            'source': 'WeWorkRemotely',
+            'timestamp': firestore.SERVER_TIMESTAMP
+        }
+    else:
+        # Same shape as the direct extraction path of extract_job_data
+        category = "All Other Remote Jobs"
+        url_parts = parsed_url.path.split('/')
+        if len(url_parts) > 2 and url_parts[1] == 'categories':
+            raw_category = '-'.join(url_parts[2].split('-')[1:])
+            category = raw_category.title().replace('And', 'and')
+
+        job_data = {
+            'job_id': job_id,
+            'title': get_soup_text(soup.select_one('.lis-container__header__hero__company-info__title')),
+            'company': get_soup_text(soup.select_one('.lis-container__job__sidebar__companyDetails__info__title h3')),
+            'company_about': get_soup_text(soup.select_one('.lis-container__header__hero__company-info__description')),
+            'job_description': get_soup_text(soup.select_one('.lis-container__job__content__description')),
+            'category': get_soup_text(soup.select_one('.lis-container__header__navigation__tab--category')) or category,
+            'region': extract_region_from_soup(soup),
+            'salary_range': extract_salary_from_soup(soup),
+            'countries': extract_labelled_boxes(soup, 'Country'),
+            'skills': extract_labelled_boxes(soup, 'Skills'),
+            'timezones': extract_labelled_boxes(soup, 'Timezones'),
+            'url': url,
+            'source': 'WeWorkRemotely',
+            'timestamp': firestore.SERVER_TIMESTAMP,
+            'apply_url': extract_apply_url_from_soup(soup, url),
+            'apply_before': get_soup_text(soup.select_one(f'.{SIDEBAR_ITEM_CLASS} span')) or 'Not specified'
+        }
+
+    # Without a title the static HTML is not usable; let the caller fall back to Selenium
+    if not job_data['title']:
+        return None
+
+    return job_data
+
+def extract_job_data_static(url, session, archive=None):
+    """
+    Fetch and parse a job listing without a browser.
+
+    Args:
+        url (str): The URL of the job listing to scrape.
+        session (requests.Session): A pooled session from create_session().
+        archive (PageArchive, optional): Stores the fetched HTML for later re-extraction.
+
+    Returns:
+        dict or None: The extracted job data, or None if the static fetch or parse failed.
+
+    Raises:
+        TransientError: If the fetch failed in a way worth retrying.
+    """
+    html = fetch_listing_html(url, session)
+    if html is None:
+        return None
+    if archive is not None:
+        archive.store(url, html)
+    try:
+        return parse_job_html(html, url)
+    except Exception as e:
+        print(f"⚠️ Static parse failed for {url}: {e}")
+        return None
@@ -0,0 +1,402 @@
+# Description: A shared work queue for crawling with several processes or machines.
+# Workers take time-limited leases on URLs and renew them with heartbeats; a lease
+# that is not renewed (the worker died) expires and its URL is queued again.
+# The queue lives in a SQLite file for workers on one host, or in a Redis-compatible
+# server (redis://...) for a fleet.
+
+import os
+import socket
+import threading
+import time
+import uuid
+from backend.scraper.local_store import connect, state_path
+from backend.scraper.worker_pool import FAILED
+
+try:
+    import redis
+except ImportError:  # Optional: only needed for redis:// queues
+    redis = None
+
+PENDING = 'pending'
+LEASED = 'leased'
+DONE = 'done'
+FAILED_STATE = 'failed'
+
+LEASE_TTL = 120.0  # Seconds a lease lasts without a heartbeat
+MAX_ATTEMPTS = 3   # Leases per URL before a URL that keeps failing or losing its worker is given up
+
+def default_worker_id():
+    """Return an ID that is unique per process, e.g. 'scraper-host-1234-ab12cd'."""
+    return f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+class SQLiteWorkQueue:
+    """
+    Work queue in a SQLite file, shared by worker processes on one host.
+
+    Args:
+        path (str or Path, optional): The SQLite file. Defaults to work_queue.sqlite3 in the state directory.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or state_path("work_queue.sqlite3")
+        self._lock = threading.Lock()
+        self._conn = connect(self.path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS queue (url TEXT PRIMARY KEY, seq INTEGER, state TEXT, "
+            "worker TEXT, lease_expires REAL, attempts INTEGER DEFAULT 0, last_error TEXT)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS queue_state ON queue (state, seq)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+    def _write(self, fn):
+        """Run fn(conn) in one write transaction and return its result."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = fn(self._conn)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            return result
+
+    def reset(self):
+        """Remove every item, to start a new crawl."""
+        def reset(conn):
+            conn.execute("DELETE FROM queue")
+            conn.execute("DELETE FROM meta")
+        self._write(reset)
+
+    def add(self, urls):
+        """Queue URLs. URLs that are already in the queue keep their state."""
+        def add(conn):
+            seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM queue").fetchone()[0]
+            for url in urls:
+                seq += 1
+                conn.execute("INSERT OR IGNORE INTO queue (url, seq, state) VALUES (?, ?, ?)", (url, seq, PENDING))
+        self._write(add)
+
+    def seal(self):
+        """Record that every URL of the crawl has been queued."""
+        self._write(lambda conn: conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('sealed', '1')"))
+
+    @property
+    def sealed(self):
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM meta WHERE key = 'sealed'").fetchone() is not None
+
+    def requeue_expired(self):
+        """
+        Queue the URLs whose lease expired again.
+
+        Returns:
+            int: The number of expired leases.
+        """
+        now = time.time()
+        def requeue(conn):
+            conn.execute(
+                "UPDATE queue SET state = ?, last_error = 'lease expired' "
+                "WHERE state = ? AND lease_expires < ? AND attempts >= ?",
+                (FAILED_STATE, LEASED, now, MAX_ATTEMPTS),
+            )
+            return conn.execute(
+                "UPDATE queue SET state = ?, worker = NULL WHERE state = ? AND lease_expires < ?",
+                (PENDING, LEASED, now),
+            ).rowcount
+        return self._write(requeue)
+
+    def lease(self, worker_id, ttl=LEASE_TTL):
+        """
+        Lease the next pending URL.
+
+        Returns:
+            str or None: The leased URL, or None if nothing is pending.
+        """
+        def lease(conn):
+            row = conn.execute(
+                "SELECT url FROM queue WHERE state = ? ORDER BY seq LIMIT 1", (PENDING,)
+            ).fetchone()
+            if row:
+                conn.execute(
+                    "UPDATE queue SET state = ?, worker = ?, lease_expires = ?, attempts = attempts + 1 WHERE url = ?",
+                    (LEASED, worker_id, time.time() + ttl, row[0]),
+                )
+            return row[0] if row else None
+        return self._write(lease)
+
+    def heartbeat(self, worker_id, urls, ttl=LEASE_TTL):
+        """
+        Extend the leases a worker holds.
+
+        Returns:
+            set: The URLs whose lease was extended. Leases that already expired are lost.
+        """
+        expires = time.time() + ttl
+        def renew(conn):
+            renewed = set()
+            for url in urls:
+                updated = conn.execute(
+                    "UPDATE queue SET lease_expires = ? WHERE url = ? AND state = ? AND worker = ?",
+                    (expires, url, LEASED, worker_id),
+                ).rowcount
+                if updated:
+                    renewed.add(url)
+            return renewed
+        return self._write(renew)
+
+    def complete(self, worker_id, url, status, error=None):
+        """
+        Record the outcome of a leased URL. Failed URLs are queued again while they have attempts left.
+
+        Returns:
+            bool: False if the lease was lost (expired and taken over) before completion.
+        """
+        def complete(conn):
+            row = conn.execute(
+                "SELECT attempts FROM queue WHERE url = ? AND state = ? AND worker = ?", (url, LEASED, worker_id)
+            ).fetchone()
+            if row is None:
+                return False
+            if status != FAILED:
+                state = DONE
+            else:
+                state = FAILED_STATE if row[0] >= MAX_ATTEMPTS else PENDING
+            conn.execute(
+                "UPDATE queue SET state = ?, worker = NULL, last_error = ? WHERE url = ?", (state, error, url)
+            )
+            return True
+        return self._write(complete)
+
+    def counts(self):
+        """Return the number of URLs in each state."""
+        with self._lock:
+            rows = self._conn.execute("SELECT state, COUNT(*) FROM queue GROUP BY state").fetchall()
+        return {state: 0 for state in (PENDING, LEASED, DONE, FAILED_STATE)} | dict(rows)
+
+    def close(self):
+        self._conn.close()
+
+class RedisWorkQueue:
+    """
+    Work queue in a Redis-compatible server, shared by workers on any number of machines.
+
+    Uses the reliable-queue pattern: a URL is moved atomically from the pending list to
+    the leased list, and a lease key with a TTL marks it as owned. A URL in the leased
+    list without a lease key belongs to a dead worker and is queued again. (A URL that
+    was just moved but whose lease key is not set yet can be requeued as well; saves
+    are idempotent, so processing it twice stores it once.)
+
+    Args:
+        client (redis.Redis): A client created with decode_responses=True.
+        name (str, optional): Prefix of the queue's keys. Defaults to 'crawl'.
+    """
+
+    def __init__(self, client, name='crawl'):
+        self.client = client
+        self.name = name
+
+    def _key(self, *parts):
+        return ":".join((self.name,) + parts)
+
+    def reset(self):
+        """Remove every item, to start a new crawl."""
+        for url in self.client.lrange(self._key('leased'), 0, -1):
+            self.client.delete(self._key('lease', url))
+        self.client.delete(self._key('pending'), self._key('leased'), self._key('urls'),
+                           self._key('attempts'), self._key('states'), self._key('sealed'))
+
+    def add(self, urls):
+        """Queue URLs. URLs that are already in the queue keep their state."""
+        for url in urls:
+            if self.client.sadd(self._key('urls'), url):
+                self.client.rpush(self._key('pending'), url)
+
+    def seal(self):
+        """Record that every URL of the crawl has been queued."""
+        self.client.set(self._key('sealed'), '1')
+
+    @property
+    def sealed(self):
+        return self.client.get(self._key('sealed')) is not None
+
+    def requeue_expired(self):
+        """
+        Queue the URLs whose lease expired again.
+
+        Returns:
+            int: The number of expired leases.
+        """
+        expired = 0
+        for url in self.client.lrange(self._key('leased'), 0, -1):
+            if self.client.get(self._key('lease', url)) is not None:
+                continue
+            # Only the worker that removes the URL from the leased list requeues it
+            if not self.client.lrem(self._key('leased'), 1, url):
+                continue
+            expired += 1
+            if int(self.client.hget(self._key('attempts'), url) or 0) >= MAX_ATTEMPTS:
+                self.client.hset(self._key('states'), url, FAILED_STATE)
+            else:
+                self.client.lpush(self._key('pending'), url)
+        return expired
+
+    def lease(self, worker_id, ttl=LEASE_TTL):
+        """
+        Lease the next pending URL.
+
+        Returns:
+            str or None: The leased URL, or None if nothing is pending.
+        """
+        url = self.client.rpoplpush(self._key('pending'), self._key('leased'))
+        if url is None:
+            return None
+        self.client.set(self._key('lease', url), worker_id, px=int(ttl * 1000))
+        self.client.hincrby(self._key('attempts'), url, 1)
+        return url
+
+    def heartbeat(self, worker_id, urls, ttl=LEASE_TTL):
+        """
+        Extend the leases a worker holds.
+
+        Returns:
+            set: The URLs whose lease was extended. Leases that already expired are lost.
+        """
+        renewed = set()
+        for url in urls:
+            key = self._key('lease', url)
+            if self.client.get(key) == worker_id and self.client.pexpire(key, int(ttl * 1000)):
+                renewed.add(url)
+        return renewed
+
+    def complete(self, worker_id, url, status, error=None):
+        """
+        Record the outcome of a leased URL. Failed URLs are queued again while they have attempts left.
+
+        Returns:
+            bool: False if the lease was lost (expired and taken over) before completion.
+        """
+        key = self._key('lease', url)
+        if self.client.get(key) != worker_id or not self.client.lrem(self._key('leased'), 1, url):
+            return False
+        self.client.delete(key)
+        if status == FAILED and int(self.client.hget(self._key('attempts'), url) or 0) < MAX_ATTEMPTS:
+            self.client.rpush(self._key('pending'), url)
+        else:
+            self.client.hset(self._key('states'), url, FAILED_STATE if status == FAILED else DONE)
+        return True
+
+    def counts(self):
+        """Return the number of URLs in each state."""
+        states = list(self.client.hgetall(self._key('states')).values())
+        return {
+            PENDING: self.client.llen(self._key('pending')),
+            LEASED: self.client.llen(self._key('leased')),
+            DONE: states.count(DONE),
+            FAILED_STATE: states.count(FAILED_STATE),
+        }
+
+    def close(self):
+        self.client.close()
+
+def open_work_queue(location, name='crawl'):
+    """
+    Open a work queue from a location string.
+
+    Args:
+        location (str): 'sqlite' for the default file in the state directory,
+                        'sqlite:///path/to/queue.sqlite3', or 'redis://host:port/db'.
+        name (str, optional): Key prefix for Redis queues. Defaults to 'crawl'.
+
+    Returns:
+        SQLiteWorkQueue or RedisWorkQueue: The queue.
+    """
+    if location == 'sqlite':
+        return SQLiteWorkQueue()
+    if location.startswith('sqlite:///'):
+        return SQLiteWorkQueue(location[len('sqlite:///'):])
+    if location.startswith(('redis://', 'rediss://')):
+        if redis is None:
+            raise RuntimeError("Install the redis package to use a redis:// work queue")
+        return RedisWorkQueue(redis.Redis.from_url(location, decode_responses=True), name)
+    raise ValueError(f"Unknown work queue location: {location}")
+
+class LeaseKeeper:
+    """
+    Tracks the leases a worker process holds and renews them from a heartbeat thread.
+
+    Args:
+        queue (SQLiteWorkQueue or RedisWorkQueue): The work queue.
+        worker_id (str): The ID the leases are held under.
+        ttl (float, optional): Lease duration in seconds. Heartbeats are sent every ttl / 3.
+    """
+
+    def __init__(self, queue, worker_id, ttl=LEASE_TTL):
+        self.queue = queue
+        self.worker_id = worker_id
+        self.ttl = ttl
+        self._held = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def lease(self):
+        """Lease the next pending URL and keep its lease alive. Returns None if nothing is pending."""
+        url = self.queue.lease(self.worker_id, self.ttl)
+        if url is not None:
+            with self._lock:
+                self._held.add(url)
+        return url
+
+    def complete(self, url, status, error=None):
+        with self._lock:
+            self._held.discard(url)
+        if not self.queue.complete(self.worker_id, url, status, error):
+            print(f"⚠️ Lease on {url} was lost before it completed")
+
+    def renew(self):
+        """Send one heartbeat for every held lease; leases that were lost are dropped."""
+        with self._lock:
+            held = set(self._held)
+        if not held:
+            return
+        lost = held - self.queue.heartbeat(self.worker_id, held, self.ttl)
+        if lost:
+            with self._lock:
+                self._held -= lost
+            print(f"⚠️ Lost {len(lost)} leases")
+
+    def _run(self):
+        while not self._stop.wait(self.ttl / 3):
+            try:
+                self.renew()
+            except Exception as e:
+                print(f"⚠️ Heartbeat failed: {e}")
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._run, name="lease-heartbeat", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join(5)
+
+    def urls(self, poll_interval=5.0):
+        """
+        Yield leased URLs until the crawl is finished.
+
+        When nothing is pending, expired leases of dead workers are queued again;
+        the generator waits while other workers still hold leases (their URLs may
+        come back) or while the queue is still being filled.
+        """
+        while True:
+            url = self.lease()
+            if url is not None:
+                yield url
+                continue
+            if self.queue.requeue_expired():
+                continue
+            counts = self.queue.counts()
+            if self.queue.sealed and counts[PENDING] == 0 and counts[LEASED] == 0:
+                return
+            time.sleep(poll_interval)
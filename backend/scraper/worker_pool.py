@@ -0,0 +1,144 @@
+# Description: A pool of scraper worker threads that share one URL queue.
+# Each worker owns its own WebDriver, so N listings are rendered in parallel,
+# and the success/failed/skipped counters are aggregated across all workers.
+
+import queue
+import threading
+
+# Statuses returned by a URL handler
+SUCCESS = 'success'
+FAILED = 'failed'
+SKIPPED = 'skipped'        # Already stored, nothing was fetched
+DUPLICATE = 'duplicate'    # Fetched, but the save was refused because the document exists
+QUEUED = 'queued'          # Handed to a batched writer, which records the outcome when the write completes
+RETRY = 'retry'            # Failed with a transient error and was queued again
+
+class CrawlStats:
+    """
+    Thread-safe success/failed/skipped counters for a crawl.
+
+    Attempts that were queued again are counted in retried, not in processed.
+    """
+
+    def __init__(self):
+        self.successful = 0
+        self.failed = 0
+        self.skipped = 0
+        self.retried = 0
+        self._lock = threading.Lock()
+
+    @property
+    def processed(self):
+        return self.successful + self.failed + self.skipped
+
+    def record(self, status):
+        """
+        Count the outcome of one URL.
+
+        Args:
+            status (str): One of SUCCESS, FAILED, SKIPPED, DUPLICATE or RETRY. QUEUED is not
+                          counted; the writer records the final status later.
+
+        Returns:
+            int: The number of URLs processed so far.
+        """
+        with self._lock:
+            if status == QUEUED:
+                pass
+            elif status == RETRY:
+                self.retried += 1
+            elif status == SUCCESS:
+                self.successful += 1
+            elif status in (SKIPPED, DUPLICATE):
+                self.skipped += 1
+            else:
+                self.failed += 1
+            return self.processed
+
+    def summary(self):
+        summary = f"✅ Success: {self.successful} | ❌ Failed: {self.failed} | ⏩ Skipped: {self.skipped}"
+        if self.retried:
+            summary += f" | 🔁 Retried: {self.retried}"
+        return summary
+
+def run_worker_pool(items, handle_item, num_workers, start_worker, stop_worker, stats=None, progress_every=50):
+    """
+    Process items with a pool of worker threads sharing one queue.
+
+    Every worker gets its own state from start_worker (e.g. a WebDriver holder).
+    All worker states are released with stop_worker when the pool finishes, when a
+    worker errors, or when the crawl is interrupted with Ctrl-C.
+
+    Args:
+        items (iterable): The items (URLs) to process.
+        handle_item (callable): Called as handle_item(item, index, worker_state) and
+                                returns a status for CrawlStats.record.
+        num_workers (int): Number of worker threads.
+        start_worker (callable): Returns the state for one worker.
+        stop_worker (callable): Releases one worker state (e.g. quits its driver).
+        stats (CrawlStats, optional): Counters to update. A new one is created if None.
+        progress_every (int, optional): Print a progress line every N processed items. Defaults to 50.
+
+    Returns:
+        CrawlStats: The aggregated counters.
+    """
+    stats = stats or CrawlStats()
+    work_queue = queue.Queue(maxsize=num_workers * 2)
+    stop_event = threading.Event()
+    worker_states = [start_worker() for _ in range(num_workers)]
+
+    def worker(state):
+        while not stop_event.is_set():
+            try:
+                entry = work_queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            if entry is None:
+                break
+            index, item = entry
+            try:
+                status = handle_item(item, index, state)
+            except Exception as e:
+                print(f"[{index}] ❌ Worker error: {e}")
+                status = FAILED
+            processed = stats.record(status)
+            if progress_every and status not in (QUEUED, RETRY) and processed % progress_every == 0:
+                print(f"\n--- Progress: {processed} URLs | {stats.summary()} ---\n")
+
+    threads = [
+        threading.Thread(target=worker, args=(state,), name=f"scraper-worker-{n}", daemon=True)
+        for n, state in enumerate(worker_states, 1)
+    ]
+    for thread in threads:
+        thread.start()
+
+    try:
+        for entry in enumerate(items, 1):
+            while not stop_event.is_set():
+                try:
+                    work_queue.put(entry, timeout=0.5)
+                    break
+                except queue.Full:
+                    continue
+        # One sentinel per worker so each of them exits after the queue drains
+        for _ in threads:
+            work_queue.put(None)
+        for thread in threads:
+            # Join in short slices so Ctrl-C is still delivered to the main thread
+            while thread.is_alive():
+                thread.join(0.5)
+    except KeyboardInterrupt:
+        print("\n🛑 Interrupted, shutting down workers...")
+        raise
+    finally:
+        stop_event.set()
+        # Quitting the drivers also unblocks any worker stuck in a page load
+        for state in worker_states:
+            try:
+                stop_worker(state)
+            except Exception as e:
+                print(f"⚠️ Error stopping worker: {e}")
+        for thread in threads:
+            thread.join(5)
+
+    return stats
@@ -0,0 +1,242 @@
+# Description: Extraction throughput benchmark over the saved listing pages in corpus/.
+# The pages are served from a local HTTP server and run through the real extractors.
+# For each strategy the benchmark reports pages/second, per-field latency and peak
+# Python memory, and writes the results as JSON so builds can be compared.
+#
+# Usage (from the project root):
+#   python -m tests.benchmarks.bench_extraction --output bench.json
+#   python -m tests.benchmarks.bench_extraction --strategies static selenium-snapshot --repeat 10
+#
+# The Selenium strategies need Chrome and, since they import backend.scraper.scraper,
+# Firebase credentials; they are reported as skipped when either is missing.
+
+import argparse
+import json
+import platform
+import statistics
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+from bs4 import BeautifulSoup
+from backend.scraper.schema import validate_job_data
+from backend.scraper import static_extractor
+
+CORPUS_DIR = Path(__file__).resolve().parent / "corpus"
+STRATEGIES = ('static', 'selenium-legacy', 'selenium-snapshot')
+
+class CorpusRequestHandler(SimpleHTTPRequestHandler):
+    """Serve /remote-jobs/<job_id> from corpus/<job_id>.html."""
+
+    def translate_path(self, path):
+        job_id = path.split('?')[0].rstrip('/').split('/')[-1]
+        return str(Path(self.directory) / f"{job_id}.html")
+
+    def log_message(self, format, *args):
+        pass  # Keep the benchmark output readable
+
+@contextmanager
+def serve_corpus(corpus_dir=CORPUS_DIR):
+    """
+    Serve the corpus on a free local port.
+
+    Yields:
+        list: The listing URLs of the corpus pages.
+    """
+    handler = partial(CorpusRequestHandler, directory=str(corpus_dir))
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        base_url = f"http://127.0.0.1:{server.server_address[1]}/remote-jobs"
+        yield [f"{base_url}/{page.stem}" for page in sorted(Path(corpus_dir).glob("*.html"))]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def summarize(samples):
+    """Return mean/p50/p95 in milliseconds for a list of durations in seconds."""
+    samples_ms = sorted(sample * 1000 for sample in samples)
+    return {
+        'mean_ms': round(statistics.fmean(samples_ms), 3),
+        'p50_ms': round(samples_ms[len(samples_ms) // 2], 3),
+        'p95_ms': round(samples_ms[min(len(samples_ms) - 1, int(len(samples_ms) * 0.95))], 3),
+        'samples': len(samples_ms),
+    }
+
+def timed(fields, name, func, *args):
+    """Call func, adding its duration to fields[name]."""
+    start = time.perf_counter()
+    result = func(*args)
+    fields.setdefault(name, []).append(time.perf_counter() - start)
+    return result
+
+def measure(pages, extract_page, time_fields, repeat):
+    """
+    Run one strategy: whole-page throughput and memory, then per-field latency.
+
+    Args:
+        pages (list): The corpus URLs.
+        extract_page (callable): extract_page(url) returns the job data or None.
+        time_fields (callable): time_fields(url, fields) runs every field extractor once.
+        repeat (int): Passes over the corpus.
+
+    Returns:
+        dict: The strategy results.
+    """
+    failures = 0
+    tracemalloc.start()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for url in pages:
+            job_data = extract_page(url)
+            try:
+                validate_job_data(job_data or {})
+            except ValueError:
+                failures += 1
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    fields = {}
+    for _ in range(repeat):
+        for url in pages:
+            time_fields(url, fields)
+
+    processed = len(pages) * repeat
+    return {
+        'pages': processed,
+        'failures': failures,
+        'seconds': round(elapsed, 4),
+        'pages_per_second': round(processed / elapsed, 2) if elapsed else None,
+        'peak_memory_bytes': peak,
+        'fields': {name: summarize(samples) for name, samples in fields.items()},
+    }
+
+def bench_static(pages, repeat):
+    """Fetch over HTTP and parse with BeautifulSoup (the static engine)."""
+    session = static_extractor.create_session()
+
+    def extract_page(url):
+        return static_extractor.extract_job_data_static(url, session)
+
+    def time_fields(url, fields):
+        html = timed(fields, 'fetch', static_extractor.fetch_listing_html, url, session)
+        soup = timed(fields, 'parse_html', BeautifulSoup, html, 'html.parser')
+        json_data = timed(fields, 'json_data', static_extractor.find_json_data, soup)
+        timed(fields, 'region', static_extractor.extract_region_from_soup, soup)
+        timed(fields, 'salary_range', static_extractor.extract_salary_from_soup, soup)
+        timed(fields, 'countries', static_extractor.extract_labelled_boxes, soup, 'Country')
+        timed(fields, 'skills', static_extractor.extract_labelled_boxes, soup, 'Skills')
+        timed(fields, 'timezones', static_extractor.extract_labelled_boxes, soup, 'Timezones')
+        timed(fields, 'apply_url', static_extractor.extract_apply_url_from_soup, soup, url)
+        job_data = timed(fields, 'parse_job_html', static_extractor.parse_job_html, html, url)
+        timed(fields, 'validate_job_data', validate_job_data, job_data)
+        assert json_data is None or isinstance(json_data, dict)
+
+    try:
+        return measure(pages, extract_page, time_fields, repeat)
+    finally:
+        session.close()
+
+def bench_selenium(pages, repeat, use_snapshot):
+    """Render in Chrome and run the Selenium extractors, with or without the single-call snapshot."""
+    from backend.scraper import scraper
+
+    driver = scraper.get_driver()
+
+    def time_fields(url, fields):
+        timed(fields, 'page_load', driver.get, url)
+        snapshot = timed(fields, 'snapshot', scraper.get_page_snapshot, driver) if use_snapshot else None
+        json_data = timed(fields, 'json_data', scraper.check_for_json_data, driver, snapshot)
+        timed(fields, 'title', scraper.get_text_safely, driver,
+              '.lis-container__header__hero__company-info__title', 5, snapshot)
+        timed(fields, 'region', scraper.extract_region, driver, snapshot)
+        timed(fields, 'salary_range', scraper.extract_salary, driver, snapshot)
+        timed(fields, 'countries', scraper.extract_countries, driver, snapshot)
+        timed(fields, 'skills', scraper.extract_skills, driver, snapshot)
+        timed(fields, 'timezones', scraper.extract_timezones, driver, snapshot)
+        timed(fields, 'apply_url', scraper.extract_apply_url, driver, url, snapshot)
+        if json_data:
+            job_data = timed(fields, 'process_json_job_data', scraper.process_json_job_data,
+                             json_data, url, driver, snapshot)
+        else:
+            job_data = timed(fields, 'extract_job_data', scraper.extract_job_data, url, driver)
+        timed(fields, 'validate_job_data', validate_job_data, job_data)
+
+    try:
+        if use_snapshot:
+            return measure(pages, partial(scraper.extract_job_data, driver=driver), time_fields, repeat)
+        # Without the snapshot every field falls back to its own WebDriver lookups
+        with patch.object(scraper, 'get_page_snapshot', return_value=None):
+            return measure(pages, partial(scraper.extract_job_data, driver=driver), time_fields, repeat)
+    finally:
+        driver.quit()
+
+def run_benchmark(strategies=STRATEGIES, repeat=3, corpus_dir=CORPUS_DIR):
+    """
+    Run the selected strategies over the corpus.
+
+    Args:
+        strategies (iterable, optional): Strategy names from STRATEGIES. Defaults to all.
+        repeat (int, optional): Passes over the corpus per strategy. Defaults to 3.
+        corpus_dir (Path, optional): Directory of saved listing pages.
+
+    Returns:
+        dict: The benchmark report.
+    """
+    report = {
+        'generated_at': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': repeat,
+        'strategies': {},
+    }
+    runners = {
+        'static': bench_static,
+        'selenium-legacy': partial(bench_selenium, use_snapshot=False),
+        'selenium-snapshot': partial(bench_selenium, use_snapshot=True),
+    }
+    with serve_corpus(corpus_dir) as pages:
+        report['corpus_pages'] = len(pages)
+        for name in strategies:
+            print(f"⏱ Benchmarking {name}...")
+            try:
+                report['strategies'][name] = runners[name](pages, repeat)
+            except Exception as e:
+                reason = str(e).strip().splitlines()[0] if str(e).strip() else type(e).__name__
+                print(f"⏩ Skipped {name}: {reason}")
+                report['strategies'][name] = {'skipped': reason}
+    return report
+
+def print_report(report):
+    for name, result in report['strategies'].items():
+        if 'skipped' in result:
+            print(f"{name:18} skipped ({result['skipped']})")
+            continue
+        print(f"{name:18} {result['pages_per_second']:>8} pages/s  "
+              f"peak {result['peak_memory_bytes'] / 1024:.0f} KiB  failures {result['failures']}")
+        for field, stats in result['fields'].items():
+            print(f"    {field:22} mean {stats['mean_ms']:>9.3f} ms  p95 {stats['p95_ms']:>9.3f} ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Extraction throughput benchmark')
+    parser.add_argument('--strategies', nargs='+', choices=STRATEGIES, default=list(STRATEGIES),
+                       help='Extraction strategies to benchmark')
+    parser.add_argument('--repeat', type=int, default=3,
+                       help='Passes over the corpus per strategy')
+    parser.add_argument('--output', metavar='FILE',
+                       help='Write the results as JSON to FILE')
+    args = parser.parse_args()
+
+    report = run_benchmark(args.strategies, args.repeat)
+    print_report(report)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"📄 Results written to {args.output}")
@@ -0,0 +1,184 @@
+import unittest
+from unittest.mock import patch, MagicMock, AsyncMock
+from io import StringIO
+import sys
+import threading
+
+from fastapi.testclient import TestClient
+from google.cloud.firestore_v1.watch import ChangeType
+
+from backend.api import main
+from backend.database.job_index import JobIndex
+from backend.database.search_index import SearchIndex
+
+def make_job(n, category="Product"):
+    return {
+        "job_id": f"job{n}", "title": f"Job {n}", "company": "Acme", "company_about": "", "apply_url": "",
+        "apply_before": "", "job_description": "", "category": category, "region": [],
+    }
+
+def live_index(jobs):
+    """A JobIndex whose listener delivered the given jobs as its first snapshot."""
+    client = MagicMock()
+    index = JobIndex('jobs', client=client)
+    index.start()
+    callback = client.collection.return_value.on_snapshot.call_args[0][0]
+    changes = []
+    for job in jobs:
+        document = MagicMock(id=job["job_id"])
+        document.to_dict.return_value = job
+        changes.append(MagicMock(type=ChangeType.ADDED, document=document))
+    callback([], changes, None)
+    return index
+
+class TestCursorPagination(unittest.TestCase):
+    def setUp(self):
+        self.captured_output = StringIO()
+        sys.stdout = self.captured_output
+        # Without a `with` block the lifespan does not run, so no listener is started
+        self.client = TestClient(main.app)
+
+    def tearDown(self):
+        sys.stdout = sys.__stdout__
+
+    def test_cursor_walks_the_live_index(self):
+        """Test that next_cursor continues where the previous page ended and page numbers still work"""
+        with patch.object(main, 'job_index', live_index([make_job(n) for n in range(1, 6)])):
+            first = self.client.get("/data", params={"size": 2}).json()
+            second = self.client.get("/data", params={"size": 2, "cursor": first["next_cursor"]}).json()
+            third = self.client.get("/data", params={"size": 2, "page": 3}).json()
+
+        self.assertEqual([job["job_id"] for job in first["items"]], ["job1", "job2"])
+        self.assertEqual((first["total"], first["pages"]), (5, 3))
+        self.assertEqual([job["job_id"] for job in second["items"]], ["job3", "job4"])
+        self.assertEqual(second["page"], 2)
+        self.assertEqual([job["job_id"] for job in third["items"]], ["job5"])
+        self.assertIsNone(third["next_cursor"])
+
+    def test_category_paginated_in_firestore(self):
+        """Test that without a live index only one page and a count are read from Firestore"""
+        repository = MagicMock()
+        repository.page_jobs = AsyncMock(return_value=([make_job(1), make_job(2)], "job2"))
+        repository.count_jobs = AsyncMock(return_value=7)
+
+        with patch.object(main, 'jobs_repository', repository):
+            response = self.client.get("/data/Product", params={"size": 2, "page": 2}).json()
+
+        repository.page_jobs.assert_awaited_once_with(2, None, 2, "Product")
+        repository.count_jobs.assert_awaited_once_with("Product", None)
+        self.assertEqual((response["total"], response["pages"], response["page"]), (7, 4, 2))
+        self.assertEqual(main.decode_cursor(response["next_cursor"]), ("job2", 3))
+
+    def test_total_modes(self):
+        """Test that approximate totals accept an older count and that totals can be skipped"""
+        repository = MagicMock()
+        repository.page_jobs = AsyncMock(return_value=([make_job(1)], None))
+        repository.count_jobs = AsyncMock(return_value=1)
+        repository.list_jobs = AsyncMock(return_value=[make_job(1)])
+
+        with patch.object(main, 'jobs_repository', repository):
+            approximate = self.client.get("/data", params={"total": "approximate"}).json()
+            uncounted = self.client.get("/data/Product", params={"total": "none"}).json()
+            company = self.client.get("/data/Acme", params={"total": "none"})
+            invalid = self.client.get("/data", params={"total": "some"})
+
+        repository.count_jobs.assert_awaited_once_with(None, main.APPROXIMATE_COUNT_TTL)
+        self.assertEqual(approximate["total"], 1)
+        self.assertEqual((uncounted["total"], uncounted["pages"]), (None, None))
+        self.assertEqual(len(uncounted["items"]), 1)
+        self.assertIsNone(company.json()["total"])
+        self.assertEqual(invalid.status_code, 422)
+
+    def test_index_changes_invalidate_counts(self):
+        """Test that a change reported by the job index drops the cached totals it affects"""
+        repository = MagicMock()
+
+        with patch.object(main, 'jobs_repository', repository):
+            main.invalidate_counts("job1", make_job(1), make_job(1, category="Design"))
+
+        self.assertEqual(set(repository.invalidate_counts.call_args[0][0]), {"Product", "Design"})
+
+    def test_invalid_cursor(self):
+        """Test that a malformed cursor is rejected with 400"""
+        response = self.client.get("/data", params={"cursor": "not-a-cursor"})
+
+        self.assertEqual(response.status_code, 400)
+
+class TestCompanyLookup(unittest.TestCase):
+    def setUp(self):
+        self.captured_output = StringIO()
+        sys.stdout = self.captured_output
+        self.client = TestClient(main.app)
+
+    def tearDown(self):
+        sys.stdout = sys.__stdout__
+
+    def test_company_lookup_uses_the_trigram_index(self):
+        """Test that a company filter is answered from the company index of the live jobs"""
+        jobs = [dict(make_job(n), company=company) for n, company in [(1, "Acme Analytics"), (2, "Globex"), (3, "ACME Corp")]]
+        company_index = main.CompanyIndex()
+        for job in jobs:
+            company_index.add(job["job_id"], job)
+
+        with patch.object(main, 'job_index', live_index(jobs)), patch.object(main, 'company_index', company_index):
+            response = self.client.get("/data/acme", params={"size": 1, "page": 2}).json()
+
+        self.assertEqual([job["job_id"] for job in response["items"]], ["job3"])
+        self.assertEqual((response["total"], response["pages"]), (2, 2))
+
+class TestSearch(unittest.TestCase):
+    def setUp(self):
+        self.captured_output = StringIO()
+        sys.stdout = self.captured_output
+        self.client = TestClient(main.app)
+        self.jobs = [dict(make_job(1), title="Python Engineer", job_description="Python and more Python"),
+                     dict(make_job(2), title="Backend Engineer", job_description="Some Python")]
+
+    def tearDown(self):
+        sys.stdout = sys.__stdout__
+
+    def test_search_is_routed_and_ranked(self):
+        """Test that /data/search is not taken for a company name and returns the best match first"""
+        repository = MagicMock()
+        repository.list_jobs = AsyncMock(return_value=self.jobs)
+
+        with patch.object(main, 'jobs_repository', repository):
+            response = self.client.get("/data/search", params={"description": "python", "title": "eng*"}).json()
+
+        self.assertEqual([job["job_id"] for job in response["items"]], ["job1", "job2"])
+        self.assertEqual(response["total"], 2)
+
+    def test_fallback_index_built_off_the_event_loop(self):
+        """Test that without a live index the jobs are indexed in a worker thread"""
+        threads = []
+        repository = MagicMock()
+        repository.list_jobs = AsyncMock(side_effect=lambda: threads.append(threading.current_thread()) or self.jobs)
+
+        def build(jobs):
+            threads.append(threading.current_thread())
+            return SearchIndex(jobs)
+
+        with patch.object(main, 'jobs_repository', repository), patch.object(main, 'SearchIndex', side_effect=build):
+            response = self.client.get("/data/search", params={"title": "backend"}).json()
+
+        self.assertEqual([job["job_id"] for job in response["items"]], ["job2"])
+        self.assertNotEqual(threads[0], threads[1])
+
+    def test_live_search_index(self):
+        """Test that the search index follows the changes of the live job index"""
+        search_index = main.SearchIndex()
+        index = JobIndex('jobs', client=MagicMock())
+        index.subscribe(search_index.on_change)
+        index.start()
+        callback = index._client.collection.return_value.on_snapshot.call_args[0][0]
+        document = MagicMock(id="job2")
+        document.to_dict.return_value = self.jobs[1]
+        callback([], [MagicMock(type=ChangeType.ADDED, document=document)], None)
+
+        with patch.object(main, 'job_index', index), patch.object(main, 'search_index', search_index):
+            response = self.client.get("/data/search", params={"title": "backend"}).json()
+
+        self.assertEqual([job["job_id"] for job in response["items"]], ["job2"])
+
+if __name__ == '__main__':
+    unittest.main()
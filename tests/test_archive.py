@@ -0,0 +1,70 @@
+import unittest
+from unittest.mock import patch
+import os
+import tempfile
+
+from backend.scraper.archive import PageArchive
+
+class TestPageArchive(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.archive = PageArchive(self.tmpdir.name)
+
+    def tearDown(self):
+        self.archive.close()
+        self.tmpdir.cleanup()
+
+    def test_store_and_load(self):
+        """Test that a page round-trips through the compressed segment"""
+        html = "<html><body>" + "Remote job " * 1000 + "</body></html>"
+        
+        digest = self.archive.store("https://weworkremotely.com/remote-jobs/job1", html)
+        
+        self.assertEqual(self.archive.load(digest), html)
+        segment = os.path.join(self.tmpdir.name, "segment-000001.dat")
+        self.assertLess(os.path.getsize(segment), len(html))
+
+    def test_identical_pages_stored_once(self):
+        """Test that the archive is content-addressed"""
+        first = self.archive.store("https://weworkremotely.com/remote-jobs/job1", "<html>same</html>", fetched_at=1)
+        second = self.archive.store("https://weworkremotely.com/remote-jobs/job2", "<html>same</html>", fetched_at=2)
+        
+        self.assertEqual(first, second)
+        segment = os.path.join(self.tmpdir.name, "segment-000001.dat")
+        size = os.path.getsize(segment)
+        self.archive.store("https://weworkremotely.com/remote-jobs/job3", "<html>same</html>", fetched_at=3)
+        self.assertEqual(os.path.getsize(segment), size)
+        self.assertEqual(len(self.archive), 3)
+
+    def test_iter_latest(self):
+        """Test that only the most recent page of each job is returned"""
+        self.archive.store("https://weworkremotely.com/remote-jobs/job1", "<html>old</html>", fetched_at=1)
+        self.archive.store("https://weworkremotely.com/remote-jobs/job1", "<html>new</html>", fetched_at=2)
+        self.archive.store("https://weworkremotely.com/remote-jobs/job2", "<html>other</html>", fetched_at=1)
+        
+        pages = list(self.archive.iter_latest())
+        
+        self.assertEqual(pages, [
+            ("https://weworkremotely.com/remote-jobs/job1", "<html>new</html>", 2),
+            ("https://weworkremotely.com/remote-jobs/job2", "<html>other</html>", 1),
+        ])
+
+    @patch('backend.scraper.archive.SEGMENT_SIZE', 16)
+    def test_segment_rollover(self):
+        """Test that a new segment file is started when the current one is full"""
+        self.archive.store("https://weworkremotely.com/remote-jobs/job1", "<html>first page</html>")
+        digest = self.archive.store("https://weworkremotely.com/remote-jobs/job2", "<html>second page</html>")
+        
+        self.assertTrue(os.path.exists(os.path.join(self.tmpdir.name, "segment-000002.dat")))
+        self.assertEqual(self.archive.load(digest), "<html>second page</html>")
+
+    def test_persists_across_instances(self):
+        """Test that the index is reopened from disk"""
+        digest = self.archive.store("https://weworkremotely.com/remote-jobs/job1", "<html>kept</html>")
+        self.archive.close()
+        
+        self.archive = PageArchive(self.tmpdir.name)
+        self.assertEqual(self.archive.load(digest), "<html>kept</html>")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+import unittest
+import os
+import tempfile
+from selenium.webdriver.chrome.options import Options
+
+from backend.scraper.browser_profile import (
+    create_lean_options, load_blocklist, IMAGE_PATTERNS, STYLESHEET_PATTERNS
+)
+
+class TestBrowserProfile(unittest.TestCase):
+    def test_lean_options_copy(self):
+        """Test that lean options are eager and leave the base options untouched"""
+        base = Options()
+        base.add_argument("--headless=new")
+        
+        lean = create_lean_options(base)
+        
+        self.assertEqual(lean.page_load_strategy, 'eager')
+        self.assertIn("--headless=new", lean.arguments)
+        self.assertIn("--blink-settings=imagesEnabled=false", lean.arguments)
+        self.assertEqual(base.page_load_strategy, 'normal')
+        self.assertNotIn("--blink-settings=imagesEnabled=false", base.arguments)
+
+    def test_load_blocklist(self):
+        """Test that comments are skipped and group names expand to their patterns"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "blocklist.txt")
+            with open(path, "w") as f:
+                f.write("# assets\nimages\ncss\n\n*tracker.example*\n")
+            
+            patterns = load_blocklist(path)
+        
+        self.assertEqual(patterns, IMAGE_PATTERNS + STYLESHEET_PATTERNS + ['*tracker.example*'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+
+from backend.database.company_index import CompanyIndex, trigrams
+
+class TestCompanyIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = CompanyIndex()
+        for job_id, company in [("job1", "Acme Analytics"), ("job2", "Globex"), ("job3", "ACME Corp"),
+                                ("job4", "Initech"), ("job5", "")]:
+            self.index.add(job_id, {"job_id": job_id, "company": company})
+
+    def test_trigrams(self):
+        self.assertEqual(trigrams("acme"), {"acm", "cme"})
+        self.assertEqual(trigrams("ac"), set())
+
+    def test_case_insensitive_substring(self):
+        """Test that lookups match part of a name regardless of case, in job ID order"""
+        self.assertEqual(self.index.lookup("acme"), ["job1", "job3"])
+        self.assertEqual(self.index.lookup("ME an"), ["job1"])
+        self.assertEqual(self.index.lookup("lobe"), ["job2"])
+        self.assertEqual(self.index.lookup("acmex"), [])
+
+    def test_trigrams_are_not_enough(self):
+        """Test that a name containing every trigram of the query, but not the query, is rejected"""
+        self.index.add("job6", {"company": "abcd bcde"})
+
+        self.assertEqual(self.index.lookup("abcde"), [])
+
+    def test_short_queries(self):
+        """Test that queries shorter than a trigram still match"""
+        self.assertEqual(self.index.lookup("X"), ["job2"])
+        self.assertEqual(self.index.lookup("ac"), ["job1", "job3"])
+
+    def test_incremental_updates(self):
+        """Test that renamed and removed jobs are reflected in the next lookup"""
+        self.index.on_change("job1", None, {"company": "Globex"})
+        self.index.on_change("job3", None, None)
+
+        self.assertEqual(self.index.lookup("acme"), [])
+        self.assertEqual(self.index.lookup("globex"), ["job1", "job2"])
+
+        for job_id in ("job1", "job2", "job4"):
+            self.index.remove(job_id)
+        self.assertEqual((len(self.index), self.index._trigrams, self.index._names), (0, {}, {}))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+import unittest
+from unittest.mock import patch, MagicMock
+from io import BytesIO, StringIO
+import os
+import signal
+import sys
+import time
+
+from backend.scraper.driver_manager import (
+    DriverPool, ManagedDriver, Watchdog, kill_tree, process_tree, tree_rss_mb, RSS_CHECK_EVERY
+)
+from backend.scraper.resilience import TransientError
+
+def make_driver(pid=None, returncode=None):
+    driver = MagicMock()
+    driver.service.process.pid = pid
+    driver.service.process.poll.return_value = returncode
+    return driver
+
+class TestManagedDriver(unittest.TestCase):
+    def setUp(self):
+        self.captured_output = StringIO()
+        sys.stdout = self.captured_output
+
+    def tearDown(self):
+        sys.stdout = sys.__stdout__
+
+    def test_started_lazily_and_kept_warm(self):
+        """Test that the browser starts on first use and is reused between pages"""
+        factory = MagicMock(side_effect=lambda: make_driver())
+        holder = ManagedDriver(factory, max_pages=10)
+
+        factory.assert_not_called()
+        first = holder.get()
+        self.assertIs(holder.get(), first)
+        factory.assert_called_once()
+
+    def test_recycled_after_max_pages(self):
+        """Test that the browser is replaced once it rendered max_pages pages"""
+        drivers = [make_driver(), make_driver()]
+        holder = ManagedDriver(MagicMock(side_effect=drivers), max_pages=2)
+
+        self.assertEqual([holder.get() for _ in range(3)], [drivers[0], drivers[0], drivers[1]])
+        drivers[0].quit.assert_called_once()
+        self.assertIn("Recycling browser (2 pages)", self.captured_output.getvalue())
+
+    def test_dead_browser_replaced(self):
+        """Test that a browser whose process exited is replaced without calling quit"""
+        dead, fresh = make_driver(returncode=-9), make_driver()
+        holder = ManagedDriver(MagicMock(return_value=fresh), driver=dead)
+
+        self.assertIs(holder.get(), fresh)
+        dead.quit.assert_not_called()
+
+    @patch('backend.scraper.driver_manager.tree_rss_mb', return_value=2048.0)
+    def test_recycled_on_memory(self, mock_rss):
+        """Test that memory is checked every few pages and a bloated browser is replaced"""
+        drivers = [make_driver(pid=1234), make_driver(pid=5678)]
+        holder = ManagedDriver(MagicMock(side_effect=drivers), max_pages=0, max_rss_mb=1024)
+
+        for _ in range(RSS_CHECK_EVERY + 1):
+            driver = holder.get()
+
+        self.assertIs(driver, drivers[1])
+        mock_rss.assert_called_once_with(1234)
+        self.assertIn("2048 MB in use", self.captured_output.getvalue())
+
+    @patch('backend.scraper.driver_manager.kill_browser')
+    def test_unresponsive_browser_killed_on_quit(self, mock_kill):
+        """Test that a browser that fails to quit is killed"""
+        driver = make_driver(pid=1234)
+        driver.quit.side_effect = Exception("connection refused")
+        holder = ManagedDriver(MagicMock(), driver=driver)
+
+        holder.quit()
+
+        mock_kill.assert_called_once_with(driver)
+        self.assertIsNone(holder.driver)
+
+class TestWatchdog(unittest.TestCase):
+    def setUp(self):
+        self.captured_output = StringIO()
+        sys.stdout = self.captured_output
+
+    def tearDown(self):
+        sys.stdout = sys.__stdout__
+
+    @patch('backend.scraper.driver_manager.kill_browser')
+    def test_hung_page_killed(self, mock_kill):
+        """Test that a page running past its timeout gets its browser killed and raises TransientError"""
+        watchdog = Watchdog(interval=0.01)
+        driver = make_driver(pid=1234)
+
+        with self.assertRaises(TransientError):
+            with watchdog.guard(driver, 0.05, "https://example.com/job"):
+                time.sleep(0.3)
+
+        mock_kill.assert_called_once_with(driver)
+
+    @patch('backend.scraper.driver_manager.kill_browser')
+    def test_fast_page_untouched(self, mock_kill):
+        """Test that a page finishing in time is left alone"""
+        watchdog = Watchdog(interval=0.01)
+
+        with watchdog.guard(make_driver(), 5, "https://example.com/job") as driver:
+            self.assertIsNotNone(driver)
+        time.sleep(0.05)
+
+        mock_kill.assert_not_called()
+
+class TestDriverPool(unittest.TestCase):
+    def test_lease_reuses_idle_driver(self):
+        """Test that a returned driver is lent again instead of starting a new one"""
+        factory = MagicMock(side_effect=lambda: make_driver())
+        pool = DriverPool(lambda: ManagedDriver(factory))
+
+        with pool.lease() as first:
+            pass
+        with pool.lease() as second:
+            self.assertIs(second, first)
+        factory.assert_called_once()
+
+        pool.close()
+        first.quit.assert_called_once()
+
+@unittest.skipUnless(os.path.isdir('/proc'), "needs /proc")
+class TestProcessTree(unittest.TestCase):
+    def fake_proc(self, parents):
+        """Patch /proc with processes whose parents are given as {pid: parent_pid}."""
+        def fake_open(path, mode='r'):
+            pid = int(path.split('/')[2])
+            return BytesIO(f"{pid} (sh -c) S {parents[pid]} 1 1".encode())
+        return (patch('backend.scraper.driver_manager.os.listdir', return_value=[str(pid) for pid in parents] + ['self']),
+                patch('builtins.open', side_effect=fake_open))
+
+    def test_process_tree(self):
+        """Test that a process's descendants are found, children last"""
+        listdir, fake_open = self.fake_proc({10: 1, 11: 10, 12: 11, 13: 10, 20: 1})
+        with listdir, fake_open:
+            self.assertEqual(process_tree(10), [10, 11, 13, 12])
+
+    def test_tree_rss(self):
+        """Test that the memory of a running process is measured"""
+        tree = process_tree(os.getpid())
+        self.assertEqual(tree[0], os.getpid())
+        self.assertGreater(tree_rss_mb(os.getpid()), 0)
+
+    @patch('backend.scraper.driver_manager.os.kill')
+    @patch('backend.scraper.driver_manager.process_tree', return_value=[10, 11, 13, 12])
+    def test_kill_tree(self, mock_tree, mock_kill):
+        """Test that the children are killed before their parents, skipping processes that are gone"""
+        mock_kill.side_effect = [None, ProcessLookupError(), None, None]
+
+        kill_tree(10)
+
+        mock_tree.assert_called_once_with(10)
+        self.assertEqual([c.args for c in mock_kill.call_args_list],
+                         [(12, signal.SIGKILL), (13, signal.SIGKILL), (11, signal.SIGKILL), (10, signal.SIGKILL)])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+import unittest
+from unittest.mock import MagicMock
+import os
+import sys
+import tempfile
+import threading
+import time
+from io import StringIO
+
+from backend.scraper.frontier import Frontier, PENDING, CLAIMED, DONE, FAILED_STATE, MAX_ATTEMPTS
+from backend.scraper.worker_pool import SUCCESS, FAILED, SKIPPED, RETRY, run_worker_pool
+from backend.scraper.scraper import finish_crawl
+
+URLS = [f"https://weworkremotely.com/remote-jobs/job{n}" for n in range(1, 5)]
+
+class TestFrontier(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "frontier.sqlite3")
+        self.frontier = Frontier(self.path)
+
+    def tearDown(self):
+        self.frontier.close()
+        self.tmpdir.cleanup()
+
+    def reopen(self):
+        self.frontier.close()
+        self.frontier = Frontier(self.path)
+
+    def test_claims_in_order(self):
+        """Test that URLs are claimed once each, in the order they were added"""
+        self.frontier.begin()
+        self.frontier.add(URLS + URLS[:1])
+
+        self.assertEqual(list(self.frontier.claims()), URLS)
+        self.assertEqual(self.frontier.counts()[CLAIMED], 4)
+        self.assertIsNone(self.frontier.claim())
+
+    def test_resume_after_crash(self):
+        """Test that a resumed crawl only hands out the URLs that were not completed"""
+        self.frontier.begin()
+        self.frontier.add(URLS)
+        self.frontier.mark_listed()
+        claims = self.frontier.claims()
+        self.frontier.complete(next(claims), SUCCESS)
+        self.frontier.complete(next(claims), SKIPPED)
+        next(claims)  # Claimed when the crawl stopped
+
+        self.reopen()
+        self.assertTrue(self.frontier.begin(resume=True))
+        self.assertTrue(self.frontier.listed)
+        self.assertEqual(list(self.frontier.claims()), URLS[2:])
+        self.assertEqual(self.frontier.counts()[DONE], 2)
+
+    def test_failed_urls_retried_until_max_attempts(self):
+        """Test that failed URLs are pending again on resume while attempts are left"""
+        self.frontier.begin()
+        self.frontier.add(URLS[:1])
+        for attempt in range(MAX_ATTEMPTS):
+            if attempt:
+                self.assertTrue(self.frontier.begin(resume=True))
+            self.assertEqual(self.frontier.claim(), URLS[0])
+            self.frontier.complete(URLS[0], FAILED, error="timeout")
+
+        self.frontier.begin(resume=True)
+        self.assertIsNone(self.frontier.claim())
+        self.assertEqual(self.frontier.counts()[FAILED_STATE], 1)
+
+    def test_retry_requeues_at_the_end(self):
+        """Test that a transient failure is handed out again after the other pending URLs"""
+        self.frontier.begin()
+        self.frontier.add(URLS[:3])
+
+        self.assertEqual(self.frontier.claim(), URLS[0])
+        self.assertTrue(self.frontier.retry(URLS[0], error="timeout"))
+        self.assertEqual(list(self.frontier.claims()), [URLS[1], URLS[2], URLS[0]])
+
+    def test_retry_fails_after_max_attempts(self):
+        """Test that a URL that used all its attempts is failed instead of requeued"""
+        self.frontier.begin()
+        self.frontier.add(URLS[:1])
+        for _ in range(MAX_ATTEMPTS - 1):
+            self.assertEqual(self.frontier.claim(), URLS[0])
+            self.assertTrue(self.frontier.retry(URLS[0]))
+
+        self.assertEqual(self.frontier.claim(), URLS[0])
+        self.assertFalse(self.frontier.retry(URLS[0]))
+        self.assertIsNone(self.frontier.claim())
+        self.assertEqual(self.frontier.counts()[FAILED_STATE], 1)
+
+    def test_finished_crawl_starts_over(self):
+        """Test that --resume after a completed crawl starts a new one"""
+        self.frontier.begin()
+        self.frontier.add(URLS)
+        self.frontier.mark_listed()
+        self.frontier.finish()
+
+        self.assertFalse(self.frontier.begin(resume=True))
+        self.assertFalse(self.frontier.listed)
+        self.assertEqual(sum(self.frontier.counts().values()), 0)
+
+    def test_feed_skips_completed_urls(self):
+        """Test that re-reading the sitemap on resume skips completed URLs and adds new ones"""
+        self.frontier.begin()
+        self.frontier.add(URLS[:2])
+        self.frontier.complete(self.frontier.claim(), SUCCESS)
+
+        self.reopen()
+        self.frontier.begin(resume=True)
+        fed = list(self.frontier.feed(URLS))
+
+        self.assertEqual(fed, URLS[1:])
+        self.assertTrue(self.frontier.listed)
+        self.assertEqual(self.frontier.counts()[PENDING], 0)
+
+class TestRetryRounds(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.frontier = Frontier(os.path.join(self.tmpdir.name, "frontier.sqlite3"))
+        self.captured_output = StringIO()
+        sys.stdout = self.captured_output
+
+    def tearDown(self):
+        sys.stdout = sys.__stdout__
+        self.frontier.close()
+        self.tmpdir.cleanup()
+
+    def test_last_url_retried_after_the_dispatcher_stopped(self):
+        """Test that a URL queued again while the others finish is crawled in another round"""
+        urls = [f"https://weworkremotely.com/remote-jobs/job{n}" for n in range(1, 7)]
+        self.frontier.begin()
+        self.frontier.add(urls)
+        attempts = {}
+        lock = threading.Lock()
+
+        def handle(url, i, state):
+            with lock:
+                attempts[url] = attempts.get(url, 0) + 1
+            if url == urls[-1] and attempts[url] == 1:
+                # Fail only after the dispatcher has handed out every URL
+                time.sleep(0.2)
+                self.assertTrue(self.frontier.retry(url, error="timeout"))
+                return RETRY
+            self.frontier.complete(url, SUCCESS)
+            return SUCCESS
+
+        for round_urls in self.frontier.rounds(self.frontier.claims()):
+            run_worker_pool(round_urls, handle, 3, start_worker=MagicMock, stop_worker=lambda state: None)
+
+        self.assertEqual(attempts[urls[-1]], 2)
+        self.assertEqual(self.frontier.counts()[DONE], 6)
+        self.assertFalse(self.frontier.unfinished)
+
+    def test_unfinished_crawl_is_not_closed(self):
+        """Test that finish_crawl leaves the crawl resumable while URLs are still pending"""
+        self.frontier.begin()
+        self.frontier.add(URLS[:1])
+        sitemap_state = MagicMock()
+
+        finish_crawl(sitemap_state, self.frontier)
+
+        sitemap_state.commit.assert_not_called()
+        self.assertTrue(self.frontier.begin(resume=True))
+
+if __name__ == '__main__':
+    unittest.main()
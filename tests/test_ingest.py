@@ -0,0 +1,118 @@
+import unittest
+from unittest.mock import MagicMock
+from io import StringIO
+import sys
+import time
+from types import SimpleNamespace
+
+from backend.scraper.ingest import IngestWriter, ALREADY_EXISTS
+from backend.scraper.worker_pool import SUCCESS, FAILED, DUPLICATE
+
+class FakeBulkWriter:
+    """Stand-in for firestore BulkWriter: create() fails for existing documents."""
+
+    def __init__(self, store, log):
+        self.store = store
+        self.log = log
+        self.operations = []
+
+    def on_write_result(self, callback):
+        self.on_result = callback
+
+    def on_write_error(self, callback):
+        self.on_error = callback
+
+    def create(self, reference, data):
+        self.operations.append((reference, data))
+
+    def close(self):
+        self.log.append(len(self.operations))
+        for reference, data in self.operations:
+            attempts = 0
+            while True:
+                attempts += 1
+                code = self.store.get('__fail__', {}).get(reference.id)
+                if code is None and reference.id not in self.store:
+                    self.store[reference.id] = data
+                    self.on_result(reference, MagicMock(), self)
+                    break
+                error = SimpleNamespace(code=code or ALREADY_EXISTS, attempts=attempts, message="error",
+                                        operation=SimpleNamespace(reference=reference))
+                if not self.on_error(error, self):
+                    break
+
+class FakeClient:
+    def __init__(self):
+        self.store = {}
+        self.batches = []
+
+    def collection(self, name):
+        collection = MagicMock()
+        collection.document.side_effect = lambda doc_id: SimpleNamespace(id=doc_id)
+        return collection
+
+    def bulk_writer(self):
+        return FakeBulkWriter(self.store, self.batches)
+
+class TestIngestWriter(unittest.TestCase):
+    def setUp(self):
+        self.client = FakeClient()
+        self.results = []
+        self.captured_output = StringIO()
+        sys.stdout = self.captured_output
+
+    def tearDown(self):
+        sys.stdout = sys.__stdout__
+
+    def make_writer(self, **kwargs):
+        return IngestWriter('jobs', on_result=lambda key, status: self.results.append((key, status)),
+                            client=self.client, **kwargs)
+
+    def test_flushes_on_batch_size(self):
+        """Test that a full buffer is written in one batch"""
+        writer = self.make_writer(batch_size=3, flush_interval=60)
+        for n in range(4):
+            writer.add({"job_id": f"job{n}"}, f"url{n}")
+
+        self.assertEqual(self.client.batches, [3])
+        self.assertEqual(len(self.results), 3)
+        writer.close()
+        self.assertEqual(self.client.batches, [3, 1])
+        self.assertIn(("url3", SUCCESS), self.results)
+
+    def test_flushes_on_interval(self):
+        """Test that buffered documents are written once they have waited flush_interval"""
+        writer = self.make_writer(batch_size=100, flush_interval=0.05)
+        writer.add({"job_id": "job1"})
+
+        deadline = time.time() + 2
+        while not self.results and time.time() < deadline:
+            time.sleep(0.01)
+
+        self.assertEqual(self.results, [("job1", SUCCESS)])
+        writer.close()
+
+    def test_existing_document_reported_as_duplicate(self):
+        """Test that create() refusing an existing job is reported without a read"""
+        self.client.store["job1"] = {"job_id": "job1"}
+        writer = self.make_writer(flush_interval=60)
+        writer.add({"job_id": "job1"}, "url1")
+        writer.add({"job_id": "job2"}, "url2")
+        writer.add({"job_id": "job2"}, "url2-again")
+        writer.close()
+
+        self.assertCountEqual(self.results, [("url1", DUPLICATE), ("url2", SUCCESS), ("url2-again", DUPLICATE)])
+
+    def test_transient_errors_retried(self):
+        """Test that transient errors are retried and permanent ones reported as failed"""
+        self.client.store['__fail__'] = {"job1": 14, "job2": 7}
+        writer = self.make_writer(flush_interval=60)
+        writer.add({"job_id": "job1"})
+        writer.add({"job_id": "job2"})
+        writer.close()
+
+        self.assertCountEqual(self.results, [("job1", FAILED), ("job2", FAILED)])
+        self.assertIn("Firestore error for job2", self.captured_output.getvalue())
+
+if __name__ == '__main__':
+    unittest.main()
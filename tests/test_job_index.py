@@ -0,0 +1,115 @@
+import unittest
+from unittest.mock import MagicMock
+from io import StringIO
+import sys
+
+from google.cloud.firestore_v1.watch import ChangeType
+
+from backend.database.job_index import JobIndex
+
+def change(kind, job_id, data=None):
+    document = MagicMock(id=job_id)
+    document.to_dict.return_value = data
+    return MagicMock(type=kind, document=document)
+
+class FakeClient:
+    """Captures the snapshot callback, like a Firestore listener before its first snapshot."""
+
+    def __init__(self):
+        self.callback = None
+        self.watch = MagicMock(is_active=True)
+
+    def collection(self, name):
+        collection = MagicMock()
+
+        def on_snapshot(callback):
+            self.callback = callback
+            return self.watch
+
+        collection.on_snapshot = on_snapshot
+        return collection
+
+    def send(self, *changes):
+        self.callback([], list(changes), None)
+
+class TestJobIndex(unittest.TestCase):
+    def setUp(self):
+        self.captured_output = StringIO()
+        sys.stdout = self.captured_output
+        self.client = FakeClient()
+        self.index = JobIndex('jobs', client=self.client)
+        self.index.start()
+
+    def tearDown(self):
+        sys.stdout = sys.__stdout__
+
+    def test_ready_after_first_snapshot(self):
+        """Test that the index only serves reads once the initial snapshot is loaded"""
+        self.assertFalse(self.index.ready)
+
+        self.client.send(change(ChangeType.ADDED, "job2", {"job_id": "job2", "category": "Product"}),
+                         change(ChangeType.ADDED, "job1", {"job_id": "job1", "category": "Product"}))
+
+        self.assertTrue(self.index.ready)
+        self.assertEqual([job["job_id"] for job in self.index.list_jobs()], ["job1", "job2"])
+        self.assertIn("2 jobs", self.captured_output.getvalue())
+
+    def test_changes_are_applied(self):
+        """Test that added, modified and removed documents update the jobs and category lists"""
+        self.client.send(change(ChangeType.ADDED, "job1", {"job_id": "job1", "category": "Product"}),
+                         change(ChangeType.ADDED, "job2", {"job_id": "job2", "category": "Product"}))
+
+        self.client.send(change(ChangeType.MODIFIED, "job1", {"job_id": "job1", "category": "DevOps and Sysadmin"}),
+                         change(ChangeType.REMOVED, "job2"),
+                         change(ChangeType.ADDED, "job3", {"job_id": "job3", "category": "Product"}))
+
+        self.assertEqual([job["job_id"] for job in self.index.list_jobs()], ["job1", "job3"])
+        self.assertEqual([job["job_id"] for job in self.index.list_by_category("Product")], ["job3"])
+        self.assertEqual(self.index.list_by_category("DevOps and Sysadmin"), [{"job_id": "job1", "category": "DevOps and Sysadmin"}])
+        self.assertIsNone(self.index.get_job("job2"))
+
+    def test_discard_and_stop(self):
+        """Test that a deleted job disappears at once and that stopping falls back to Firestore"""
+        self.client.send(change(ChangeType.ADDED, "job1", {"job_id": "job1", "category": "Product"}))
+
+        self.index.discard("job1")
+        self.index.discard("missing")
+        self.assertEqual(len(self.index), 0)
+        self.assertEqual(self.index.list_by_category("Product"), [])
+
+        self.index.stop()
+        self.assertFalse(self.index.ready)
+        self.client.watch.unsubscribe.assert_called_once()
+
+    def test_subscribers_are_told_about_changes(self):
+        """Test that subscribers receive the old and new version of every changed job"""
+        events = []
+        self.index.subscribe(lambda job_id, old, new: events.append((job_id, old, new)))
+        job1 = {"job_id": "job1", "category": "Product"}
+        moved = {"job_id": "job1", "category": "DevOps and Sysadmin"}
+
+        self.client.send(change(ChangeType.ADDED, "job1", job1))
+        self.client.send(change(ChangeType.MODIFIED, "job1", moved))
+        self.index.discard("job1")
+        self.client.send(change(ChangeType.REMOVED, "job1"))
+
+        self.assertEqual(events, [("job1", None, job1), ("job1", job1, moved), ("job1", moved, None)])
+
+    def test_failing_subscriber_does_not_stop_the_index(self):
+        """Test that an error in a subscriber is reported and the change still applied"""
+        self.index.subscribe(MagicMock(side_effect=RuntimeError("boom")))
+
+        self.client.send(change(ChangeType.ADDED, "job1", {"job_id": "job1", "category": "Product"}))
+
+        self.assertTrue(self.index.ready)
+        self.assertIn("boom", self.captured_output.getvalue())
+
+    def test_inactive_listener_not_ready(self):
+        """Test that the index is not used once its listener stopped streaming"""
+        self.client.send()
+        self.client.watch.is_active = False
+
+        self.assertFalse(self.index.ready)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,173 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import asyncio
+
+from backend.database.job_repository import JobRepository
+
+class FakeDoc:
+    def __init__(self, data, id=None):
+        self.data = data
+        self.id = id
+        self.exists = data is not None
+
+    def to_dict(self):
+        return dict(self.data)
+
+class FakeQuery:
+    def __init__(self, docs, filters=(), after=None, skip=0, limit_to=None, reads=None):
+        self.docs = docs
+        self.filters = filters
+        self.after = after
+        self.skip = skip
+        self.limit_to = limit_to
+        self.reads = reads if reads is not None else []
+
+    def _with(self, **changes):
+        settings = dict(filters=self.filters, after=self.after, skip=self.skip, limit_to=self.limit_to, reads=self.reads)
+        settings.update(changes)
+        return FakeQuery(self.docs, **settings)
+
+    def where(self, field, op, value):
+        return self._with(filters=self.filters + ((field, value),))
+
+    def order_by(self, field):
+        assert field == '__name__'
+        return self
+
+    def start_after(self, values):
+        return self._with(after=values['__name__'])
+
+    def offset(self, count):
+        return self._with(skip=count)
+
+    def limit(self, count):
+        return self._with(limit_to=count)
+
+    def _matches(self):
+        return [(doc_id, data) for doc_id, data in sorted(self.docs.items())
+                if all(data.get(field) == value for field, value in self.filters)
+                and (self.after is None or doc_id > self.after)]
+
+    async def stream(self):
+        matches = self._matches()[self.skip:]
+        for doc_id, data in matches[:self.limit_to] if self.limit_to is not None else matches:
+            await asyncio.sleep(0)
+            self.reads.append(doc_id)
+            yield FakeDoc(data, doc_id)
+
+    def count(self):
+        query = self
+
+        class Aggregation:
+            async def get(self):
+                return [[MagicMock(value=len(query._matches()))]]
+
+        return Aggregation()
+
+    def document(self, job_id):
+        docs = self.docs
+        ref = MagicMock()
+
+        async def get():
+            return FakeDoc(docs.get(job_id))
+
+        async def delete():
+            docs.pop(job_id, None)
+
+        ref.get = get
+        ref.delete = delete
+        return ref
+
+class FakeAsyncClient:
+    def __init__(self, docs):
+        self.docs = docs
+        self.reads = []
+
+    def collection(self, name):
+        return FakeQuery(self.docs, reads=self.reads)
+
+class TestJobRepository(unittest.TestCase):
+    def setUp(self):
+        self.docs = {
+            "job1": {"job_id": "job1", "category": "Product"},
+            "job2": {"job_id": "job2", "category": "DevOps and Sysadmin"},
+        }
+        self.repository = JobRepository('jobs', client=FakeAsyncClient(self.docs))
+
+    def test_list_jobs(self):
+        """Test that every job is streamed from the async client"""
+        jobs = asyncio.run(self.repository.list_jobs())
+
+        self.assertEqual([job["job_id"] for job in jobs], ["job1", "job2"])
+
+    def test_list_by_category(self):
+        """Test that the category filter is passed to the query"""
+        jobs = asyncio.run(self.repository.list_by_category("Product"))
+
+        self.assertEqual(jobs, [{"job_id": "job1", "category": "Product"}])
+
+    def test_page_jobs_reads_one_page(self):
+        """Test that a page is read with a limited query and continued with a cursor"""
+        self.docs.update({f"job{n}": {"job_id": f"job{n}", "category": "Product"} for n in range(3, 8)})
+        client = self.repository.client
+
+        jobs, after = asyncio.run(self.repository.page_jobs(3))
+        self.assertEqual([job["job_id"] for job in jobs], ["job1", "job2", "job3"])
+        self.assertEqual(after, "job3")
+        self.assertEqual(len(client.reads), 4)
+
+        jobs, after = asyncio.run(self.repository.page_jobs(3, after="job3", category="Product"))
+        self.assertEqual([job["job_id"] for job in jobs], ["job4", "job5", "job6"])
+        jobs, after = asyncio.run(self.repository.page_jobs(3, offset=6))
+        self.assertEqual(([job["job_id"] for job in jobs], after), (["job7"], None))
+
+    def test_count_jobs(self):
+        """Test that totals come from an aggregation query without reading documents"""
+        self.assertEqual(asyncio.run(self.repository.count_jobs()), 2)
+        self.assertEqual(asyncio.run(self.repository.count_jobs("Product")), 1)
+        self.assertEqual(self.repository.client.reads, [])
+
+    def test_counts_are_cached_until_stale_or_invalidated(self):
+        """Test that a count is reused within its TTL and dropped when a job of its category changes"""
+        self.assertEqual(asyncio.run(self.repository.count_jobs("Product")), 1)
+        self.docs["job3"] = {"job_id": "job3", "category": "Product"}
+
+        self.assertEqual(asyncio.run(self.repository.count_jobs("Product")), 1)
+        self.assertEqual(asyncio.run(self.repository.count_jobs("Product", max_age=0)), 2)
+
+        self.docs["job4"] = {"job_id": "job4", "category": "Product"}
+        self.repository.invalidate_counts(["DevOps and Sysadmin"])
+        self.assertEqual(asyncio.run(self.repository.count_jobs("Product")), 2)
+        self.repository.invalidate_counts(["Product"])
+        self.assertEqual(asyncio.run(self.repository.count_jobs("Product")), 3)
+
+    def test_delete_invalidates_counts(self):
+        """Test that deleting a job drops the cached totals it was part of"""
+        self.assertEqual(asyncio.run(self.repository.count_jobs()), 2)
+        self.assertEqual(asyncio.run(self.repository.count_jobs("Product")), 1)
+
+        asyncio.run(self.repository.delete_job("job1"))
+
+        self.assertEqual(asyncio.run(self.repository.count_jobs()), 1)
+        self.assertEqual(asyncio.run(self.repository.count_jobs("Product")), 0)
+
+    def test_delete_job(self):
+        """Test that existing jobs are deleted and missing ones reported"""
+        self.assertTrue(asyncio.run(self.repository.delete_job("job1")))
+        self.assertFalse(asyncio.run(self.repository.delete_job("job1")))
+        self.assertIsNone(asyncio.run(self.repository.get_job("job1")))
+        self.assertEqual(asyncio.run(self.repository.get_job("job2"))["category"], "DevOps and Sysadmin")
+
+    @patch('backend.database.job_repository.get_async_firestore_client')
+    def test_shared_client_created_once(self, mock_get_client):
+        """Test that the shared client is looked up on first use only"""
+        mock_get_client.return_value = FakeAsyncClient(self.docs)
+        repository = JobRepository('jobs')
+
+        asyncio.run(repository.list_jobs())
+        asyncio.run(repository.list_jobs())
+
+        mock_get_client.assert_called_once()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import unittest
+import os
+import tempfile
+import urllib.request
+import urllib.error
+
+from backend.scraper.metrics import Metrics, Histogram
+
+class TestHistogram(unittest.TestCase):
+    def test_buckets_and_quantiles(self):
+        """Test that observations land in the first bucket that holds them"""
+        histogram = Histogram(buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.7, 5.0):
+            histogram.observe(value)
+
+        self.assertEqual(histogram.counts, [1, 2, 1])
+        self.assertEqual(histogram.count, 4)
+        self.assertAlmostEqual(histogram.sum, 6.25)
+        self.assertEqual(histogram.quantile(0.5), 1.0)
+        self.assertEqual(histogram.quantile(1.0), float('inf'))
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        self.metrics = Metrics(buckets=(0.1, 1.0))
+
+    def test_timer_records_on_error(self):
+        """Test that a stage is timed even when its block raises"""
+        with self.assertRaises(ValueError):
+            with self.metrics.timer('validate'):
+                raise ValueError("bad job")
+
+        self.assertEqual(self.metrics.stage_count('validate'), 1)
+
+    def test_timed_decorator(self):
+        """Test that a decorated function records every call and keeps its result"""
+        @self.metrics.timed('extract_skills')
+        def extract_skills():
+            return ["Python"]
+
+        self.assertEqual(extract_skills(), ["Python"])
+        extract_skills()
+        self.assertEqual(self.metrics.stage_count('extract_skills'), 2)
+        self.assertEqual(extract_skills.__name__, 'extract_skills')
+
+    def test_render_prometheus_text(self):
+        """Test the Prometheus histogram and counter lines"""
+        self.metrics.observe('page_load', 0.5)
+        self.metrics.observe('page_load', 2.0)
+        self.metrics.count('wait_fallback')
+        self.metrics.count('wait_fallback')
+
+        text = self.metrics.render()
+
+        self.assertIn('# TYPE scraper_stage_seconds histogram', text)
+        self.assertIn('scraper_stage_seconds_bucket{stage="page_load",le="0.1"} 0', text)
+        self.assertIn('scraper_stage_seconds_bucket{stage="page_load",le="1.0"} 1', text)
+        self.assertIn('scraper_stage_seconds_bucket{stage="page_load",le="+Inf"} 2', text)
+        self.assertIn('scraper_stage_seconds_sum{stage="page_load"} 2.500000', text)
+        self.assertIn('scraper_stage_seconds_count{stage="page_load"} 2', text)
+        self.assertIn('scraper_events_total{event="wait_fallback"} 2', text)
+
+    def test_write_replaces_file(self):
+        """Test that the metrics file is written in full and no temp file is left behind"""
+        self.metrics.count('timeout')
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'scraper.prom')
+            self.metrics.write(path)
+
+            with open(path, encoding='utf-8') as f:
+                self.assertIn('scraper_events_total{event="timeout"} 1', f.read())
+            self.assertEqual(os.listdir(tmp), ['scraper.prom'])
+
+    def test_summary_slowest_first(self):
+        """Test that the summary lists the stages by total time and the event counts"""
+        self.metrics.observe('validate', 0.01)
+        self.metrics.observe('page_load', 3.0)
+        self.metrics.count('static_fallback')
+
+        lines = self.metrics.summary().splitlines()
+
+        self.assertTrue(lines[1].startswith('page_load'))
+        self.assertTrue(lines[2].startswith('validate'))
+        self.assertEqual(lines[-1], 'events: static_fallback=1')
+
+    def test_serve(self):
+        """Test the /metrics endpoint"""
+        self.metrics.count('http_backoff')
+        server = self.metrics.serve(0, host='127.0.0.1')
+        try:
+            port = server.server_address[1]
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as response:
+                body = response.read().decode('utf-8')
+            self.assertIn('scraper_events_total{event="http_backoff"} 1', body)
+            with self.assertRaises(urllib.error.HTTPError):
+                urllib.request.urlopen(f"http://127.0.0.1:{port}/other", timeout=5)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import unittest
+import asyncio
+from io import StringIO
+import sys
+
+from backend.scraper.pipeline import Stage, run_pipeline, parse_concurrency
+from backend.scraper.worker_pool import SUCCESS, FAILED, SKIPPED
+
+class TestParseConcurrency(unittest.TestCase):
+    def test_parse_valid_settings(self):
+        """Test parsing STAGE=N settings"""
+        result = parse_concurrency(["fetch=8", "save=2"], ("check", "fetch", "save"))
+
+        self.assertEqual(result, {"fetch": 8, "save": 2})
+
+    def test_parse_none(self):
+        """Test that no settings give an empty mapping"""
+        self.assertEqual(parse_concurrency(None, ("fetch",)), {})
+
+    def test_parse_invalid_settings(self):
+        """Test that unknown stages, bad numbers and zero are rejected"""
+        for value in ["nope=3", "fetch", "fetch=x", "fetch=0"]:
+            with self.assertRaises(ValueError):
+                parse_concurrency([value], ("fetch",))
+
+class TestPipeline(unittest.TestCase):
+    def setUp(self):
+        self.captured_output = StringIO()
+        sys.stdout = self.captured_output
+
+    def tearDown(self):
+        sys.stdout = sys.__stdout__
+
+    def test_items_flow_through_stages(self):
+        """Test that items pass every stage and final statuses are counted"""
+        saved = []
+
+        async def check(item):
+            return SKIPPED if item % 2 else item
+
+        async def double(item):
+            return item * 2
+
+        async def save(item):
+            saved.append(item)
+            return SUCCESS
+
+        stages = [Stage("check", check, 2), Stage("double", double, 3), Stage("save", save, 1)]
+        stats = asyncio.run(run_pipeline(range(10), stages))
+
+        self.assertEqual(sorted(saved), [0, 4, 8, 12, 16])
+        self.assertEqual(stats.successful, 5)
+        self.assertEqual(stats.skipped, 5)
+
+    def test_stage_errors_are_counted_as_failed(self):
+        """Test that a handler exception fails the item without stopping the pipeline"""
+        async def explode(item):
+            if item == 1:
+                raise RuntimeError("boom")
+            return SUCCESS
+
+        stats = asyncio.run(run_pipeline([0, 1, 2], [Stage("explode", explode, 2)]))
+
+        self.assertEqual(stats.failed, 1)
+        self.assertEqual(stats.successful, 2)
+        self.assertIn("Error in explode stage", self.captured_output.getvalue())
+
+    def test_stage_concurrency_is_respected(self):
+        """Test that no stage runs more handlers at once than its concurrency"""
+        running = {"now": 0, "peak": 0}
+
+        async def slow(item):
+            running["now"] += 1
+            running["peak"] = max(running["peak"], running["now"])
+            await asyncio.sleep(0.01)
+            running["now"] -= 1
+            return item
+
+        async def done(item):
+            return SUCCESS
+
+        stats = asyncio.run(run_pipeline(range(12), [Stage("slow", slow, 3), Stage("done", done, 1)]))
+
+        self.assertEqual(running["peak"], 3)
+        self.assertEqual(stats.successful, 12)
+
+    def test_stages_overlap(self):
+        """Test that a later stage starts before an earlier stage has seen every item"""
+        events = []
+
+        async def first(item):
+            events.append(("first", item))
+            await asyncio.sleep(0.01)
+            return item
+
+        async def second(item):
+            events.append(("second", item))
+            return SUCCESS
+
+        asyncio.run(run_pipeline(range(5), [Stage("first", first, 1), Stage("second", second, 1)]))
+
+        self.assertLess(events.index(("second", 0)), events.index(("first", 4)))
+
+    def test_invalid_stage_concurrency(self):
+        """Test that a stage needs at least one worker"""
+        async def handler(item):
+            return item
+
+        with self.assertRaises(ValueError):
+            Stage("bad", handler, 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,200 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import time
+from io import StringIO
+import sys
+
+from backend.scraper.politeness import PolitenessScheduler, parse_retry_after
+from backend.scraper.resilience import TransientError
+
+ROBOTS_WITH_DELAY = """User-agent: *
+Crawl-delay: 5
+Disallow: /private/
+"""
+
+def robots_response(text, status_code=200):
+    response = MagicMock()
+    response.status_code = status_code
+    response.text = text
+    return response
+
+class TestRobots(unittest.TestCase):
+    def setUp(self):
+        self.captured_output = StringIO()
+        sys.stdout = self.captured_output
+
+    def tearDown(self):
+        sys.stdout = sys.__stdout__
+
+    def test_crawl_delay_sets_interval(self):
+        """Test that Crawl-delay from robots.txt paces the host one request at a time"""
+        session = MagicMock()
+        session.get.return_value = robots_response(ROBOTS_WITH_DELAY)
+        scheduler = PolitenessScheduler(session=session)
+
+        _, state = scheduler._host("https://weworkremotely.com/remote-jobs/job1")
+
+        self.assertEqual(state.interval, 5.0)
+        self.assertEqual(state.max_concurrency, 1)
+        session.get.assert_called_once_with("https://weworkremotely.com/robots.txt", timeout=10)
+
+    def test_robots_read_once_per_host(self):
+        """Test that robots.txt is only fetched the first time a host is seen"""
+        session = MagicMock()
+        session.get.return_value = robots_response(ROBOTS_WITH_DELAY)
+        scheduler = PolitenessScheduler(session=session)
+
+        scheduler.allowed("https://weworkremotely.com/remote-jobs/job1")
+        scheduler.allowed("https://weworkremotely.com/remote-jobs/job2")
+
+        session.get.assert_called_once()
+
+    def test_disallowed_paths(self):
+        """Test that Disallow rules are honoured"""
+        session = MagicMock()
+        session.get.return_value = robots_response(ROBOTS_WITH_DELAY)
+        scheduler = PolitenessScheduler(session=session)
+
+        self.assertTrue(scheduler.allowed("https://weworkremotely.com/remote-jobs/job1"))
+        self.assertFalse(scheduler.allowed("https://weworkremotely.com/private/job1"))
+
+    def test_missing_robots_uses_default_delay(self):
+        """Test that a missing robots.txt allows everything at the default delay"""
+        session = MagicMock()
+        session.get.return_value = robots_response("", status_code=404)
+        scheduler = PolitenessScheduler(default_delay=2.0, session=session)
+
+        self.assertTrue(scheduler.allowed("https://example.com/anything"))
+        self.assertEqual(scheduler._host("https://example.com/")[1].interval, 2.0)
+
+    def test_configured_host_pacing(self):
+        """Test that a configured host uses its own delay and concurrency, but robots.txt still wins"""
+        session = MagicMock()
+        session.get.side_effect = lambda url, timeout: robots_response(
+            ROBOTS_WITH_DELAY if "weworkremotely" in url else "", status_code=200 if "weworkremotely" in url else 404)
+        scheduler = PolitenessScheduler(default_delay=1.0, session=session)
+        scheduler.configure_host("jobs.example.org", delay=3.0, max_concurrency=2)
+        scheduler.configure_host("weworkremotely.com", delay=0.5, max_concurrency=8)
+
+        _, configured = scheduler._host("https://jobs.example.org/job1")
+        _, robots = scheduler._host("https://weworkremotely.com/remote-jobs/job1")
+
+        self.assertEqual((configured.interval, configured.max_concurrency), (3.0, 2))
+        self.assertEqual((robots.interval, robots.max_concurrency), (5.0, 1))
+
+class TestPacing(unittest.TestCase):
+    def setUp(self):
+        self.captured_output = StringIO()
+        sys.stdout = self.captured_output
+
+    def tearDown(self):
+        sys.stdout = sys.__stdout__
+
+    def test_token_bucket_spaces_requests(self):
+        """Test that consecutive requests to one host wait for a token"""
+        scheduler = PolitenessScheduler(default_delay=0.05, respect_robots=False)
+        url = "https://example.com/a"
+
+        start_time = time.monotonic()
+        for _ in range(3):
+            with scheduler.request(url):
+                pass
+        elapsed = time.monotonic() - start_time
+
+        self.assertGreaterEqual(elapsed, 0.09)
+
+    def test_hosts_are_paced_independently(self):
+        """Test that one host's delay does not slow another host down"""
+        scheduler = PolitenessScheduler(default_delay=10, respect_robots=False)
+
+        start_time = time.monotonic()
+        with scheduler.request("https://a.example.com/"):
+            pass
+        with scheduler.request("https://b.example.com/"):
+            pass
+
+        self.assertLess(time.monotonic() - start_time, 1)
+
+    def test_backoff_on_429_with_retry_after(self):
+        """Test that a 429 response pauses the host for Retry-After seconds"""
+        scheduler = PolitenessScheduler(default_delay=0, respect_robots=False)
+        url = "https://example.com/a"
+        with scheduler.request(url):
+            pass
+
+        response = MagicMock(url=url, status_code=429, headers={'Retry-After': '0.1'})
+        scheduler.observe_response(response)
+
+        start_time = time.monotonic()
+        with scheduler.request(url):
+            pass
+        self.assertGreaterEqual(time.monotonic() - start_time, 0.09)
+        self.assertIn("backing off", self.captured_output.getvalue())
+
+    def test_backoff_on_error_status(self):
+        """Test that an error carrying a 5xx status, e.g. from a browser page load, backs off the host"""
+        scheduler = PolitenessScheduler(default_delay=0, max_concurrency=4, respect_robots=False)
+        url = "https://example.com/a"
+        _, state = scheduler._host(url)
+        state.concurrency = 4.0
+
+        with self.assertRaises(TransientError):
+            with scheduler.request(url):
+                raise TransientError("HTTP 503 loading page", status_code=503)
+
+        self.assertEqual(state.consecutive_errors, 1)
+        self.assertEqual(state.concurrency, 2.0)
+        self.assertEqual(state.in_flight, 0)
+        self.assertIn("backing off", self.captured_output.getvalue())
+
+    def test_aimd_concurrency(self):
+        """Test additive increase on fast responses and multiplicative decrease on slow ones"""
+        scheduler = PolitenessScheduler(default_delay=0, max_concurrency=4, target_latency=1.0, respect_robots=False)
+        url = "https://example.com/a"
+        _, state = scheduler._host(url)
+
+        for _ in range(10):
+            scheduler.wait(url)
+            scheduler.done(url, latency=0.1)
+        self.assertEqual(state.concurrency, 4)
+
+        scheduler.wait(url)
+        scheduler.done(url, latency=5.0)
+        self.assertEqual(state.concurrency, 2)
+
+    def test_errors_halve_concurrency(self):
+        """Test that a 5xx response halves the host's concurrency"""
+        scheduler = PolitenessScheduler(default_delay=0, max_concurrency=4, respect_robots=False)
+        url = "https://example.com/a"
+        _, state = scheduler._host(url)
+        state.concurrency = 4.0
+
+        scheduler.wait(url)
+        scheduler.done(url, latency=0.1, status_code=503, retry_after=0)
+
+        self.assertEqual(state.concurrency, 2.0)
+        self.assertEqual(state.consecutive_errors, 1)
+
+    def test_attach_adds_response_hook(self):
+        """Test that attach() registers the scheduler as a response hook"""
+        scheduler = PolitenessScheduler(respect_robots=False)
+        session = MagicMock()
+        session.hooks = {'response': []}
+
+        scheduler.attach(session)
+
+        self.assertEqual(session.hooks['response'], [scheduler.observe_response])
+
+class TestRetryAfter(unittest.TestCase):
+    def test_seconds(self):
+        self.assertEqual(parse_retry_after("120"), 120.0)
+
+    def test_http_date_in_the_past(self):
+        self.assertEqual(parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0.0)
+
+    def test_invalid(self):
+        self.assertIsNone(parse_retry_after("soon"))
+        self.assertIsNone(parse_retry_after(None))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,158 @@
+import unittest
+from unittest.mock import patch, MagicMock
+from io import StringIO
+import sys
+import threading
+import time
+import requests
+from google.api_core import exceptions as google_exceptions
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
+
+from backend.scraper.resilience import (
+    CircuitBreaker, RetryPolicy, TransientError, backoff_delay, is_retryable, CLOSED, OPEN, HALF_OPEN
+)
+
+class TestClassification(unittest.TestCase):
+    def test_transient_errors(self):
+        """Test that timeouts, connection errors, 5xx and unavailable Firestore are retryable"""
+        response = MagicMock(status_code=503)
+        for error in (
+            TransientError("x"), TimeoutException("slow"), WebDriverException("net::ERR_CONNECTION_RESET"),
+            requests.exceptions.ConnectionError("down"), requests.exceptions.HTTPError(response=response),
+            google_exceptions.ServiceUnavailable("unavailable"), google_exceptions.DeadlineExceeded("deadline"),
+        ):
+            self.assertTrue(is_retryable(error), error)
+
+    def test_permanent_errors(self):
+        """Test that bad data, missing elements, conflicts and 404s are not retried"""
+        response = MagicMock(status_code=404)
+        for error in (
+            ValueError("bad"), NoSuchElementException("missing"), requests.exceptions.HTTPError(response=response),
+            google_exceptions.Conflict("exists"), google_exceptions.PermissionDenied("denied"),
+        ):
+            self.assertFalse(is_retryable(error), error)
+
+    def test_backoff_delay_is_capped_and_jittered(self):
+        """Test that the backoff grows exponentially up to the cap"""
+        with patch('backend.scraper.resilience.random.uniform', side_effect=lambda low, high: high):
+            self.assertEqual([backoff_delay(n, 1.0, 5.0) for n in range(1, 5)], [1.0, 2.0, 4.0, 5.0])
+        self.assertLessEqual(backoff_delay(3, 1.0, 5.0), 4.0)
+
+class TestCircuitBreaker(unittest.TestCase):
+    def setUp(self):
+        self.captured_output = StringIO()
+        sys.stdout = self.captured_output
+
+    def tearDown(self):
+        sys.stdout = sys.__stdout__
+
+    def test_opens_after_threshold_and_recovers(self):
+        """Test that the circuit opens, lets one probe through after the timeout, and closes on success"""
+        breaker = CircuitBreaker('site', failure_threshold=2, reset_timeout=0.05)
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CLOSED)
+        breaker.record_failure()
+        self.assertEqual(breaker.state, OPEN)
+
+        start_time = time.monotonic()
+        breaker.acquire()
+        self.assertGreaterEqual(time.monotonic() - start_time, 0.04)
+        self.assertEqual(breaker.state, HALF_OPEN)
+
+        breaker.record_success()
+        self.assertEqual(breaker.state, CLOSED)
+        self.assertIn("pausing", self.captured_output.getvalue())
+
+    def test_failed_probe_reopens_for_longer(self):
+        """Test that a failing probe opens the circuit again with a doubled timeout"""
+        breaker = CircuitBreaker('firestore', failure_threshold=1, reset_timeout=0.01)
+        breaker.record_failure()
+        breaker.acquire()
+        breaker.record_failure()
+
+        self.assertEqual(breaker.state, OPEN)
+        self.assertAlmostEqual(breaker._open_for, 0.02)
+
+    def test_other_callers_wait_for_probe(self):
+        """Test that only one caller passes a half-open circuit until the probe finishes"""
+        breaker = CircuitBreaker('site', failure_threshold=1, reset_timeout=0.01)
+        breaker.record_failure()
+        breaker.acquire()  # The probe
+        passed = threading.Event()
+        waiter = threading.Thread(target=lambda: (breaker.acquire(), passed.set()), daemon=True)
+        waiter.start()
+
+        self.assertFalse(passed.wait(0.1))
+        breaker.record_success()
+        self.assertTrue(passed.wait(1))
+
+    def test_interrupted_probe_is_released(self):
+        """Test that a probe interrupted by KeyboardInterrupt lets the next caller probe"""
+        breaker = CircuitBreaker('site', failure_threshold=1, reset_timeout=0.01)
+        policy = RetryPolicy('site', attempts=1, breaker=breaker)
+        breaker.record_failure()
+        time.sleep(0.02)
+
+        with self.assertRaises(KeyboardInterrupt):
+            policy.call(MagicMock(side_effect=KeyboardInterrupt))
+        self.assertEqual(breaker.state, HALF_OPEN)
+        self.assertEqual(policy.call(MagicMock(return_value="ok")), "ok")
+        self.assertEqual(breaker.state, CLOSED)
+
+@patch('backend.scraper.resilience.time.sleep')
+class TestRetryPolicy(unittest.TestCase):
+    def setUp(self):
+        self.captured_output = StringIO()
+        sys.stdout = self.captured_output
+
+    def tearDown(self):
+        sys.stdout = sys.__stdout__
+
+    def test_retries_transient_errors(self, mock_sleep):
+        """Test that a transient failure is retried after a backoff"""
+        fn = MagicMock(side_effect=[TransientError("503"), "ok"])
+        policy = RetryPolicy('site', attempts=3, base_delay=1.0)
+
+        self.assertEqual(policy.call(fn, "url"), "ok")
+        self.assertEqual(fn.call_count, 2)
+        fn.assert_called_with("url")
+        mock_sleep.assert_called_once()
+
+    def test_gives_up_after_attempts(self, mock_sleep):
+        """Test that the last transient error is raised when every attempt failed"""
+        fn = MagicMock(side_effect=TransientError("503"))
+        breaker = CircuitBreaker('site', failure_threshold=10)
+        policy = RetryPolicy('site', attempts=3, breaker=breaker)
+
+        with self.assertRaises(TransientError):
+            policy.call(fn)
+        self.assertEqual(fn.call_count, 3)
+        self.assertEqual(mock_sleep.call_count, 2)
+        self.assertEqual(breaker.failures, 3)
+
+    def test_permanent_error_not_retried(self, mock_sleep):
+        """Test that a permanent error is raised at once and does not count against the breaker"""
+        fn = MagicMock(side_effect=ValueError("bad"))
+        breaker = CircuitBreaker('firestore', failure_threshold=1)
+        policy = RetryPolicy('firestore', breaker=breaker)
+
+        with self.assertRaises(ValueError):
+            policy.call(fn)
+        fn.assert_called_once()
+        mock_sleep.assert_not_called()
+        self.assertEqual(breaker.state, CLOSED)
+
+    def test_scoped_policies_have_their_own_breaker(self, mock_sleep):
+        """Test that a key whose breaker opened does not pause the other keys"""
+        policy = RetryPolicy('site', attempts=1, breaker=CircuitBreaker('site', failure_threshold=1))
+        wwr = policy.scoped('wwr')
+
+        with self.assertRaises(TransientError):
+            wwr.call(MagicMock(side_effect=TransientError("503")))
+        self.assertEqual(wwr.breaker.state, OPEN)
+        self.assertIs(policy.scoped('wwr'), wwr)
+        self.assertEqual(policy.scoped('remotive').call(MagicMock(return_value="ok")), "ok")
+        self.assertEqual(policy.breaker.state, CLOSED)
+
+if __name__ == '__main__':
+    unittest.main()
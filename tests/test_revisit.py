@@ -0,0 +1,110 @@
+import unittest
+from unittest.mock import patch
+import os
+import tempfile
+from io import StringIO
+import sys
+
+from backend.scraper.revisit import JobHashes, changed_fields, load_job_hashes
+from backend.scraper.schema import add_content_hashes, field_hashes
+
+def make_job(**overrides):
+    job = {
+        "job_id": "acme-backend-engineer", "title": "Backend Engineer", "company": "Acme",
+        "company_about": "About Acme", "apply_url": "https://acme.example/apply",
+        "apply_before": "Apr 30, 2025", "job_description": "Build things", "category": "Back-End Programming",
+        "region": ["Anywhere in the World"], "salary_range": "$100,000 or more USD",
+        "countries": [], "skills": ["Python", "SQL"], "timezones": ["UTC"],
+    }
+    job.update(overrides)
+    return job
+
+class TestContentHashes(unittest.TestCase):
+    def test_normalized_content(self):
+        """Test that whitespace and list order do not change the hashes"""
+        reformatted = make_job(job_description="  Build\n  things ", skills=["SQL", "Python"], timestamp=object())
+
+        self.assertEqual(field_hashes(reformatted), field_hashes(make_job()))
+        self.assertNotEqual(field_hashes(make_job(salary_range="$50,000"))['salary_range'],
+                            field_hashes(make_job())['salary_range'])
+
+    def test_unchanged_job_needs_no_write(self):
+        """Test that a revisit of an unchanged job produces no update"""
+        stored = add_content_hashes(make_job())
+
+        self.assertEqual(changed_fields(make_job(), stored['field_hashes']), {})
+
+    def test_only_changed_fields_written(self):
+        """Test that an edited job gets a field-level update"""
+        stored = add_content_hashes(make_job())
+
+        update = changed_fields(make_job(apply_before="May 31, 2025"), stored['field_hashes'])
+
+        self.assertEqual(update['apply_before'], "May 31, 2025")
+        self.assertEqual(set(update), {'apply_before', 'field_hashes', 'content_hash'})
+        self.assertNotEqual(update['content_hash'], stored['content_hash'])
+
+    def test_job_without_hashes_gets_full_update(self):
+        """Test that jobs saved before hashing get every content field once"""
+        update = changed_fields(make_job(), None)
+
+        self.assertEqual(update['title'], "Backend Engineer")
+        self.assertIn('content_hash', update)
+        self.assertNotIn('job_id', update)
+
+class TestJobHashes(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "hashes.sqlite3")
+        self.hashes = JobHashes(self.path)
+
+    def tearDown(self):
+        self.hashes.close()
+        self.tmpdir.cleanup()
+
+    def test_due_oldest_first(self):
+        """Test that unchecked jobs are due first and checked jobs wait for max_age"""
+        job = add_content_hashes(make_job())
+        self.hashes.replace({"job1": {}, "job2": {}, job["job_id"]: job})
+        self.hashes.record("job1")
+
+        self.assertEqual(self.hashes.due(max_age=60), ["job2", job["job_id"]])
+        self.assertEqual(self.hashes.due(max_age=-1)[-1], "job1")
+        self.assertEqual(self.hashes.due(max_age=60, limit=1), ["job2"])
+        self.assertEqual(self.hashes.get(job["job_id"])[1], job["field_hashes"])
+        self.assertEqual(self.hashes.get("job2"), (None, None))
+
+    def test_replace_keeps_check_times(self):
+        """Test that a refresh from Firestore drops deleted jobs and keeps check times"""
+        self.hashes.replace({"job1": {}, "job2": {}})
+        self.hashes.record("job1")
+        self.hashes.replace({"job1": {}, "job3": {}})
+
+        self.assertEqual(len(self.hashes), 2)
+        self.assertEqual(self.hashes.due(max_age=60), ["job3"])
+
+class TestLoadJobHashes(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "hashes.sqlite3")
+        self.captured_output = StringIO()
+        sys.stdout = self.captured_output
+
+    def tearDown(self):
+        sys.stdout = sys.__stdout__
+        self.tmpdir.cleanup()
+
+    @patch('backend.scraper.revisit.list_document_fields')
+    def test_refreshes_when_stale(self, mock_list):
+        """Test that the hashes are loaded with a projection query"""
+        mock_list.return_value = {"job1": {}}
+
+        hashes = load_job_hashes('jobs', path=self.path)
+        load_job_hashes('jobs', path=self.path).close()
+
+        mock_list.assert_called_once_with('jobs', ['content_hash', 'field_hashes'])
+        self.assertEqual(len(hashes), 1)
+        hashes.close()
+
+if __name__ == '__main__':
+    unittest.main()
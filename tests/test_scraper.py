@@ -5,6 +5,7 @@ import json
 import time
 from io import StringIO
 import sys
+import tempfile
 from pathlib import Path
 from xml.etree import ElementTree
 import argparse
@@ -12,15 +13,25 @@ import requests
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException, WebDriverException
 
 # Import the module to test
 from backend.scraper.scraper import (
     get_driver, parse_sitemap, check_for_json_data, get_text_safely, 
     get_elements_safely, extract_region, extract_salary, extract_countries,
     extract_skills, extract_timezones, extract_job_data, process_json_job_data,
-    exists_in_firestore, save_to_firestore, test_scrape, main
+    exists_in_firestore, save_to_firestore, test_scrape, main,
+    extract_job_data_with_fallback, run_pipeline_crawl, process_job_url, configure_browser,
+    render_and_extract, reextract_from_archive, revisit_job, revisit_jobs, SNAPSHOT_TEXT_SELECTORS, finish_listing,
+    driver_pool, create_scheduler
 )
+from backend.scraper.archive import PageArchive
+from backend.scraper.frontier import Frontier
+from backend.scraper.revisit import JobHashes
+from backend.scraper.schema import add_content_hashes
+from backend.scraper.metrics import metrics
+from backend.scraper.resilience import RetryPolicy, TransientError
+from google.api_core import exceptions as google_exceptions
 
 class TestDriverSetup(unittest.TestCase):
     @patch('backend.scraper.scraper.webdriver')
@@ -948,11 +959,13 @@ class TestJobDataExtraction(unittest.TestCase):
         # Configure driver.get to raise exception
         mock_driver.get.side_effect = TimeoutException("Page load timeout")
         
-        # Test extraction with error
-        result = extract_job_data("https://weworkremotely.com/remote-jobs/test-job", mock_driver)
+        # A page load timeout is transient and raised for the caller to retry
+        with self.assertRaises(TransientError):
+            extract_job_data("https://weworkremotely.com/remote-jobs/test-job", mock_driver)
         
-        # Assertions
-        self.assertIsNone(result)
+        # A missing element is not
+        mock_driver.get.side_effect = NoSuchElementException("Not found")
+        self.assertIsNone(extract_job_data("https://weworkremotely.com/remote-jobs/test-job", mock_driver))
         
     @patch('backend.scraper.scraper.WebDriverWait')
     def test_extract_job_data_general_exception(self, mock_wait):
@@ -970,6 +983,9 @@ class TestJobDataExtraction(unittest.TestCase):
         self.assertIsNone(result)
 
 class TestJsonJobProcessing(unittest.TestCase):
+    def tearDown(self):
+        driver_pool.close()
+
     @patch('backend.scraper.scraper.get_driver')
     @patch('backend.scraper.scraper.WebDriverWait')
     @patch('backend.scraper.scraper.get_text_safely')
@@ -1027,7 +1043,13 @@ class TestJsonJobProcessing(unittest.TestCase):
         # Assertions
         self.assertEqual(result["job_id"], "test-job")
         mock_get_driver.assert_called_once()
-        mock_driver.quit.assert_called_once()  # Should quit the driver it created
+        mock_driver.quit.assert_not_called()  # The borrowed driver stays warm in the pool
+        
+        # The next call reuses it
+        process_json_job_data(json_data, "https://weworkremotely.com/remote-jobs/test-job")
+        mock_get_driver.assert_called_once()
+        driver_pool.close()
+        mock_driver.quit.assert_called_once()
         
     @patch('backend.scraper.scraper.get_driver')
     def test_process_json_job_data_minimal(self, mock_get_driver):
@@ -1170,6 +1192,7 @@ class TestJsonJobProcessing(unittest.TestCase):
         self.assertEqual(result["job_id"], "test-job")
         self.assertEqual(result["title"], "Test Job")
         self.assertEqual(result["company_about"], "")  # Should still have default values
+        driver_pool.close()
         mock_driver.quit.assert_called_once()  # Should quit the driver
 
 class TestFirestoreInteractions(unittest.TestCase):
@@ -1213,7 +1236,7 @@ class TestFirestoreInteractions(unittest.TestCase):
         
         # Assertions
         self.assertTrue(result)
-        mock_save.assert_called_once_with('jobs', job_data, dry_run=False)
+        mock_save.assert_called_once_with('jobs', job_data, dry_run=False, raise_errors=True)
         
     @patch('backend.scraper.scraper.save_to_collection')
     def test_save_to_firestore_failure(self, mock_save):
@@ -1229,7 +1252,7 @@ class TestFirestoreInteractions(unittest.TestCase):
         
         # Assertions
         self.assertFalse(result)
-        mock_save.assert_called_once_with('jobs', job_data, dry_run=False)
+        mock_save.assert_called_once_with('jobs', job_data, dry_run=False, raise_errors=True)
         
     @patch('backend.scraper.scraper.save_to_collection')
     def test_save_to_firestore_dry_run(self, mock_save):
@@ -1245,7 +1268,7 @@ class TestFirestoreInteractions(unittest.TestCase):
         
         # Assertions
         self.assertTrue(result)
-        mock_save.assert_called_once_with('jobs', job_data, dry_run=True)
+        mock_save.assert_called_once_with('jobs', job_data, dry_run=True, raise_errors=True)
 
 class TestScrapingFunctions(unittest.TestCase):
     @patch('backend.scraper.scraper.get_driver')
@@ -1698,5 +1721,651 @@ class TestCommandLineInterface(unittest.TestCase):
         mock_main.assert_called_once()
         mock_test_scrape.assert_not_called()
 
+class TestStaticEngine(unittest.TestCase):
+    @patch('backend.scraper.scraper.extract_job_data')
+    @patch('backend.scraper.scraper.extract_job_data_static')
+    def test_fallback_not_needed(self, mock_static, mock_extract):
+        """Test that the browser is not used when the static parse succeeds"""
+        mock_static.return_value = {"job_id": "job1", "title": "Job 1"}
+        get_fallback_driver = MagicMock()
+        
+        result = extract_job_data_with_fallback("https://weworkremotely.com/remote-jobs/job1", MagicMock(), get_fallback_driver)
+        
+        self.assertEqual(result["title"], "Job 1")
+        get_fallback_driver.assert_not_called()
+        mock_extract.assert_not_called()
+        
+    @patch('backend.scraper.scraper.extract_job_data')
+    @patch('backend.scraper.scraper.extract_job_data_static')
+    def test_fallback_to_selenium(self, mock_static, mock_extract):
+        """Test that Selenium is used when the static parse fails"""
+        mock_static.return_value = None
+        mock_driver = MagicMock()
+        mock_extract.return_value = {"job_id": "job1", "title": "Job 1"}
+        
+        captured_output = StringIO()
+        sys.stdout = captured_output
+        result = extract_job_data_with_fallback("https://weworkremotely.com/remote-jobs/job1", MagicMock(), lambda: mock_driver)
+        sys.stdout = sys.__stdout__
+        
+        self.assertEqual(result["job_id"], "job1")
+        mock_extract.assert_called_once_with("https://weworkremotely.com/remote-jobs/job1", mock_driver)
+        self.assertIn("falling back to Selenium", captured_output.getvalue())
+        
+    @patch('backend.scraper.scraper.get_driver')
+    @patch('backend.scraper.scraper.parse_sitemap')
+    @patch('backend.scraper.scraper.exists_in_firestore')
+    @patch('backend.scraper.scraper.extract_job_data_static')
+    @patch('backend.scraper.scraper.validate_job_data')
+    @patch('backend.scraper.scraper.save_to_firestore')
+    @patch('backend.scraper.scraper.time.sleep')
+    def test_main_static_engine_skips_browser(self, mock_sleep, mock_save, mock_validate,
+                                              mock_static, mock_exists, mock_parse, mock_get_driver):
+        """Test that main with the static engine never starts Chrome when parsing succeeds"""
+        mock_parse.return_value = ["https://weworkremotely.com/remote-jobs/job1"]
+        mock_exists.return_value = False
+        mock_static.return_value = {"job_id": "job1", "title": "Job 1", "company": "Company 1"}
+        mock_validate.return_value = mock_static.return_value
+        mock_save.return_value = True
+        
+        captured_output = StringIO()
+        sys.stdout = captured_output
+        main(engine='static')
+        sys.stdout = sys.__stdout__
+        
+        mock_get_driver.assert_not_called()
+        mock_save.assert_called_once()
+        self.assertIn("Success: 1", captured_output.getvalue())
+
+class TestParallelCrawl(unittest.TestCase):
+    @patch('backend.scraper.scraper.get_driver')
+    @patch('backend.scraper.scraper.parse_sitemap')
+    @patch('backend.scraper.scraper.exists_in_firestore')
+    @patch('backend.scraper.scraper.extract_job_data')
+    @patch('backend.scraper.scraper.validate_job_data')
+    @patch('backend.scraper.scraper.save_to_firestore')
+    @patch('backend.scraper.scraper.time.sleep')
+    def test_main_with_workers(self, mock_sleep, mock_save, mock_validate,
+                               mock_extract, mock_exists, mock_parse, mock_get_driver):
+        """Test that main with several workers starts one driver per busy worker and quits them all"""
+        drivers = []
+        def new_driver():
+            driver = MagicMock()
+            drivers.append(driver)
+            return driver
+        mock_get_driver.side_effect = new_driver
+        
+        mock_parse.return_value = [f"https://weworkremotely.com/remote-jobs/job{n}" for n in range(6)]
+        mock_exists.side_effect = lambda job_id: job_id == "job0"
+        mock_extract.side_effect = lambda url, driver: {"job_id": url.split('/')[-1], "title": "Job", "company": "Company"}
+        mock_validate.side_effect = lambda data: data
+        mock_save.return_value = True
+        
+        captured_output = StringIO()
+        sys.stdout = captured_output
+        main(workers=2, delay=0)
+        sys.stdout = sys.__stdout__
+        
+        self.assertEqual(mock_extract.call_count, 5)
+        self.assertLessEqual(len(drivers), 2)
+        for driver in drivers:
+            driver.quit.assert_called_once()
+        self.assertIn("Success: 5 | ❌ Failed: 0 | ⏩ Skipped: 1", captured_output.getvalue())
+
+class TestPipelineCrawl(unittest.TestCase):
+    @patch('backend.scraper.politeness.PolitenessScheduler.load_robots', return_value=None)
+    @patch('backend.scraper.scraper.get_driver')
+    @patch('backend.scraper.scraper.stream_sitemap')
+    @patch('backend.scraper.scraper.exists_in_firestore')
+    @patch('backend.scraper.scraper.fetch_listing_html')
+    @patch('backend.scraper.scraper.parse_job_html')
+    @patch('backend.scraper.scraper.extract_job_data')
+    @patch('backend.scraper.scraper.save_to_firestore')
+    def test_run_pipeline_crawl_static(self, mock_save, mock_extract, mock_parse_html,
+                                       mock_fetch, mock_exists, mock_parse, mock_get_driver, mock_robots):
+        """Test the pipeline crawl: skip existing, parse statically, fall back to Selenium, save"""
+        mock_get_driver.return_value = MagicMock()
+        mock_parse.return_value = (f"https://weworkremotely.com/remote-jobs/job{n}" for n in range(4))
+        mock_exists.side_effect = lambda job_id: job_id == "job0"
+        mock_fetch.return_value = "<html></html>"
+        # job3 cannot be parsed statically and goes through the browser
+        mock_parse_html.side_effect = lambda html, url: None if url.endswith("job3") else {
+            "job_id": url.split('/')[-1], "title": "Job", "company": "Company", "company_about": "",
+            "apply_url": url, "apply_before": "", "job_description": "", "category": "Product", "region": []
+        }
+        mock_extract.return_value = None
+        mock_save.return_value = True
+        
+        captured_output = StringIO()
+        sys.stdout = captured_output
+        stats = run_pipeline_crawl(engine='static', concurrency={'fetch': 2}, delay=0)
+        sys.stdout = sys.__stdout__
+        
+        self.assertEqual(stats.skipped, 1)
+        self.assertEqual(stats.successful, 2)
+        self.assertEqual(stats.failed, 1)
+        mock_extract.assert_called_once()
+        self.assertEqual(mock_save.call_count, 2)
+        mock_get_driver.return_value.quit.assert_called_once()
+        self.assertIn("Scraping completed", captured_output.getvalue())
+
+class TestPoliteness(unittest.TestCase):
+    @patch('backend.scraper.scraper.exists_in_firestore')
+    @patch('backend.scraper.scraper.extract_with_engine')
+    def test_skipped_urls_cost_no_delay(self, mock_extract, mock_exists):
+        """Test that existing jobs never wait on the scheduler"""
+        mock_exists.return_value = True
+        scheduler = MagicMock()
+        
+        status = process_job_url("https://weworkremotely.com/remote-jobs/job1", 2, 3, MagicMock(), scheduler=scheduler)
+        
+        self.assertEqual(status, 'skipped')
+        scheduler.request.assert_not_called()
+        scheduler.allowed.assert_not_called()
+        mock_extract.assert_not_called()
+        
+    @patch('backend.scraper.scraper.exists_in_firestore')
+    @patch('backend.scraper.scraper.extract_with_engine')
+    def test_disallowed_urls_are_skipped(self, mock_extract, mock_exists):
+        """Test that URLs disallowed by robots.txt are not fetched"""
+        mock_exists.return_value = False
+        scheduler = MagicMock()
+        scheduler.allowed.return_value = False
+        
+        captured_output = StringIO()
+        sys.stdout = captured_output
+        status = process_job_url("https://weworkremotely.com/remote-jobs/job1", 1, 1, MagicMock(), scheduler=scheduler)
+        sys.stdout = sys.__stdout__
+        
+        self.assertEqual(status, 'skipped')
+        mock_extract.assert_not_called()
+        self.assertIn("Disallowed by robots.txt", captured_output.getvalue())
+        
+    @patch('backend.scraper.scraper.exists_in_firestore')
+    @patch('backend.scraper.scraper.extract_with_engine')
+    @patch('backend.scraper.scraper.validate_job_data')
+    @patch('backend.scraper.scraper.save_to_firestore')
+    def test_fetches_go_through_scheduler(self, mock_save, mock_validate, mock_extract, mock_exists):
+        """Test that page requests are wrapped in a scheduler slot"""
+        mock_exists.return_value = False
+        mock_extract.return_value = {"job_id": "job1", "title": "Job 1", "company": "Company 1"}
+        mock_validate.return_value = mock_extract.return_value
+        mock_save.return_value = True
+        scheduler = MagicMock()
+        scheduler.allowed.return_value = True
+        
+        status = process_job_url("https://weworkremotely.com/remote-jobs/job1", 2, 3, MagicMock(), scheduler=scheduler)
+        
+        self.assertEqual(status, 'success')
+        scheduler.request.assert_called_once_with("https://weworkremotely.com/remote-jobs/job1")
+
+class TestSeenCache(unittest.TestCase):
+    @patch('backend.scraper.scraper.get_driver')
+    @patch('backend.scraper.scraper.parse_sitemap')
+    @patch('backend.scraper.scraper.exists_in_firestore')
+    @patch('backend.scraper.scraper.extract_job_data')
+    @patch('backend.scraper.scraper.validate_job_data')
+    @patch('backend.scraper.scraper.save_to_firestore')
+    def test_main_with_seen_set(self, mock_save, mock_validate, mock_extract,
+                                mock_exists, mock_parse, mock_get_driver):
+        """Test that a preloaded seen-set replaces the per-URL Firestore reads"""
+        mock_get_driver.return_value = MagicMock()
+        mock_parse.return_value = [
+            "https://weworkremotely.com/remote-jobs/job1",
+            "https://weworkremotely.com/remote-jobs/job2"
+        ]
+        mock_extract.return_value = {"job_id": "job2", "title": "Job 2", "company": "Company 2"}
+        mock_validate.return_value = mock_extract.return_value
+        mock_save.return_value = True
+        seen = {"job1"}
+        seen_set = MagicMock()
+        seen_set.__contains__.side_effect = lambda job_id: job_id in seen
+        seen_set.add.side_effect = seen.add
+        
+        captured_output = StringIO()
+        sys.stdout = captured_output
+        main(delay=0, seen=seen_set)
+        sys.stdout = sys.__stdout__
+        
+        mock_exists.assert_not_called()
+        mock_extract.assert_called_once_with("https://weworkremotely.com/remote-jobs/job2", mock_get_driver.return_value)
+        self.assertIn("job2", seen)
+        self.assertIn("Success: 1 | ❌ Failed: 0 | ⏩ Skipped: 1", captured_output.getvalue())
+
+class TestCrawlFrontier(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.frontier = Frontier(os.path.join(self.tmpdir.name, "frontier.sqlite3"))
+        self.urls = [f"https://weworkremotely.com/remote-jobs/job{n}" for n in range(1, 4)]
+        self.captured_output = StringIO()
+        sys.stdout = self.captured_output
+
+    def tearDown(self):
+        sys.stdout = sys.__stdout__
+        self.frontier.close()
+        self.tmpdir.cleanup()
+
+    @patch('backend.scraper.scraper.get_driver')
+    @patch('backend.scraper.scraper.parse_sitemap')
+    @patch('backend.scraper.scraper.process_job_url')
+    def test_main_resumes_interrupted_crawl(self, mock_process, mock_parse, mock_get_driver):
+        """Test that --resume continues after the last completed URL without reading the sitemap"""
+        mock_parse.return_value = self.urls
+        mock_process.side_effect = ['success', KeyboardInterrupt()]
+        
+        with self.assertRaises(KeyboardInterrupt):
+            main(delay=0, frontier=self.frontier)
+        
+        mock_parse.reset_mock()
+        mock_process.reset_mock(side_effect=True)
+        mock_process.return_value = 'success'
+        main(delay=0, frontier=self.frontier, resume=True)
+        
+        mock_parse.assert_not_called()
+        self.assertEqual([c.args[0] for c in mock_process.call_args_list], self.urls[1:])
+        self.assertIn("Resuming crawl: 2 pending, 1 done", self.captured_output.getvalue())
+        self.assertFalse(self.frontier.begin(resume=True))
+
+    @patch('backend.scraper.scraper.site_retry', RetryPolicy('site', attempts=1))
+    @patch('backend.scraper.scraper.get_driver')
+    @patch('backend.scraper.scraper.parse_sitemap')
+    @patch('backend.scraper.scraper.exists_in_firestore', return_value=False)
+    @patch('backend.scraper.scraper.extract_with_engine')
+    @patch('backend.scraper.scraper.validate_job_data', side_effect=lambda data: data)
+    @patch('backend.scraper.scraper.save_to_firestore', return_value=True)
+    def test_transient_failure_requeued_in_same_run(self, mock_save, mock_validate, mock_extract,
+                                                    mock_exists, mock_parse, mock_get_driver):
+        """Test that a URL failing with a transient error is queued again and retried after the others"""
+        mock_parse.return_value = self.urls[:2]
+        job = {"job_id": "job", "title": "Engineer", "company": "Acme"}
+        mock_extract.side_effect = [TransientError("HTTP 503"), job, job]
+        
+        main(engine='static', delay=0, frontier=self.frontier)
+        
+        self.assertEqual([c.args[0] for c in mock_extract.call_args_list], [self.urls[0], self.urls[1], self.urls[0]])
+        self.assertEqual(mock_save.call_count, 2)
+        self.assertIn("Success: 2 | ❌ Failed: 0 | ⏩ Skipped: 0 | 🔁 Retried: 1", self.captured_output.getvalue())
+
+    @patch('backend.scraper.scraper.firestore_retry', RetryPolicy('firestore', attempts=1))
+    @patch('backend.scraper.scraper.save_to_collection')
+    @patch('backend.scraper.scraper.validate_job_data', side_effect=lambda data: data)
+    @patch('backend.scraper.scraper.extract_with_engine')
+    def test_unavailable_firestore_returns_retry(self, mock_extract, mock_validate, mock_save):
+        """Test that a save failing with a transient Firestore error is retried later instead of failed"""
+        mock_extract.return_value = {"job_id": "job1", "title": "Engineer", "company": "Acme"}
+        mock_save.side_effect = google_exceptions.ServiceUnavailable("unavailable")
+        
+        status = process_job_url(self.urls[0], 1, 1, MagicMock(), seen=set())
+        
+        self.assertEqual(status, 'retry')
+        self.assertEqual(finish_listing(None, self.urls[0], status), 'failed')
+
+class TestBatchedWrites(unittest.TestCase):
+    @patch('backend.scraper.scraper.IngestWriter')
+    @patch('backend.scraper.scraper.get_driver')
+    @patch('backend.scraper.scraper.parse_sitemap')
+    @patch('backend.scraper.scraper.extract_job_data')
+    @patch('backend.scraper.scraper.validate_job_data')
+    @patch('backend.scraper.scraper.save_to_firestore')
+    def test_main_with_batch_writes(self, mock_save, mock_validate, mock_extract, mock_parse,
+                                    mock_get_driver, mock_writer_class):
+        """Test that new jobs go to the batched writer and its results reach the counters"""
+        mock_parse.return_value = [
+            "https://weworkremotely.com/remote-jobs/job1",
+            "https://weworkremotely.com/remote-jobs/job2"
+        ]
+        mock_extract.side_effect = lambda url, driver: {"job_id": url.split('/')[-1], "title": "Job", "company": "Co"}
+        mock_validate.side_effect = lambda data: data
+        buffered = []
+        writer = mock_writer_class.return_value
+        writer.add.side_effect = lambda data, url: buffered.append(url)
+        
+        def flush():
+            on_result = mock_writer_class.call_args[1]['on_result']
+            on_result(buffered[0], 'success')
+            on_result(buffered[1], 'duplicate')
+            buffered.clear()
+        writer.flush.side_effect = flush
+        
+        captured_output = StringIO()
+        sys.stdout = captured_output
+        main(delay=0, seen=set(), batch_writes=True)
+        sys.stdout = sys.__stdout__
+        
+        mock_save.assert_not_called()
+        self.assertEqual(writer.add.call_count, 2)
+        self.assertIn('content_hash', writer.add.call_args[0][0])
+        writer.close.assert_called_once()
+        self.assertIn("Success: 1 | ❌ Failed: 0 | ⏩ Skipped: 1", captured_output.getvalue())
+
+    @patch('backend.scraper.scraper.IngestWriter')
+    @patch('backend.scraper.scraper.get_driver')
+    @patch('backend.scraper.scraper.parse_sitemap')
+    @patch('backend.scraper.scraper.extract_job_data')
+    @patch('backend.scraper.scraper.validate_job_data')
+    def test_failed_batched_write_not_marked_seen(self, mock_validate, mock_extract, mock_parse,
+                                                  mock_get_driver, mock_writer_class):
+        """Test that a job only enters the seen set once its batched write succeeded"""
+        mock_parse.return_value = [
+            "https://weworkremotely.com/remote-jobs/job1",
+            "https://weworkremotely.com/remote-jobs/job2"
+        ]
+        mock_extract.side_effect = lambda url, driver: {"job_id": url.split('/')[-1], "title": "Job", "company": "Co"}
+        mock_validate.side_effect = lambda data: data
+        seen = set()
+        buffered = []
+        writer = mock_writer_class.return_value
+        writer.add.side_effect = lambda data, url: buffered.append(url)
+        
+        def flush():
+            # Nothing is marked seen while the writes are only queued
+            self.assertEqual(seen, set())
+            on_result = mock_writer_class.call_args[1]['on_result']
+            on_result(buffered[0], 'success')
+            on_result(buffered[1], 'failed')
+            buffered.clear()
+        writer.flush.side_effect = flush
+        
+        captured_output = StringIO()
+        sys.stdout = captured_output
+        main(delay=0, seen=seen, batch_writes=True)
+        sys.stdout = sys.__stdout__
+        
+        self.assertEqual(seen, {"job1"})
+        self.assertIn("Success: 1 | ❌ Failed: 1", captured_output.getvalue())
+
+class TestRevisit(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.hashes = JobHashes(os.path.join(self.tmpdir.name, "hashes.sqlite3"))
+        self.job = {
+            "job_id": "job1", "title": "Job 1", "company": "Company", "company_about": "",
+            "apply_url": "https://example.com/apply", "apply_before": "Apr 30, 2025",
+            "job_description": "Build things", "category": "Product", "region": []
+        }
+        stored = add_content_hashes(dict(self.job, salary_range='Not Specified', countries=[], skills=[], timezones=[]))
+        self.hashes.replace({"job1": stored})
+        self.captured_output = StringIO()
+        sys.stdout = self.captured_output
+
+    def tearDown(self):
+        sys.stdout = sys.__stdout__
+        self.hashes.close()
+        self.tmpdir.cleanup()
+
+    @patch('backend.scraper.scraper.update_in_collection')
+    @patch('backend.scraper.scraper.extract_with_engine')
+    def test_unchanged_job_not_written(self, mock_extract, mock_update):
+        """Test that an unchanged listing costs no Firestore write"""
+        mock_extract.return_value = dict(self.job)
+        
+        status = revisit_job("job1", self.hashes, MagicMock())
+        
+        self.assertEqual(status, 'skipped')
+        mock_update.assert_not_called()
+        self.assertEqual(self.hashes.due(max_age=60), [])
+
+    @patch('backend.scraper.scraper.update_in_collection')
+    @patch('backend.scraper.scraper.extract_with_engine')
+    def test_edited_job_updates_changed_fields(self, mock_extract, mock_update):
+        """Test that an edited listing writes only the changed fields"""
+        mock_extract.return_value = dict(self.job, apply_before="May 31, 2025")
+        mock_update.return_value = True
+        
+        status = revisit_job("job1", self.hashes, MagicMock())
+        
+        self.assertEqual(status, 'success')
+        mock_extract.assert_called_once_with("https://weworkremotely.com/remote-jobs/job1", 'static',
+                                             unittest.mock.ANY, None, None)
+        collection, job_id, update = mock_update.call_args[0]
+        self.assertEqual((collection, job_id), ('jobs', 'job1'))
+        self.assertEqual(set(update), {'apply_before', 'field_hashes', 'content_hash', 'updated_at'})
+        self.assertEqual(self.hashes.get("job1")[1]['apply_before'], update['field_hashes']['apply_before'])
+
+    @patch('backend.scraper.scraper.firestore_retry', RetryPolicy('firestore', attempts=2))
+    @patch('backend.scraper.resilience.time.sleep')
+    @patch('backend.scraper.scraper.update_in_collection')
+    @patch('backend.scraper.scraper.extract_with_engine')
+    def test_failed_update_is_retried(self, mock_extract, mock_update, mock_sleep):
+        """Test that a failing update is retried and, if it keeps failing, the job stays due"""
+        mock_extract.return_value = dict(self.job, apply_before="May 31, 2025")
+        mock_update.side_effect = google_exceptions.ServiceUnavailable("unavailable")
+        
+        status = revisit_job("job1", self.hashes, MagicMock())
+        
+        self.assertEqual(status, 'failed')
+        self.assertEqual(mock_update.call_count, 2)
+        self.assertEqual(mock_update.call_args[1], {'raise_errors': True})
+        self.assertEqual(self.hashes.due(max_age=60), ["job1"])
+
+    @patch('backend.scraper.scraper.load_job_hashes')
+    def test_empty_hashes_not_reloaded(self, mock_load):
+        """Test that an empty hash store that was passed in is used instead of reloading from Firestore"""
+        empty = JobHashes(os.path.join(self.tmpdir.name, "empty.sqlite3"))
+        
+        stats = revisit_jobs(hashes=empty)
+        empty.close()
+        
+        mock_load.assert_not_called()
+        self.assertEqual(stats.processed, 0)
+
+class TestPageSnapshot(unittest.TestCase):
+    def make_snapshot(self, **overrides):
+        snapshot = {
+            'texts': {
+                '.lis-container__header__hero__company-info__title': "Backend Engineer",
+                '.lis-container__job__sidebar__companyDetails__info__title h3': "Acme",
+                '.lis-container__header__hero__company-info__description': "About Acme",
+                '.lis-container__job__content__description': "Build things",
+                '.lis-container__header__navigation__tab--category': "Back-End Programming",
+                '.lis-container__job__sidebar__job-about__list__item span': "Apr 30, 2025",
+            },
+            'region': ["Anywhere in the World"],
+            'salary_range': "$100,000 or more USD",
+            'countries': [],
+            'skills': ["Python", "SQL"],
+            'timezones': ["UTC"],
+            'apply_url': "https://acme.example/apply",
+            'json_ld': [],
+            'scripts': [],
+        }
+        snapshot.update(overrides)
+        return snapshot
+
+    @patch('backend.scraper.scraper.WebDriverWait')
+    def test_extract_job_data_single_round_trip(self, mock_wait):
+        """Test that direct extraction reads every field from one execute_script call"""
+        mock_driver = MagicMock()
+        mock_driver.execute_script.return_value = self.make_snapshot()
+        
+        result = extract_job_data("https://weworkremotely.com/remote-jobs/acme-backend-engineer", mock_driver)
+        
+        self.assertEqual(result['title'], "Backend Engineer")
+        self.assertEqual(result['company'], "Acme")
+        self.assertEqual(result['region'], ["Anywhere in the World"])
+        self.assertEqual(result['skills'], ["Python", "SQL"])
+        self.assertEqual(result['apply_url'], "https://acme.example/apply")
+        self.assertEqual(result['apply_before'], "Apr 30, 2025")
+        mock_driver.execute_script.assert_called_once()
+        mock_driver.find_element.assert_not_called()
+        mock_driver.find_elements.assert_not_called()
+
+    @patch('backend.scraper.scraper.WebDriverWait')
+    def test_extract_job_data_json_from_snapshot(self, mock_wait):
+        """Test that JSON-LD in the snapshot is processed without extra WebDriver commands"""
+        mock_driver = MagicMock()
+        json_ld = json.dumps({"@type": "JobPosting", "title": "Data Engineer", "hiringOrganization": {"name": "Acme"}})
+        mock_driver.execute_script.return_value = self.make_snapshot(json_ld=[json_ld], apply_url=None)
+        url = "https://weworkremotely.com/remote-jobs/acme-data-engineer"
+        
+        result = extract_job_data(url, mock_driver)
+        
+        self.assertEqual(result['title'], "Data Engineer")
+        self.assertEqual(result['company'], "Acme")
+        self.assertEqual(result['salary_range'], "$100,000 or more USD")
+        self.assertEqual(result['apply_url'], url)
+        mock_driver.execute_script.assert_called_once()
+        mock_driver.find_elements.assert_not_called()
+
+    @patch('backend.scraper.scraper.WebDriverWait')
+    def test_error_page_raises_transient_error(self, mock_wait):
+        """Test that a 503 page loaded by the browser is reported with its status instead of waited on"""
+        mock_wait.return_value.until.side_effect = TimeoutException()
+        mock_driver = MagicMock()
+        mock_driver.execute_script.return_value = 503
+        
+        with self.assertRaises(TransientError) as context:
+            extract_job_data("https://weworkremotely.com/remote-jobs/acme-backend-engineer", mock_driver)
+        
+        self.assertEqual(context.exception.status_code, 503)
+        mock_wait.assert_called_once()
+
+    def test_scheduler_uses_crawler_user_agent(self):
+        """Test that robots.txt rules are read for the crawler's own user agent"""
+        self.assertEqual(create_scheduler().user_agent, "RemoteJobBankBot")
+
+    def test_window_job_data_from_snapshot(self):
+        """Test that window.jobData is found in the snapshot scripts"""
+        snapshot = self.make_snapshot(scripts=['window.jobData = {"title": "Designer"};'])
+        
+        self.assertEqual(check_for_json_data(MagicMock(), snapshot), {"title": "Designer"})
+
+    def test_snapshot_failure_falls_back(self):
+        """Test that the per-field lookups are used when the snapshot script fails"""
+        mock_driver = MagicMock()
+        mock_driver.execute_script.side_effect = WebDriverException("script error")
+        mock_box = MagicMock()
+        mock_box.text = "Python"
+        mock_driver.find_elements.return_value = [mock_box]
+        
+        self.assertEqual(extract_skills(mock_driver), ["Python"])
+
+class TestLeanBrowser(unittest.TestCase):
+    def tearDown(self):
+        configure_browser(lean=False)
+
+    @patch('backend.scraper.scraper.webdriver')
+    def test_get_driver_lean(self, mock_webdriver):
+        """Test that the lean profile loads pages eagerly and blocks the configured URLs"""
+        mock_driver = MagicMock()
+        mock_webdriver.Chrome.return_value = mock_driver
+        configure_browser(lean=True, blocklist=['*.png*', '*tracker.example*'])
+        
+        driver = get_driver()
+        
+        self.assertEqual(driver, mock_driver)
+        options = mock_webdriver.Chrome.call_args[1]['options']
+        self.assertEqual(options.page_load_strategy, 'eager')
+        mock_driver.execute_cdp_cmd.assert_any_call('Network.setBlockedURLs', {'urls': ['*.png*', '*tracker.example*']})
+
+    @patch('backend.scraper.scraper.webdriver')
+    def test_get_driver_default_profile(self, mock_webdriver):
+        """Test that the regular profile is unchanged and sends no CDP commands"""
+        mock_driver = MagicMock()
+        mock_webdriver.Chrome.return_value = mock_driver
+        
+        get_driver()
+        
+        options = mock_webdriver.Chrome.call_args[1]['options']
+        self.assertEqual(options.page_load_strategy, 'normal')
+        mock_driver.execute_cdp_cmd.assert_not_called()
+
+class TestPageArchiving(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.archive = PageArchive(self.tmpdir.name)
+        self.captured_output = StringIO()
+        sys.stdout = self.captured_output
+
+    def tearDown(self):
+        sys.stdout = sys.__stdout__
+        self.archive.close()
+        self.tmpdir.cleanup()
+
+    @patch('backend.scraper.scraper.extract_job_data')
+    def test_rendered_page_is_archived(self, mock_extract):
+        """Test that the browser engine stores the rendered page"""
+        mock_driver = MagicMock()
+        mock_driver.page_source = "<html>rendered</html>"
+        mock_extract.return_value = {"job_id": "job1"}
+        
+        result = render_and_extract("https://weworkremotely.com/remote-jobs/job1", mock_driver, self.archive)
+        
+        self.assertEqual(result, {"job_id": "job1"})
+        self.assertEqual(list(self.archive.iter_latest())[0][1], "<html>rendered</html>")
+
+    @patch('backend.scraper.scraper.parse_job_html')
+    def test_reextract_from_archive(self, mock_parse_html):
+        """Test that archived pages are parsed and validated again without fetching"""
+        self.archive.store("https://weworkremotely.com/remote-jobs/job1", "<html>job1</html>", fetched_at=1)
+        self.archive.store("https://weworkremotely.com/remote-jobs/job2", "<html>job2</html>", fetched_at=1)
+        mock_parse_html.side_effect = lambda html, url: None if url.endswith("job2") else {
+            "job_id": "job1", "title": "Job", "company": "Company", "company_about": "",
+            "apply_url": url, "apply_before": "", "job_description": "", "category": "Product", "region": [],
+            "timestamp": object()
+        }
+        output = os.path.join(self.tmpdir.name, "jobs.jsonl")
+        
+        stats = reextract_from_archive(self.archive, output=output)
+        
+        self.assertEqual(stats.successful, 1)
+        self.assertEqual(stats.failed, 1)
+        with open(output) as f:
+            jobs = [json.loads(line) for line in f]
+        self.assertEqual(jobs[0]["job_id"], "job1")
+        self.assertNotIn("timestamp", jobs[0])
+        self.assertIn("Re-extraction completed", self.captured_output.getvalue())
+
+class TestStageMetrics(unittest.TestCase):
+    def setUp(self):
+        metrics.reset()
+        self.captured_output = StringIO()
+        sys.stdout = self.captured_output
+
+    def tearDown(self):
+        sys.stdout = sys.__stdout__
+        metrics.reset()
+
+    @patch('backend.scraper.scraper.WebDriverWait')
+    def test_extract_job_data_records_stages(self, mock_wait):
+        """Test that page load, readiness wait and extractors are timed and the wait fallback is counted"""
+        mock_wait.return_value.until.side_effect = [TimeoutException("First timeout"), None]
+        mock_driver = MagicMock()
+        mock_driver.execute_script.return_value = {
+            'texts': {selector: "" for selector in SNAPSHOT_TEXT_SELECTORS}, 'region': ["USA"], 'salary_range': "", 'countries': [], 'skills': [],
+            'timezones': [], 'apply_url': None, 'json_ld': [], 'scripts': [],
+        }
+
+        result = extract_job_data("https://weworkremotely.com/remote-jobs/test-job", mock_driver)
+
+        self.assertEqual(result['region'], ["USA"])
+        for stage in ('page_load', 'ready_wait', 'snapshot', 'extract_region', 'extract_apply_url'):
+            self.assertEqual(metrics.stage_count(stage), 1, stage)
+        self.assertEqual(metrics.event_count('wait_fallback'), 1)
+        self.assertEqual(metrics.event_count('timeout'), 0)
+
+    @patch('backend.scraper.scraper.WebDriverWait')
+    def test_extract_job_data_counts_timeout(self, mock_wait):
+        """Test that a listing that never becomes ready is counted as a timeout"""
+        mock_wait.return_value.until.side_effect = TimeoutException("Timeout")
+
+        self.assertIsNone(extract_job_data("https://weworkremotely.com/remote-jobs/test-job", MagicMock()))
+
+        self.assertEqual(metrics.event_count('wait_fallback'), 1)
+        self.assertEqual(metrics.event_count('timeout'), 1)
+
+    @patch('backend.scraper.scraper.save_to_collection', return_value=True)
+    @patch('backend.scraper.scraper.validate_job_data', side_effect=lambda data: data)
+    @patch('backend.scraper.scraper.extract_with_engine')
+    def test_process_job_url_records_validate_and_write(self, mock_extract, mock_validate, mock_save):
+        """Test that validation, the Firestore write and the whole listing are timed"""
+        mock_extract.return_value = {"job_id": "job1", "title": "Engineer", "company": "Acme"}
+
+        status = process_job_url("https://weworkremotely.com/remote-jobs/job1", 1, 1, MagicMock(), seen=set())
+
+        self.assertEqual(status, 'success')
+        for stage in ('validate', 'firestore_write', 'listing'):
+            self.assertEqual(metrics.stage_count(stage), 1, stage)
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
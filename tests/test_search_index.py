@@ -0,0 +1,77 @@
+import unittest
+
+from backend.database.search_index import SearchIndex, field_tokens, parse_query, tokenize
+
+def job(job_id, title="", description="", skills=()):
+    return {"job_id": job_id, "title": title, "job_description": description, "skills": list(skills)}
+
+class TestQueries(unittest.TestCase):
+    def test_tokenize(self):
+        """Test that tokens are lowercased words that keep C++ and C# intact"""
+        self.assertEqual(tokenize("Senior C++/C# Engineer, Node.js"), ["senior", "c++", "c#", "engineer", "node", "js"])
+
+    def test_parse_query(self):
+        """Test that terms, prefixes and quoted phrases become clauses"""
+        self.assertEqual(parse_query('python eng* "site reliability" node.js'), [
+            ('term', ['python']), ('prefix', ['eng']), ('phrase', ['site', 'reliability']), ('phrase', ['node', 'js'])
+        ])
+        self.assertEqual(parse_query('!! ""'), [])
+
+    def test_html_is_not_indexed(self):
+        """Test that the tags and entities of an HTML description are not indexed as words"""
+        description = '<p>Build <strong class="x">APIs</strong> &amp; tools</p><!-- div --><ul><li>Go</li></ul>'
+        self.assertEqual(field_tokens(job("job1", description=description), "job_description"),
+                         ["build", "apis", "tools", "go"])
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = SearchIndex([
+            job("job1", "Senior Python Engineer", "Build Python services with Django and Python tooling", ["Python", "Django"]),
+            job("job2", "Site Reliability Engineer", "Keep the site reliable; some Python scripting", ["Kubernetes", "Python"]),
+            job("job3", "Product Designer", "Design the reliability dashboard for our site", ["Figma"]),
+            job("job4", "Engineering Manager", "Lead a team of engineers", ["Leadership"]),
+        ])
+
+    def test_terms_must_all_match_and_are_ranked(self):
+        """Test that every term must match and the job mentioning it most comes first"""
+        self.assertEqual(self.index.search(description="python"), ["job1", "job2"])
+        self.assertEqual(self.index.search(title="engineer python"), ["job1"])
+        self.assertEqual(self.index.search(title="engineer", skills="kubernetes"), ["job2"])
+        self.assertEqual(self.index.search(title="unknown"), [])
+
+    def test_prefix(self):
+        """Test that a trailing * matches every term with that prefix"""
+        self.assertEqual(set(self.index.search(title="engineer*")), {"job1", "job2", "job4"})
+        self.assertEqual(self.index.search(title="eng"), [])
+
+    def test_phrase(self):
+        """Test that a quoted phrase only matches adjacent terms in order"""
+        self.assertEqual(self.index.search(title='"site reliability"'), ["job2"])
+        self.assertEqual(self.index.search(description='"reliability site"'), [])
+        self.assertEqual(self.index.search(description='"reliability dashboard"'), ["job3"])
+
+    def test_phrases_do_not_span_skills(self):
+        """Test that the end of one skill and the start of the next are not a phrase"""
+        self.assertEqual(self.index.search(skills='"python django"'), [])
+
+    def test_no_terms(self):
+        """Test that a search without any terms is reported as unfiltered"""
+        self.assertIsNone(self.index.search(title=None, description="  "))
+
+    def test_incremental_updates(self):
+        """Test that changed and removed jobs are reflected in the next search"""
+        self.index.on_change("job5", None, job("job5", "Python Developer"))
+        self.index.on_change("job1", None, job("job1", "Senior Go Engineer"))
+        self.index.on_change("job2", None, None)
+
+        self.assertEqual(self.index.search(title="python"), ["job5"])
+        self.assertEqual(self.index.search(title="go*"), ["job1"])
+        self.assertEqual(self.index.search(title="reliability"), [])
+        self.assertEqual(len(self.index), 4)
+
+        for job_id in ("job1", "job3", "job4", "job5"):
+            self.index.remove(job_id)
+        self.assertEqual(self.index._terms, {"title": [], "job_description": [], "skills": []})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+from unittest.mock import patch
+import os
+import tempfile
+from io import StringIO
+import sys
+
+from backend.scraper.seen_set import SeenSet, load_seen_set
+
+class TestSeenSet(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "seen.sqlite3")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_add_and_contains(self):
+        """Test in-memory membership after adding IDs"""
+        seen = SeenSet(self.path)
+        seen.add("job1")
+        seen.add("job1")
+
+        self.assertIn("job1", seen)
+        self.assertNotIn("job2", seen)
+        self.assertEqual(len(seen), 1)
+        seen.close()
+
+    def test_persists_across_runs(self):
+        """Test that IDs are reloaded from the SQLite file"""
+        seen = SeenSet(self.path)
+        seen.replace(["job1", "job2"])
+        seen.add("job3")
+        seen.close()
+
+        reopened = SeenSet(self.path)
+        self.assertEqual(len(reopened), 3)
+        self.assertIn("job3", reopened)
+        self.assertIsNotNone(reopened.refreshed_at)
+        reopened.close()
+
+    def test_replace_drops_old_ids(self):
+        """Test that a refresh replaces the whole set"""
+        seen = SeenSet(self.path)
+        seen.add("deleted-job")
+        seen.replace(["job1"])
+
+        self.assertNotIn("deleted-job", seen)
+        self.assertIn("job1", seen)
+        seen.close()
+
+    def test_is_stale(self):
+        """Test staleness before and after a refresh"""
+        seen = SeenSet(self.path)
+        self.assertTrue(seen.is_stale())
+
+        seen.replace([])
+        self.assertFalse(seen.is_stale(max_age=60))
+        self.assertTrue(seen.is_stale(max_age=-1))
+        seen.close()
+
+class TestLoadSeenSet(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "seen.sqlite3")
+        self.captured_output = StringIO()
+        sys.stdout = self.captured_output
+
+    def tearDown(self):
+        sys.stdout = sys.__stdout__
+        self.tmpdir.cleanup()
+
+    @patch('backend.scraper.seen_set.list_document_ids')
+    def test_refreshes_when_stale(self, mock_list):
+        """Test that an empty cache is filled with one keys-only query"""
+        mock_list.return_value = ["job1", "job2"]
+
+        seen = load_seen_set('jobs', path=self.path)
+
+        mock_list.assert_called_once_with('jobs')
+        self.assertIn("job2", seen)
+        seen.close()
+
+    @patch('backend.scraper.seen_set.list_document_ids')
+    def test_fresh_cache_skips_firestore(self, mock_list):
+        """Test that a fresh cache is reused without querying Firestore"""
+        cached = SeenSet(self.path)
+        cached.replace(["job1"])
+        cached.close()
+
+        seen = load_seen_set('jobs', path=self.path)
+
+        mock_list.assert_not_called()
+        self.assertIn("job1", seen)
+        seen.close()
+
+    @patch('backend.scraper.seen_set.list_document_ids')
+    def test_falls_back_to_cache_on_error(self, mock_list):
+        """Test that cached IDs are used when the Firestore query fails"""
+        cached = SeenSet(self.path)
+        cached.replace(["job1"])
+        cached.close()
+        mock_list.return_value = None
+
+        seen = load_seen_set('jobs', path=self.path, refresh=True)
+
+        self.assertIn("job1", seen)
+        self.assertIn("Using 1 cached job IDs", self.captured_output.getvalue())
+        seen.close()
+
+if __name__ == '__main__':
+    unittest.main()
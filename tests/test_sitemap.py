@@ -0,0 +1,208 @@
+import unittest
+from unittest.mock import MagicMock
+import gzip
+import io
+import os
+import threading
+import tempfile
+from io import StringIO
+import sys
+
+from backend.scraper.sitemap import (
+    SitemapState, fetch_sitemap_conditionally, parse_sitemap_incremental, stream_sitemap, iter_sitemap_entries
+)
+
+INDEX_URL = "https://example.com/sitemap.xml"
+CHILD_URL = "https://example.com/sitemap-jobs.xml"
+
+def make_response(content=b"", status_code=200, headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.raw = io.BytesIO(content)
+    response.headers = headers or {}
+    return response
+
+def index_xml(lastmod):
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+    <sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+        <sitemap><loc>{CHILD_URL}</loc><lastmod>{lastmod}</lastmod></sitemap>
+    </sitemapindex>""".encode()
+
+def urlset_xml(entries):
+    urls = "".join(f"<url><loc>{loc}</loc><lastmod>{lastmod}</lastmod></url>" for loc, lastmod in entries)
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+    <urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{urls}</urlset>""".encode()
+
+class TestStreamingSitemap(unittest.TestCase):
+    def setUp(self):
+        self.captured_output = StringIO()
+        sys.stdout = self.captured_output
+
+    def tearDown(self):
+        sys.stdout = sys.__stdout__
+
+    def test_iter_sitemap_entries(self):
+        """Test that entries are parsed with and without a namespace"""
+        entries = list(iter_sitemap_entries(io.BytesIO(index_xml("2024-01-01"))))
+        self.assertEqual(entries, [('sitemap', CHILD_URL, "2024-01-01")])
+
+        plain = b"<urlset><url><loc>https://example.com/listings/a</loc></url><url></url></urlset>"
+        self.assertEqual(list(iter_sitemap_entries(io.BytesIO(plain))), [('url', "https://example.com/listings/a", None)])
+
+    def test_nested_and_gzipped_sitemaps(self):
+        """Test that nested sitemaps are followed, gzip is decompressed and non-listings are dropped"""
+        children = [f"https://example.com/sitemap-{n}.xml.gz" for n in range(3)]
+        index = "".join(f"<sitemap><loc>{loc}</loc></sitemap>" for loc in children)
+        pages = {
+            "https://example.com/sitemap.xml": make_response(f"<sitemapindex>{index}</sitemapindex>".encode()),
+        }
+        for n, loc in enumerate(children):
+            pages[loc] = make_response(gzip.compress(urlset_xml([
+                (f"https://example.com/listings/job{n}", "2024-01-01"),
+                (f"https://example.com/categories/{n}", "2024-01-01"),
+            ])))
+        session = MagicMock()
+        session.get.side_effect = lambda url, **kwargs: pages[url]
+
+        urls = list(stream_sitemap("https://example.com/sitemap.xml", session, max_workers=3))
+
+        self.assertEqual(sorted(urls), [f"https://example.com/listings/job{n}" for n in range(3)])
+        self.assertTrue(all(call.kwargs['stream'] for call in session.get.call_args_list))
+
+    def test_first_url_before_last_sitemap(self):
+        """Test that URLs are yielded while other sitemaps are still downloading"""
+        release = threading.Event()
+        slow_url = "https://example.com/sitemap-slow.xml"
+        index = f"<sitemapindex><sitemap><loc>{CHILD_URL}</loc></sitemap><sitemap><loc>{slow_url}</loc></sitemap></sitemapindex>"
+
+        def get(url, **kwargs):
+            if url == slow_url:
+                release.wait(5)
+                return make_response(urlset_xml([("https://example.com/listings/late", "2024-01-01")]))
+            if url == CHILD_URL:
+                return make_response(urlset_xml([("https://example.com/listings/early", "2024-01-01")]))
+            return make_response(index.encode())
+
+        session = MagicMock()
+        session.get.side_effect = get
+        urls = stream_sitemap(INDEX_URL, session, max_workers=2)
+
+        self.assertEqual(next(urls), "https://example.com/listings/early")
+        release.set()
+        self.assertEqual(list(urls), ["https://example.com/listings/late"])
+
+    def test_failed_sitemap_is_reported(self):
+        """Test that a broken sitemap ends the stream instead of hanging it"""
+        session = MagicMock()
+        session.get.side_effect = Exception("Connection error")
+
+        self.assertEqual(list(stream_sitemap(INDEX_URL, session)), [])
+        self.assertIn("Error parsing sitemap", self.captured_output.getvalue())
+
+class TestIncrementalSitemap(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.state = SitemapState(os.path.join(self.tmpdir.name, "sitemap.sqlite3"))
+        self.session = MagicMock()
+        self.captured_output = StringIO()
+        sys.stdout = self.captured_output
+
+    def tearDown(self):
+        sys.stdout = sys.__stdout__
+        self.state.close()
+        self.tmpdir.cleanup()
+
+    def test_only_new_or_changed_listings(self):
+        """Test that a second run returns only listings whose lastmod changed"""
+        first = [
+            ("https://example.com/remote-jobs/a", "2024-01-01"),
+            ("https://example.com/remote-jobs/b", "2024-01-01"),
+            ("https://example.com/categories/design", "2024-01-01"),
+        ]
+        self.session.get.return_value = make_response(urlset_xml(first))
+        self.assertEqual(parse_sitemap_incremental(INDEX_URL, self.state, self.session), [])
+
+        first = [
+            ("https://example.com/listings/a", "2024-01-01"),
+            ("https://example.com/listings/b", "2024-01-01"),
+        ]
+        self.session.get.return_value = make_response(urlset_xml(first))
+        self.assertEqual(len(parse_sitemap_incremental(INDEX_URL, self.state, self.session)), 2)
+        self.state.commit()
+
+        second = first[:1] + [("https://example.com/listings/b", "2024-02-01"),
+                              ("https://example.com/listings/c", "2024-02-01")]
+        self.session.get.return_value = make_response(urlset_xml(second))
+        result = parse_sitemap_incremental(INDEX_URL, self.state, self.session)
+
+        self.assertEqual(result, ["https://example.com/listings/b", "https://example.com/listings/c"])
+
+    def test_not_modified_is_skipped(self):
+        """Test that stored validators are sent and a 304 yields nothing"""
+        self.session.get.return_value = make_response(
+            urlset_xml([("https://example.com/listings/a", "2024-01-01")]),
+            headers={'ETag': '"v1"', 'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT'},
+        )
+        parse_sitemap_incremental(INDEX_URL, self.state, self.session)
+        self.state.commit()
+
+        self.session.get.return_value = make_response(status_code=304)
+        result = parse_sitemap_incremental(INDEX_URL, self.state, self.session)
+
+        self.assertEqual(result, [])
+        headers = self.session.get.call_args.kwargs['headers']
+        self.assertEqual(headers['If-None-Match'], '"v1"')
+        self.assertEqual(headers['If-Modified-Since'], 'Mon, 01 Jan 2024 00:00:00 GMT')
+
+    def test_unchanged_child_sitemap_not_requested(self):
+        """Test that a child sitemap with an unchanged index lastmod is not fetched"""
+        child = make_response(urlset_xml([("https://example.com/listings/a", "2024-01-01")]))
+        self.session.get.side_effect = [make_response(index_xml("2024-01-01")), child]
+        self.assertEqual(len(parse_sitemap_incremental(INDEX_URL, self.state, self.session)), 1)
+        self.state.commit()
+
+        self.session.get.side_effect = [make_response(index_xml("2024-01-01"))]
+        result = parse_sitemap_incremental(INDEX_URL, self.state, self.session)
+
+        self.assertEqual(result, [])
+        self.assertEqual(self.session.get.call_count, 3)
+
+    def test_discarded_listing_is_retried(self):
+        """Test that a failed listing is offered again and its sitemaps lose their validators"""
+        self.session.get.side_effect = [
+            make_response(index_xml("2024-01-01"), headers={'ETag': '"index"'}),
+            make_response(urlset_xml([("https://example.com/listings/a", "2024-01-01")]),
+                          headers={'ETag': '"child"'}),
+        ]
+        parse_sitemap_incremental(INDEX_URL, self.state, self.session)
+        self.state.discard("https://example.com/listings/a")
+        self.state.commit()
+
+        self.assertEqual(self.state.sitemap_validators(INDEX_URL), (None, None, None))
+        self.assertEqual(self.state.sitemap_validators(CHILD_URL), (None, None, None))
+        self.assertEqual(self.state.listing_lastmod("https://example.com/listings/a"), (False, None))
+
+    def test_failed_child_keeps_parent_dirty(self):
+        """Test that a sitemap error stops the parent index from being marked up to date"""
+        failed = make_response(status_code=500)
+        failed.raise_for_status.side_effect = Exception("500 Server Error")
+        self.session.get.side_effect = [make_response(index_xml("2024-01-01"), headers={'ETag': '"index"'}), failed]
+
+        self.assertEqual(parse_sitemap_incremental(INDEX_URL, self.state, self.session), [])
+        self.state.commit()
+
+        self.assertEqual(self.state.sitemap_validators(INDEX_URL), (None, None, None))
+        self.assertIn("Error parsing sitemap", self.captured_output.getvalue())
+
+    def test_uncommitted_state_is_not_persisted(self):
+        """Test that nothing is written until commit()"""
+        self.session.get.return_value = make_response(
+            urlset_xml([("https://example.com/listings/a", "2024-01-01")]), headers={'ETag': '"v1"'}
+        )
+        parse_sitemap_incremental(INDEX_URL, self.state, self.session)
+
+        self.assertEqual(fetch_sitemap_conditionally(INDEX_URL, self.state, self.session).status_code, 200)
+        self.assertEqual(self.session.get.call_args.kwargs['headers'], {})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,195 @@
+import unittest
+from unittest.mock import patch, MagicMock
+from io import StringIO
+import sys
+import tempfile
+import threading
+import time
+
+from backend.scraper import sources
+from backend.scraper.sources import (
+    JobSource, SourceBudgets, get_source, interleave, parse_source_budgets, register_source,
+    select_sources, source_for, source_for_job_id
+)
+from backend.scraper.archive import PageArchive
+from backend.scraper.revisit import JobHashes
+from backend.scraper.scraper import (
+    WeWorkRemotelySource, fetch_job_urls, reextract_from_archive, revisit_jobs, run_parallel_crawl
+)
+from backend.scraper.worker_pool import run_worker_pool, SUCCESS
+
+class ExampleSource(JobSource):
+    key = 'example'
+    name = 'ExampleJobs'
+    hosts = ('jobs.example.org',)
+    sitemap_url = "https://jobs.example.org/sitemap.xml"
+    job_url_template = "https://jobs.example.org/jobs/{slug}"
+    id_prefix = 'example-'
+    concurrency = 1
+
+class SourceTestCase(unittest.TestCase):
+    """Registers ExampleSource next to We Work Remotely for the duration of a test."""
+
+    def setUp(self):
+        self.registry = dict(sources._sources)
+        register_source(ExampleSource)
+        self.example = get_source('example')
+        self.wwr = get_source('wwr')
+        self.captured_output = StringIO()
+        sys.stdout = self.captured_output
+
+    def tearDown(self):
+        sys.stdout = sys.__stdout__
+        sources._sources.clear()
+        sources._sources.update(self.registry)
+
+class TestRegistry(SourceTestCase):
+    def test_wwr_is_the_default_source(self):
+        """Test that We Work Remotely is registered first and keeps bare slugs as job IDs"""
+        self.assertIsInstance(sources.registered_sources()[0], WeWorkRemotelySource)
+        url = "https://weworkremotely.com/remote-jobs/acme-engineer"
+        self.assertEqual(self.wwr.job_id(url), "acme-engineer")
+        self.assertEqual(self.wwr.job_url("acme-engineer"), url)
+
+    def test_routing_by_host_and_job_id(self):
+        """Test that URLs and job IDs are routed to the source they belong to"""
+        self.assertIs(source_for("https://jobs.example.org/jobs/42"), self.example)
+        self.assertIs(source_for("https://weworkremotely.com/remote-jobs/x"), self.wwr)
+        self.assertIs(source_for("https://unknown.example.com/x"), self.wwr)
+
+        self.assertEqual(self.example.job_id("https://jobs.example.org/jobs/42"), "example-42")
+        self.assertIs(source_for_job_id("example-42"), self.example)
+        self.assertIs(source_for_job_id("acme-engineer"), self.wwr)
+        self.assertEqual(self.example.job_url("example-42"), "https://jobs.example.org/jobs/42")
+
+    def test_unknown_source(self):
+        """Test that an unknown source key is rejected"""
+        with self.assertRaises(ValueError):
+            get_source('nope')
+
+    def test_budgets(self):
+        """Test that budgets are parsed and applied to the selected sources"""
+        budgets = parse_source_budgets(["example=3:2.5", "wwr=2"])
+        self.assertEqual(budgets, {'example': (3, 2.5), 'wwr': (2, None)})
+
+        selected = select_sources(['example'], {'example': (3, 2.5)})
+        self.assertEqual(selected, [self.example])
+        self.assertEqual((self.example.concurrency, self.example.delay), (3, 2.5))
+
+        for value in ("nope=2", "example", "example=0", "example=x"):
+            with self.assertRaises(ValueError):
+                parse_source_budgets([value])
+
+class TestDiscovery(SourceTestCase):
+    def test_urls_of_sources_are_interleaved(self):
+        """Test that the URLs of several sources are spread through the crawl"""
+        self.assertEqual(list(interleave([[1, 2, 3], ["a"], [4, 5]])), [1, "a", 4, 2, 5, 3])
+
+        with patch.object(WeWorkRemotelySource, 'discover', return_value=["w1", "w2", "w3"]), \
+             patch.object(ExampleSource, 'discover', return_value=["e1"]):
+            job_urls = fetch_job_urls(sources=[self.wwr, self.example])
+
+        self.assertEqual(job_urls, ["w1", "e1", "w2", "w3"])
+
+    @patch('backend.scraper.sources.stream_sitemap')
+    def test_default_discovery_reads_the_sitemap(self, mock_stream):
+        """Test that an adapter without its own discovery reads its sitemap with its listing filter"""
+        mock_stream.return_value = iter(["https://jobs.example.org/jobs/1"])
+
+        self.assertEqual(self.example.discover(), ["https://jobs.example.org/jobs/1"])
+        mock_stream.assert_called_once_with(self.example.sitemap_url, None, None, is_listing=self.example.is_listing)
+
+class TestArchive(SourceTestCase):
+    def test_archive_follows_the_adapters(self):
+        """Test that pages are archived under their source's job ID and re-parsed by that source"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            archive = PageArchive(tmpdir)
+            archive.store("https://weworkremotely.com/remote-jobs/42", "<html>wwr</html>", fetched_at=1)
+            archive.store("https://jobs.example.org/jobs/42", "<html>example</html>", fetched_at=2)
+
+            with patch.object(ExampleSource, 'parse_html', return_value=None) as example_parse, \
+                 patch.object(WeWorkRemotelySource, 'parse_html', return_value=None) as wwr_parse:
+                reextract_from_archive(archive)
+            self.assertEqual(len(archive), 2)
+            archive.close()
+
+        example_parse.assert_called_once_with("<html>example</html>", "https://jobs.example.org/jobs/42")
+        wwr_parse.assert_called_once_with("<html>wwr</html>", "https://weworkremotely.com/remote-jobs/42")
+
+class TestRevisit(SourceTestCase):
+    @patch('backend.scraper.scraper.revisit_job', return_value=SUCCESS)
+    def test_revisit_selected_sources(self, mock_revisit):
+        """Test that a revisit only fetches the jobs of the selected sources, counting the limit among them"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            hashes = JobHashes(f"{tmpdir}/hashes.sqlite3")
+            hashes.replace({job_id: {} for job_id in ("job1", "example-1", "job2", "example-2")})
+
+            stats = revisit_jobs(delay=0, limit=1, hashes=hashes, sources=[self.example])
+            hashes.close()
+
+        self.assertEqual(stats.successful, 1)
+        self.assertIn(mock_revisit.call_args[0][0], {"example-1", "example-2"})
+
+class TestSourceBudgets(SourceTestCase):
+    def test_unbudgeted_source_uses_every_worker(self):
+        """Test that without --source-budget a single source keeps all of --workers busy"""
+        urls = [f"https://weworkremotely.com/remote-jobs/job{n}" for n in range(16)]
+        in_flight = []
+        peak = []
+        lock = threading.Lock()
+
+        def process(url, *args):
+            with lock:
+                in_flight.append(url)
+                peak.append(len(in_flight))
+            time.sleep(0.1)
+            with lock:
+                in_flight.remove(url)
+            return SUCCESS
+
+        with patch('backend.scraper.scraper.fetch_job_urls', return_value=urls), \
+             patch('backend.scraper.scraper.process_job_url', side_effect=process):
+            run_parallel_crawl(engine='static', workers=8, delay=0, sources=[self.wwr])
+
+        self.assertGreater(max(peak), 4)
+        self.assertLessEqual(max(peak), 8)
+
+    def test_busy_source_does_not_block_others(self):
+        """Test that items of a source at its limit are held back while other sources' items pass"""
+        budgets = SourceBudgets([self.wwr, self.example])
+        urls = ["https://jobs.example.org/jobs/1", "https://jobs.example.org/jobs/2",
+                "https://weworkremotely.com/remote-jobs/a", "https://weworkremotely.com/remote-jobs/b"]
+        dispatched = budgets.dispatch(urls)
+
+        # Example's budget is one listing, so its second URL waits while WWR's go ahead
+        self.assertEqual([next(dispatched) for _ in range(3)], [urls[0], urls[2], urls[3]])
+        budgets.release(urls[0])
+        self.assertEqual(list(dispatched), [urls[1]])
+
+    def test_slow_source_leaves_workers_to_others(self):
+        """Test that a slow source only occupies its own share of the workers"""
+        self.example.concurrency = 1
+        budgets = SourceBudgets([self.wwr, self.example])
+        urls = [f"https://jobs.example.org/jobs/{n}" for n in range(3)] + \
+               [f"https://weworkremotely.com/remote-jobs/{n}" for n in range(6)]
+        finished = []
+        lock = threading.Lock()
+
+        def handle(url, i, state):
+            try:
+                if source_for(url) is self.example:
+                    time.sleep(0.2)
+                with lock:
+                    finished.append(url)
+                return SUCCESS
+            finally:
+                budgets.release(url)
+
+        run_worker_pool(budgets.dispatch(urls), handle, 3, start_worker=MagicMock, stop_worker=lambda state: None)
+
+        self.assertEqual(len(finished), len(urls))
+        # Every WWR listing is done before the slow source's second one
+        self.assertEqual(set(finished[:6]) & set(urls[3:]), set(urls[3:]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,202 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import json
+import requests
+
+from backend.scraper.static_extractor import (
+    create_session, fetch_listing_html, find_json_data, parse_job_html,
+    extract_job_data_static
+)
+from backend.scraper.resilience import TransientError
+from bs4 import BeautifulSoup
+
+LISTING_URL = "https://weworkremotely.com/remote-jobs/acme-senior-python-engineer"
+
+SIDEBAR_HTML = """
+<div class="lis-container">
+  <div class="lis-container__header__hero__company-info__title">Senior Python Engineer</div>
+  <div class="lis-container__header__hero__company-info__description">We build rockets.</div>
+  <div class="lis-container__header__navigation__tab--category">Back-End Programming</div>
+  <div class="lis-container__job__content__description"><p>Write code.</p><p>Ship it.</p></div>
+  <div class="lis-container__job__sidebar__companyDetails__info__title"><h3>Acme</h3></div>
+  <ul>
+    <li class="lis-container__job__sidebar__job-about__list__item">Apply before <span>Apr 30, 2025</span></li>
+    <li class="lis-container__job__sidebar__job-about__list__item">Region
+      <a href="#"><span class="box box--region">Anywhere in the World</span></a>
+    </li>
+    <li class="lis-container__job__sidebar__job-about__list__item">Salary
+      <span class="box box--blue">$100,000 or more USD</span>
+    </li>
+    <li class="lis-container__job__sidebar__job-about__list__item">Country
+      <span class="box box--blue">United States</span><span class="box box--blue">Canada</span>
+    </li>
+    <li class="lis-container__job__sidebar__job-about__list__item">Skills
+      <span class="box box--blue">Python</span><span class="box box--blue">Django</span>
+    </li>
+    <li class="lis-container__job__sidebar__job-about__list__item">Timezones
+      <span class="box box--blue">UTC-5</span>
+    </li>
+  </ul>
+  <div class="listing-apply-cta__btn"><a id="job-cta-alt" href="https://acme.example.com/apply">Apply</a></div>
+</div>
+"""
+
+def make_page(body, head=""):
+    return f"<html><head>{head}</head><body>{body}</body></html>"
+
+class TestJSONDataDiscovery(unittest.TestCase):
+    def test_find_json_data_job_posting(self):
+        """Test that JSON-LD JobPosting data is found"""
+        job_json = {"@type": "JobPosting", "title": "Test Job"}
+        soup = BeautifulSoup(make_page("", f'<script type="application/ld+json">{json.dumps(job_json)}</script>'), 'html.parser')
+
+        self.assertEqual(find_json_data(soup), job_json)
+
+    def test_find_json_data_window_job_data(self):
+        """Test that window.jobData is used when no JobPosting is present"""
+        soup = BeautifulSoup(make_page("", '<script>window.jobData = {"title": "Window Job"};</script>'), 'html.parser')
+
+        self.assertEqual(find_json_data(soup), {"title": "Window Job"})
+
+    def test_find_json_data_ignores_invalid_json(self):
+        """Test that malformed JSON-LD is skipped"""
+        soup = BeautifulSoup(make_page("", '<script type="application/ld+json">{not json</script>'), 'html.parser')
+
+        self.assertIsNone(find_json_data(soup))
+
+class TestStaticParsing(unittest.TestCase):
+    def test_parse_job_html_direct_extraction(self):
+        """Test parsing sidebar fields without structured data"""
+        result = parse_job_html(make_page(SIDEBAR_HTML), LISTING_URL)
+
+        self.assertEqual(result["job_id"], "acme-senior-python-engineer")
+        self.assertEqual(result["title"], "Senior Python Engineer")
+        self.assertEqual(result["company"], "Acme")
+        self.assertEqual(result["company_about"], "We build rockets.")
+        self.assertEqual(result["category"], "Back-End Programming")
+        self.assertEqual(result["region"], ["Anywhere in the World"])
+        self.assertEqual(result["salary_range"], "$100,000 or more USD")
+        self.assertEqual(result["countries"], ["United States", "Canada"])
+        self.assertEqual(result["skills"], ["Python", "Django"])
+        self.assertEqual(result["timezones"], ["UTC-5"])
+        self.assertEqual(result["apply_url"], "https://acme.example.com/apply")
+        self.assertEqual(result["apply_before"], "Apr 30, 2025")
+        self.assertEqual(result["source"], "WeWorkRemotely")
+
+    def test_parse_job_html_with_json(self):
+        """Test that JSON-LD fields take precedence, like process_json_job_data"""
+        job_json = {
+            "@type": "JobPosting",
+            "title": "JSON Title",
+            "hiringOrganization": {"name": "JSON Company"},
+            "validThrough": "2025-05-01",
+            "description": "JSON description",
+            "occupationalCategory": "Product"
+        }
+        head = f'<script type="application/ld+json">{json.dumps(job_json)}</script>'
+
+        result = parse_job_html(make_page(SIDEBAR_HTML, head), LISTING_URL)
+
+        self.assertEqual(result["title"], "JSON Title")
+        self.assertEqual(result["company"], "JSON Company")
+        self.assertEqual(result["apply_before"], "2025-05-01")
+        self.assertEqual(result["category"], "Product")
+        self.assertEqual(result["company_about"], "We build rockets.")
+        self.assertEqual(result["skills"], ["Python", "Django"])
+        self.assertEqual(result["apply_url"], "https://acme.example.com/apply")
+
+    def test_parse_job_html_apply_url_fallback(self):
+        """Test that the listing URL is used when there is no apply button"""
+        body = SIDEBAR_HTML.replace('id="job-cta-alt"', 'id="other"')
+
+        result = parse_job_html(make_page(body), LISTING_URL)
+
+        self.assertEqual(result["apply_url"], LISTING_URL)
+
+    def test_parse_job_html_not_a_listing(self):
+        """Test that pages without the listing container are rejected"""
+        self.assertIsNone(parse_job_html(make_page("<div>Just a shell</div>"), LISTING_URL))
+
+    def test_parse_job_html_missing_title(self):
+        """Test that a listing without a title is rejected so Selenium can take over"""
+        body = '<div class="lis-container"><div class="lis-container__job__content__description">x</div></div>'
+
+        self.assertIsNone(parse_job_html(make_page(body), LISTING_URL))
+
+class TestStaticFetching(unittest.TestCase):
+    def test_create_session_pools_connections(self):
+        """Test that the session mounts a pooled adapter"""
+        session = create_session(pool_size=4)
+
+        adapter = session.get_adapter("https://weworkremotely.com")
+        self.assertEqual(adapter._pool_maxsize, 4)
+        self.assertIn("User-Agent", session.headers)
+
+    def test_fetch_listing_html_non_200(self):
+        """Test that non-200 responses return None"""
+        session = MagicMock()
+        session.get.return_value = MagicMock(status_code=404)
+
+        self.assertIsNone(fetch_listing_html(LISTING_URL, session))
+
+    def test_fetch_listing_html_request_error(self):
+        """Test that connection errors and 5xx responses are raised as transient"""
+        session = MagicMock()
+        session.get.side_effect = requests.exceptions.ConnectionError("down")
+
+        with self.assertRaises(TransientError):
+            fetch_listing_html(LISTING_URL, session)
+
+        session.get.side_effect = None
+        session.get.return_value = MagicMock(status_code=503)
+        with self.assertRaises(TransientError):
+            fetch_listing_html(LISTING_URL, session)
+
+    def test_extract_job_data_static(self):
+        """Test the full fetch-and-parse path"""
+        session = MagicMock()
+        session.get.return_value = MagicMock(status_code=200, text=make_page(SIDEBAR_HTML))
+
+        result = extract_job_data_static(LISTING_URL, session)
+
+        self.assertEqual(result["title"], "Senior Python Engineer")
+        session.get.assert_called_once_with(LISTING_URL, timeout=15)
+
+    @patch('backend.scraper.static_extractor.parse_job_html')
+    def test_extract_job_data_static_parse_error(self, mock_parse):
+        """Test that unexpected parse errors return None"""
+        session = MagicMock()
+        session.get.return_value = MagicMock(status_code=200, text="<html></html>")
+        mock_parse.side_effect = Exception("boom")
+
+        self.assertIsNone(extract_job_data_static(LISTING_URL, session))
+
+class TestBenchmarkCorpus(unittest.TestCase):
+    def test_corpus_pages_parse_and_validate(self):
+        """Test that every saved benchmark page is a complete, valid listing"""
+        from tests.benchmarks.bench_extraction import CORPUS_DIR
+        from backend.scraper.schema import validate_job_data
+        
+        pages = sorted(CORPUS_DIR.glob("*.html"))
+        self.assertTrue(pages)
+        for page in pages:
+            job_data = parse_job_html(page.read_text(), f"https://weworkremotely.com/remote-jobs/{page.stem}")
+            self.assertIsNotNone(job_data, page.name)
+            validate_job_data(job_data)
+            self.assertTrue(job_data['skills'], page.name)
+
+    def test_static_benchmark_report(self):
+        """Test that the static strategy runs over the locally served corpus"""
+        from tests.benchmarks.bench_extraction import run_benchmark
+        
+        with patch('sys.stdout'):
+            report = run_benchmark(['static'], repeat=1)
+        
+        result = report['strategies']['static']
+        self.assertEqual(result['pages'], report['corpus_pages'])
+        self.assertEqual(result['failures'], 0)
+        self.assertGreater(result['pages_per_second'], 0)
+        self.assertIn('parse_job_html', result['fields'])
+
+if __name__ == '__main__':
+    unittest.main()
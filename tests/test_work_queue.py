@@ -0,0 +1,241 @@
+import unittest
+from unittest.mock import patch
+import os
+import tempfile
+import threading
+import time
+
+from backend.scraper.work_queue import (
+    SQLiteWorkQueue, RedisWorkQueue, LeaseKeeper, open_work_queue,
+    PENDING, LEASED, DONE, FAILED_STATE, MAX_ATTEMPTS
+)
+from backend.scraper.worker_pool import SUCCESS, FAILED
+
+URLS = [f"https://weworkremotely.com/remote-jobs/job{n}" for n in range(1, 4)]
+
+class FakeRedis:
+    """
+    In-memory stand-in for the subset of Redis commands the work queue uses.
+    """
+
+    def __init__(self):
+        self.data = {}
+        self.expires = {}
+        self.lock = threading.Lock()
+
+    def _get(self, key, default):
+        if key in self.expires and self.expires[key] <= time.time():
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+        return self.data.setdefault(key, default) if default is not None else self.data.get(key)
+
+    def sadd(self, key, member):
+        with self.lock:
+            members = self._get(key, set())
+            added = member not in members
+            members.add(member)
+            return int(added)
+
+    def rpush(self, key, value):
+        with self.lock:
+            self._get(key, []).append(value)
+
+    def lpush(self, key, value):
+        with self.lock:
+            self._get(key, []).insert(0, value)
+
+    def rpoplpush(self, source, destination):
+        with self.lock:
+            items = self._get(source, [])
+            if not items:
+                return None
+            value = items.pop()
+            self._get(destination, []).insert(0, value)
+            return value
+
+    def lrange(self, key, start, end):
+        with self.lock:
+            return list(self._get(key, []))
+
+    def lrem(self, key, count, value):
+        with self.lock:
+            items = self._get(key, [])
+            if value in items:
+                items.remove(value)
+                return 1
+            return 0
+
+    def llen(self, key):
+        with self.lock:
+            return len(self._get(key, []))
+
+    def set(self, key, value, px=None):
+        with self.lock:
+            self.data[key] = value
+            self.expires.pop(key, None)
+            if px is not None:
+                self.expires[key] = time.time() + px / 1000
+
+    def get(self, key):
+        with self.lock:
+            return self._get(key, None)
+
+    def pexpire(self, key, px):
+        with self.lock:
+            if self._get(key, None) is None:
+                return False
+            self.expires[key] = time.time() + px / 1000
+            return True
+
+    def delete(self, *keys):
+        with self.lock:
+            for key in keys:
+                self.data.pop(key, None)
+                self.expires.pop(key, None)
+
+    def hget(self, key, field):
+        with self.lock:
+            return self._get(key, {}).get(field)
+
+    def hset(self, key, field, value):
+        with self.lock:
+            self._get(key, {})[field] = value
+
+    def hincrby(self, key, field, amount):
+        with self.lock:
+            values = self._get(key, {})
+            values[field] = str(int(values.get(field, 0)) + amount)
+            return int(values[field])
+
+    def hgetall(self, key):
+        with self.lock:
+            return dict(self._get(key, {}))
+
+    def close(self):
+        pass
+
+class WorkQueueTests:
+    """Behaviour shared by both queue backends."""
+
+    def test_each_url_leased_once(self):
+        """Test that concurrent workers never lease the same URL"""
+        self.queue.add(URLS + URLS[:1])
+
+        leased = [self.queue.lease(f"worker{n}") for n in range(4)]
+
+        self.assertCountEqual(leased[:3], URLS)
+        self.assertIsNone(leased[3])
+        self.assertEqual(self.queue.counts()[LEASED], 3)
+
+    def test_complete(self):
+        """Test that completed URLs are done and failed ones are queued again"""
+        self.queue.add(URLS[:2])
+        first = self.queue.lease("worker1")
+        second = self.queue.lease("worker1")
+
+        self.assertTrue(self.queue.complete("worker1", first, SUCCESS))
+        self.assertTrue(self.queue.complete("worker1", second, FAILED))
+
+        counts = self.queue.counts()
+        self.assertEqual(counts[DONE], 1)
+        self.assertEqual(counts[PENDING], 1)
+        self.assertEqual(self.queue.lease("worker2"), second)
+
+    def test_expired_lease_requeued(self):
+        """Test that the URL of a worker that stopped sending heartbeats is leased again"""
+        self.queue.add(URLS[:1])
+        url = self.queue.lease("dead-worker", ttl=0.01)
+        time.sleep(0.05)
+
+        self.assertEqual(self.queue.requeue_expired(), 1)
+        self.assertEqual(self.queue.lease("worker2"), url)
+        self.assertFalse(self.queue.complete("dead-worker", url, SUCCESS))
+        self.assertTrue(self.queue.complete("worker2", url, SUCCESS))
+
+    def test_heartbeat_extends_lease(self):
+        """Test that a renewed lease does not expire"""
+        self.queue.add(URLS[:1])
+        url = self.queue.lease("worker1", ttl=0.05)
+
+        self.assertEqual(self.queue.heartbeat("worker1", [url], ttl=60), {url})
+        self.assertEqual(self.queue.heartbeat("worker2", [url], ttl=60), set())
+        time.sleep(0.1)
+        self.assertEqual(self.queue.requeue_expired(), 0)
+
+    def test_gives_up_after_max_attempts(self):
+        """Test that a URL that keeps failing is marked failed"""
+        self.queue.add(URLS[:1])
+        for _ in range(MAX_ATTEMPTS):
+            url = self.queue.lease("worker1")
+            self.queue.complete("worker1", url, FAILED)
+
+        self.assertIsNone(self.queue.lease("worker1"))
+        self.assertEqual(self.queue.counts()[FAILED_STATE], 1)
+
+    def test_lease_keeper_drains_queue(self):
+        """Test that the lease keeper yields every URL and stops when the queue is drained"""
+        self.queue.add(URLS)
+        self.queue.seal()
+
+        with LeaseKeeper(self.queue, "worker1", ttl=60) as leases:
+            for url in leases.urls(poll_interval=0.01):
+                leases.complete(url, SUCCESS)
+
+        self.assertEqual(self.queue.counts()[DONE], 3)
+
+    def test_reset(self):
+        """Test that seeding a new crawl clears the previous one"""
+        self.queue.add(URLS)
+        self.queue.seal()
+        self.queue.lease("worker1")
+        self.queue.reset()
+
+        self.assertFalse(self.queue.sealed)
+        self.assertEqual(sum(self.queue.counts().values()), 0)
+
+class TestSQLiteWorkQueue(WorkQueueTests, unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.queue = SQLiteWorkQueue(os.path.join(self.tmpdir.name, "queue.sqlite3"))
+
+    def tearDown(self):
+        self.queue.close()
+        self.tmpdir.cleanup()
+
+    def test_shared_between_processes(self):
+        """Test that a second connection to the file sees the leases of the first"""
+        self.queue.add(URLS[:2])
+        other = SQLiteWorkQueue(self.queue.path)
+
+        self.assertEqual(self.queue.lease("worker1"), URLS[0])
+        self.assertEqual(other.lease("worker2"), URLS[1])
+        self.assertIsNone(other.lease("worker2"))
+        other.close()
+
+class TestRedisWorkQueue(WorkQueueTests, unittest.TestCase):
+    def setUp(self):
+        self.queue = RedisWorkQueue(FakeRedis())
+
+class TestOpenWorkQueue(unittest.TestCase):
+    def test_sqlite_location(self):
+        """Test that sqlite:/// locations open a file queue"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "queue.sqlite3")
+            queue = open_work_queue(f"sqlite:///{path}")
+            self.assertIsInstance(queue, SQLiteWorkQueue)
+            self.assertEqual(str(queue.path), path)
+            queue.close()
+
+    @patch('backend.scraper.work_queue.redis', None)
+    def test_redis_needs_package(self):
+        """Test that a redis:// queue explains the missing dependency"""
+        with self.assertRaises(RuntimeError):
+            open_work_queue("redis://localhost:6379/0")
+
+    def test_unknown_location(self):
+        """Test that an unknown scheme is rejected"""
+        with self.assertRaises(ValueError):
+            open_work_queue("kafka://localhost")
+
+if __name__ == '__main__':
+    unittest.main()
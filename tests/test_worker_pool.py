@@ -0,0 +1,93 @@
+import unittest
+from unittest.mock import MagicMock
+import threading
+from io import StringIO
+import sys
+
+from backend.scraper.worker_pool import (
+    CrawlStats, run_worker_pool, SUCCESS, FAILED, SKIPPED, DUPLICATE
+)
+
+class TestCrawlStats(unittest.TestCase):
+    def test_record_statuses(self):
+        """Test that every status lands in the right counter"""
+        stats = CrawlStats()
+        for status in [SUCCESS, SUCCESS, FAILED, SKIPPED, DUPLICATE]:
+            stats.record(status)
+
+        self.assertEqual(stats.successful, 2)
+        self.assertEqual(stats.failed, 1)
+        self.assertEqual(stats.skipped, 2)
+        self.assertEqual(stats.processed, 5)
+        self.assertIn("Success: 2", stats.summary())
+
+class TestWorkerPool(unittest.TestCase):
+    def setUp(self):
+        self.captured_output = StringIO()
+        sys.stdout = self.captured_output
+
+    def tearDown(self):
+        sys.stdout = sys.__stdout__
+
+    def test_all_items_processed_by_all_workers(self):
+        """Test that items are spread across workers and counters aggregated"""
+        seen = []
+        lock = threading.Lock()
+        states = []
+
+        def start_worker():
+            state = MagicMock()
+            states.append(state)
+            return state
+
+        def handle_item(item, index, state):
+            with lock:
+                seen.append((index, item))
+            return SKIPPED if item % 3 == 0 else SUCCESS
+
+        stats = run_worker_pool(range(30), handle_item, 3, start_worker, lambda state: state.quit())
+
+        self.assertEqual(sorted(seen), [(i + 1, i) for i in range(30)])
+        self.assertEqual(stats.processed, 30)
+        self.assertEqual(stats.skipped, 10)
+        self.assertEqual(stats.successful, 20)
+        self.assertEqual(len(states), 3)
+        for state in states:
+            state.quit.assert_called_once()
+
+    def test_handler_exception_counts_as_failed(self):
+        """Test that an unexpected handler error does not kill the worker"""
+        def handle_item(item, index, state):
+            if item == 1:
+                raise RuntimeError("boom")
+            return SUCCESS
+
+        stats = run_worker_pool([0, 1, 2], handle_item, 1, MagicMock, lambda state: None)
+
+        self.assertEqual(stats.failed, 1)
+        self.assertEqual(stats.successful, 2)
+        self.assertIn("Worker error", self.captured_output.getvalue())
+
+    def test_keyboard_interrupt_stops_every_worker(self):
+        """Test that Ctrl-C while feeding the queue still quits every worker"""
+        states = []
+
+        def start_worker():
+            state = MagicMock()
+            states.append(state)
+            return state
+
+        def items():
+            yield "a"
+            raise KeyboardInterrupt
+
+        with self.assertRaises(KeyboardInterrupt):
+            run_worker_pool(items(), lambda item, index, state: SUCCESS, 2, start_worker, lambda state: state.quit())
+
+        self.assertEqual(len(states), 2)
+        for state in states:
+            state.quit.assert_called_once()
+        self.assertIn("Interrupted", self.captured_output.getvalue())
+
+if __name__ == '__main__':
+    unittest.main()